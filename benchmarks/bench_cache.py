@@ -0,0 +1,128 @@
+"""Benchmark lapisan cache: memori per sesi, invalidasi versi data, dan batas LRU.
+
+1. Memori per sesi: `--sesi` sesi bersamaan masing-masing memegang hasil
+   `load_data()` dan tabel statistik. `st.cache_data` lama mengembalikan
+   salinan (pickle) untuk setiap pemanggil, cache baru mengembalikan objek
+   bersama. Pertambahan memori diukur dengan tracemalloc.
+2. Invalidasi: di salinan data sementara, CSV katalog diubah lalu
+   `load_data()` dipanggil lagi; versi baru harus langsung terbaca.
+3. Batas LRU: indeks titik untuk banyak rentang tanggal dimasukkan ke LRU
+   beranggaran kecil; total byte harus tetap di bawah anggaran.
+
+    python benchmarks/bench_cache.py [--sesi 1 5 20] [--anggaran-mb 8]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import geopandas as gpd
+import pandas as pd
+import streamlit as st
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from cache_dasbor import CacheLRU, perkiraan_ukuran  # noqa: E402
+from data_gempa import FILE_CSV, FILE_GEOJSON, FILE_PARQUET, baca_parquet, load_data, pastikan_parquet, saring_tanggal  # noqa: E402
+from indeks_spasial import KOLOM_TITIK, IndeksTitik  # noqa: E402
+from statistik_seismik import _durasi_rentang, load_statistik_provinsi, statistik_provinsi  # noqa: E402
+
+
+# Disalin dari data_gempa.py dan statistik_seismik.py sebelum cache_dasbor.py
+@st.cache_data
+def load_data_lama():
+    pastikan_parquet()
+    df = baca_parquet()
+    geojson = gpd.read_file(FILE_GEOJSON)
+    return df, geojson
+
+
+@st.cache_data(max_entries=16)
+def load_statistik_provinsi_lama(mulai, selesai):
+    return statistik_provinsi(saring_tanggal(load_data_lama()[0], mulai, selesai), durasi_tahun=_durasi_rentang(mulai, selesai))
+
+
+def memori_sesi(muat, n_sesi, mulai, selesai):
+    """(MB tambahan, detik) untuk `n_sesi` sesi yang masing-masing memegang hasil loader."""
+    muat(mulai, selesai)  # isi cache lebih dulu
+    tracemalloc.start()
+    awal = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    dipegang = [muat(mulai, selesai) for _ in range(n_sesi)]
+    detik = time.perf_counter() - t0
+    tambahan = tracemalloc.get_traced_memory()[0] - awal
+    tracemalloc.stop()
+    del dipegang
+    return tambahan / 2**20, detik
+
+
+def muat_lama(mulai, selesai):
+    return load_data_lama(), load_statistik_provinsi_lama(mulai, selesai)
+
+
+def muat_baru(mulai, selesai):
+    return load_data(), load_statistik_provinsi(mulai, selesai)
+
+
+def cek_invalidasi():
+    asal = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(FILE_CSV, tmp)
+        shutil.copy(FILE_GEOJSON, tmp)
+        os.chdir(tmp)
+        try:
+            n_awal = len(load_data()[0])
+            df = pd.read_csv(FILE_CSV)
+            df.iloc[:-100].to_csv(FILE_CSV, index=False)
+            t0 = time.perf_counter()
+            n_baru = len(load_data()[0])
+            detik = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            load_data()
+            detik_hit = time.perf_counter() - t0
+        finally:
+            os.chdir(asal)
+    print(f"invalidasi: {n_awal:,} -> {n_baru:,} baris setelah CSV diubah "
+          f"(muat ulang {detik:.2f}s, pemanggilan berikutnya {detik_hit * 1000:.2f} ms)")
+
+
+def cek_lru(anggaran_mb):
+    df = load_data()[0]
+    lru = CacheLRU(int(anggaran_mb * 2**20))
+    tahun = sorted(df['time'].dt.year.unique())
+    for awal in tahun:
+        for akhir in tahun:
+            if akhir >= awal:
+                mulai, selesai = f'{awal}-01-01', f'{akhir}-12-31'
+                lru.ambil(('indeks', mulai, selesai),
+                          lambda: IndeksTitik(saring_tanggal(df, mulai, selesai)[KOLOM_TITIK]))
+    stat = lru.statistik()
+    print(f"LRU {anggaran_mb} MB: {stat['miss']} entri dibuat, {stat['entri']} tersimpan, {stat['dibuang']} dibuang, "
+          f"{stat['byte'] / 2**20:.1f} MB terpakai (1 indeks penuh ~ "
+          f"{perkiraan_ukuran(IndeksTitik(df[KOLOM_TITIK])) / 2**20:.1f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sesi', type=int, nargs='+', default=[1, 5, 20])
+    parser.add_argument('--anggaran-mb', type=float, default=8)
+    args = parser.parse_args()
+
+    if not os.path.exists(FILE_PARQUET):
+        pastikan_parquet()
+    mulai, selesai = '2004-01-01', '2024-12-31'
+    for n in args.sesi:
+        mb_lama, dt_lama = memori_sesi(muat_lama, n, mulai, selesai)
+        mb_baru, dt_baru = memori_sesi(muat_baru, n, mulai, selesai)
+        print(f"{n:>3} sesi: st.cache_data {mb_lama:8.2f} MB {dt_lama:6.3f}s   bersama {mb_baru:8.2f} MB {dt_baru:6.3f}s")
+    cek_invalidasi()
+    cek_lru(args.anggaran_mb)
+
+
+if __name__ == '__main__':
+    main()
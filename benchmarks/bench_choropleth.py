@@ -0,0 +1,93 @@
+"""Benchmark peta choropleth laporan statis: GeoJSON penuh dua lapisan vs GeoJSON ringkas satu lapisan.
+
+Untuk setiap varian dilaporkan jumlah verteks (biaya render di browser
+sebanding dengannya), ukuran HTML yang dikirim ke browser, dan waktu membangun
+HTML di server. Untuk varian ringkas, waktu penyederhanaan (sekali per versi
+GeoJSON, lalu di-cache) dilaporkan terpisah.
+
+    python benchmarks/bench_choropleth.py [--geojson "Batas Provinsi 50m.geojson"]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import folium
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_gempa import FILE_GEOJSON, FILE_PARQUET, baca_parquet, nama_kolom_provinsi, pastikan_parquet  # noqa: E402
+from geometri_provinsi import TINGKAT, sederhanakan  # noqa: E402
+from laporan_statis import peta_choropleth  # noqa: E402
+
+
+# Disalin dari pages/2_Laporan_Statis.py sebelum geometri_provinsi.py
+def peta_choropleth_lama(df_darat, gdf_provinsi):
+    provinsi_counts = df_darat.groupby('provinsi').size().reset_index(name='jumlah_gempa')
+    idx_max_mag = df_darat.groupby('provinsi')['mag'].idxmax()
+    max_mag_events = df_darat.loc[idx_max_mag, ['provinsi', 'mag', 'time']].copy()
+    max_mag_events['tahun_mag_maks'] = max_mag_events['time'].dt.year
+    max_mag_events.rename(columns={'mag': 'magnitudo_maks'}, inplace=True)
+    provinsi_stats = pd.merge(provinsi_counts, max_mag_events[['provinsi', 'magnitudo_maks', 'tahun_mag_maks']], on='provinsi', how='left')
+    prov_col_name = nama_kolom_provinsi(gdf_provinsi)
+    peta_data = gdf_provinsi.merge(provinsi_stats, left_on=prov_col_name, right_on='provinsi', how='left')
+    peta_data['jumlah_gempa'] = peta_data['jumlah_gempa'].fillna(0).astype(int)
+    peta_data['magnitudo_maks'] = peta_data['magnitudo_maks'].fillna(0)
+    peta_data['tahun_mag_maks'] = peta_data['tahun_mag_maks'].astype(object).fillna('N/A')
+    m_static = folium.Map(location=[-2.5, 118], zoom_start=5, tiles='CartoDB positron')
+    folium.Choropleth(
+        geo_data=peta_data, name='choropleth', data=peta_data,
+        columns=['provinsi', 'jumlah_gempa'], key_on=f'feature.properties.{prov_col_name}',
+        fill_color='YlOrRd', fill_opacity=0.7, line_opacity=0.2,
+        legend_name='Jumlah Total Gempa Darat'
+    ).add_to(m_static)
+    style_function = lambda x: {'fillColor': 'transparent', 'color': 'transparent', 'weight': 0}  # noqa: E731
+    tooltip = folium.features.GeoJsonTooltip(
+        fields=['provinsi', 'jumlah_gempa', 'magnitudo_maks', 'tahun_mag_maks'],
+        aliases=['Provinsi:', 'Jumlah Gempa:', 'Magnitudo Tertinggi:', 'Tahun Magnitudo Tertinggi:'],
+        style=("background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px;"),
+        localize=True
+    )
+    folium.GeoJson(peta_data, style_function=style_function, tooltip=tooltip).add_to(m_static)
+    folium.LayerControl().add_to(m_static)
+    return m_static.get_root().render()
+
+
+def laporkan(nama, n_verteks, html, detik_bangun, detik_siap=None):
+    siap = f"  sederhanakan {detik_siap * 1000:7.0f} ms" if detik_siap is not None else ''
+    print(f"{nama:8s} verteks={n_verteks:>9,}  HTML={len(html.encode()) / 2**20:8.2f} MB  "
+          f"bangun {detik_bangun * 1000:7.0f} ms{siap}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--geojson', default=os.path.join(ROOT, FILE_GEOJSON))
+    args = parser.parse_args()
+
+    pastikan_parquet()
+    df = baca_parquet(FILE_PARQUET)
+    gdf = gpd.read_file(args.geojson)
+    # Nama provinsi di katalog diganti agar cocok dengan GeoJSON yang diuji
+    nama = gdf[nama_kolom_provinsi(gdf)].tolist()
+    df = df.assign(provinsi=pd.Categorical(df['provinsi'].cat.codes.to_numpy() % len(nama)).rename_categories(nama))
+
+    t0 = time.perf_counter()
+    html = peta_choropleth_lama(df, gdf)
+    laporkan('penuh', int(shapely.get_num_coordinates(gdf.geometry.values).sum()), html, time.perf_counter() - t0)
+    for tingkat, (toleransi, desimal) in TINGKAT.items():
+        t0 = time.perf_counter()
+        koleksi = sederhanakan(gdf, toleransi, desimal)
+        detik_siap = time.perf_counter() - t0
+        n_verteks = int(shapely.get_num_coordinates(shapely.from_geojson(json.dumps(koleksi))).sum())
+        t0 = time.perf_counter()
+        html = peta_choropleth(df, koleksi)
+        laporkan(tingkat, n_verteks, html, time.perf_counter() - t0, detik_siap)
+
+
+if __name__ == '__main__':
+    main()
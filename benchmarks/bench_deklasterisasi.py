@@ -0,0 +1,126 @@
+"""Benchmark deklasterisasi Gardner-Knopoff: brute force, pemindaian jendela waktu, dan grid sel + searchsorted.
+
+Katalog mentah (semua CSV mentah di root repo, setelah `bersihkan` dan dedupe
+per `id` seperti ingest) dipakai apa adanya lalu digandakan `--kali` kali
+dengan geser waktu sepanjang rentang katalog, sehingga kepadatan per tahun
+tetap dan hanya panjang katalognya yang bertambah.
+
+Ada dua pembanding. Brute force O(n^2) membandingkan setiap gempa utama
+dengan semua kejadian dan hanya dijalankan pada subset `--subset`. Pemindaian
+jendela waktu mencari rentang waktu dengan `searchsorted` lalu memeriksa
+jarak semua kejadian di dalamnya; ia sudah jauh lebih cepat dari brute force
+dan menjadi pembanding untuk katalog penuh. Label ketiganya dicek sama.
+
+    python benchmarks/bench_deklasterisasi.py [--kali 10] [--subset 5000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from deklasterisasi import JENDELA, _haversine_km, deklasterisasi  # noqa: E402
+from katalog_mentah import baca_raw_bertahap, bersihkan, cari_file_raw  # noqa: E402
+
+
+def baca_katalog_raw():
+    df = pd.concat([bersihkan(c) for c in baca_raw_bertahap(cari_file_raw(ROOT))], ignore_index=True)
+    # Sama seperti ingest: satu baris per `id`, versi `updated` terbaru
+    df = df.assign(_updated=pd.to_datetime(df['updated'], format='ISO8601', utc=True))
+    df = df.sort_values('_updated').drop_duplicates('id', keep='last')
+    return df.sort_values('time', ignore_index=True)[['time', 'latitude', 'longitude', 'mag']]
+
+
+def gandakan(df, kali):
+    geser = (df['time'].max() - df['time'].min()) + pd.Timedelta(days=1)
+    return pd.concat([df.assign(time=df['time'] + geser * k) for k in range(kali)], ignore_index=True)
+
+
+def deklasterisasi_brute_force(waktu, lat, lon, mag, metode='gardner_knopoff'):
+    """O(n^2): setiap gempa utama dibandingkan dengan semua kejadian di katalog."""
+    hari = pd.to_datetime(pd.Series(waktu)).dt.tz_localize(None).to_numpy('datetime64[ns]').view(np.int64) / 86_400e9
+    lat, lon, mag = (np.asarray(x, dtype=np.float64) for x in (lat, lon, mag))
+    jarak_maks, waktu_maks = JENDELA[metode](mag)
+    id_klaster = np.full(len(mag), -1, dtype=np.int64)
+    utama = np.ones(len(mag), dtype=bool)
+    terpakai = np.zeros(len(mag), dtype=bool)
+    id_berikut = 0
+    for i in np.lexsort((hari, -mag)):
+        if terpakai[i]:
+            continue
+        terpakai[i] = True
+        cocok = (~terpakai & (np.abs(hari - hari[i]) <= waktu_maks[i]) & (mag <= mag[i])
+                 & (_haversine_km(lat[i], lon[i], lat, lon) <= jarak_maks[i]))
+        kandidat = np.flatnonzero(cocok)
+        if len(kandidat):
+            terpakai[kandidat] = True
+            id_klaster[i] = id_klaster[kandidat] = id_berikut
+            utama[kandidat] = False
+            id_berikut += 1
+    return id_klaster, utama
+
+
+def deklasterisasi_jendela_waktu(waktu, lat, lon, mag, metode='gardner_knopoff'):
+    """Pemindaian jendela waktu (searchsorted atas waktu saja) lalu cek jarak untuk setiap gempa utama."""
+    hari = pd.to_datetime(pd.Series(waktu)).dt.tz_localize(None).to_numpy('datetime64[ns]').view(np.int64) / 86_400e9
+    lat, lon, mag = (np.asarray(x, dtype=np.float64) for x in (lat, lon, mag))
+    jarak_maks, waktu_maks = JENDELA[metode](mag)
+    urutan = np.argsort(hari, kind='stable')
+    hari_urut = hari[urutan]
+    id_klaster = np.full(len(mag), -1, dtype=np.int64)
+    utama = np.ones(len(mag), dtype=bool)
+    terpakai = np.zeros(len(mag), dtype=bool)
+    id_berikut = 0
+    for i in np.lexsort((hari, -mag)):
+        if terpakai[i]:
+            continue
+        terpakai[i] = True
+        a = np.searchsorted(hari_urut, hari[i] - waktu_maks[i], side='left')
+        b = np.searchsorted(hari_urut, hari[i] + waktu_maks[i], side='right')
+        kandidat = urutan[a:b]
+        kandidat = kandidat[~terpakai[kandidat] & (mag[kandidat] <= mag[i])]
+        kandidat = kandidat[_haversine_km(lat[i], lon[i], lat[kandidat], lon[kandidat]) <= jarak_maks[i]]
+        if len(kandidat):
+            terpakai[kandidat] = True
+            id_klaster[i] = id_klaster[kandidat] = id_berikut
+            utama[kandidat] = False
+            id_berikut += 1
+    return id_klaster, utama
+
+
+def ukur(fungsi, df):
+    t0 = time.perf_counter()
+    hasil = fungsi(df['time'], df['latitude'], df['longitude'], df['mag'])
+    return time.perf_counter() - t0, hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--kali', type=int, default=10)
+    parser.add_argument('--subset', type=int, default=5000)
+    args = parser.parse_args()
+
+    df = baca_katalog_raw()
+    sub = df.iloc[:args.subset]
+    t_brute, (id_brute, utama_brute) = ukur(deklasterisasi_brute_force, sub)
+    t_jendela, (id_jendela, utama_jendela) = ukur(deklasterisasi_jendela_waktu, sub)
+    t_indeks, (id_indeks, utama_indeks) = ukur(deklasterisasi, sub)
+    sama = all(np.array_equal(id_brute, i) and np.array_equal(utama_brute, u)
+               for i, u in [(id_jendela, utama_jendela), (id_indeks, utama_indeks)])
+    print(f"subset {len(sub):>9,}: brute force {t_brute:7.2f}s  jendela waktu {t_jendela:7.2f}s  "
+          f"indeks {t_indeks:7.2f}s  label sama: {sama}")
+
+    for data in [df, gandakan(df, args.kali)]:
+        t_jendela, (_, utama_jendela) = ukur(deklasterisasi_jendela_waktu, data)
+        t_indeks, (_, utama) = ukur(deklasterisasi, data)
+        print(f"n={len(data):>9,}: jendela waktu {t_jendela:7.2f}s  indeks {t_indeks:7.2f}s  "
+              f"gempa utama {utama.sum():,} ({utama.mean():.1%})  sama: {np.array_equal(utama, utama_jendela)}")
+
+
+if __name__ == '__main__':
+    main()
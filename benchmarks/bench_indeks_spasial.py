@@ -0,0 +1,58 @@
+"""Benchmark indeks titik: waktu bangun dan kueri viewport pada katalog sintetis.
+
+Kejadian disebar acak seragam di kotak Indonesia. Untuk beberapa viewport/zoom dilaporkan
+waktu kueri dan jumlah fitur yang akan dikirim ke browser.
+
+    python benchmarks/bench_indeks_spasial.py [--n 1000000 10000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from indeks_spasial import BATAS_FITUR, IndeksTitik  # noqa: E402
+
+VIEWPORT = [
+    ('Indonesia z5', (95.0, -11.0, 141.0, 6.0), 5),
+    ('Jawa z7', (105.0, -9.0, 115.0, -5.5), 7),
+    ('Jawa Barat z9', (106.0, -8.0, 109.0, -6.0), 9),
+    ('Bandung z12', (107.5, -7.0, 107.75, -6.8), 12),
+    ('Kota z15', (107.6, -6.93, 107.63, -6.9), 15),
+]
+
+
+def buat_katalog(n, rng):
+    lat = rng.uniform(-11, 6, n)
+    lon = rng.uniform(95, 141, n)
+    return pd.DataFrame({'latitude': lat, 'longitude': lon, 'mag': rng.gamma(2.0, 1.0, n) + 2.5})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--ulang', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n in args.n:
+        df = buat_katalog(n, rng)
+        t0 = time.perf_counter()
+        indeks = IndeksTitik(df)
+        print(f"n={n:>11,}  bangun {time.perf_counter() - t0:6.2f} s")
+        for nama, bbox, zoom in VIEWPORT:
+            t0 = time.perf_counter()
+            for _ in range(args.ulang):
+                jenis, fitur = indeks.kueri(*bbox, zoom)
+            ms = (time.perf_counter() - t0) / args.ulang * 1000
+            tanda = '' if len(fitur) <= BATAS_FITUR else '  (MELEBIHI BATAS)'
+            print(f"    {nama:14s} {ms:7.2f} ms  {jenis:7s} {len(fitur):>6,} fitur{tanda}")
+
+
+if __name__ == '__main__':
+    main()
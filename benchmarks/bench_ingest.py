@@ -0,0 +1,87 @@
+"""Benchmark ingesti: jalur notebook lama vs pembaca bertahap (chunked).
+
+Kedua jalur membangun katalog gempa darat dari nol untuk file mentah yang sama,
+masing-masing di proses baru. Dilaporkan throughput (baris/detik) dan RSS
+puncak di atas RSS setelah impor.
+
+    python benchmarks/bench_ingest.py [--raw-dir .] [--chunk 20000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_gempa import FILE_GEOJSON  # noqa: E402
+from katalog_mentah import UKURAN_CHUNK, cari_file_raw  # noqa: E402
+
+# Disalin dari sel preprocessing notebook sebelum ingest_gempa.py
+KODE_LAMA = """
+import geopandas as gpd, pandas as pd
+def jalankan(raw_files, geojson, tmpdir, chunk):
+    df_raw = pd.concat([pd.read_csv(f) for f in raw_files], ignore_index=True)
+    n = len(df_raw)
+    df_raw.drop_duplicates(inplace=True)
+    df_raw['time'] = pd.to_datetime(df_raw['time'], errors='coerce')
+    for col in ['latitude', 'longitude', 'depth', 'mag']:
+        df_raw[col] = pd.to_numeric(df_raw[col], errors='coerce')
+    df_raw.dropna(subset=['time', 'latitude', 'longitude', 'depth', 'mag', 'magType', 'type', 'status'], inplace=True)
+    df_clean = df_raw[(df_raw['type'] == 'earthquake') & (df_raw['status'] == 'reviewed')].copy()
+    gdf_gempa = gpd.GeoDataFrame(df_clean, geometry=gpd.points_from_xy(df_clean.longitude, df_clean.latitude), crs="EPSG:4326")
+    gdf_provinsi = gpd.read_file(geojson).to_crs(gdf_gempa.crs)
+    gempa_darat = gpd.sjoin(gdf_gempa, gdf_provinsi, how="inner", predicate="within")
+    gempa_darat.to_csv(tmpdir + '/data_gempa_darat.csv', index=False)
+    return n
+"""
+
+KODE_BERTAHAP = """
+import os
+from ingest_gempa import ingest
+def jalankan(raw_files, geojson, tmpdir, chunk):
+    r = ingest(raw_files, store_path=os.path.join(tmpdir, 'store.parquet'), csv_path=os.path.join(tmpdir, 'darat.csv'),
+               manifest_path=os.path.join(tmpdir, 'manifest.json'), geojson_path=geojson, penuh=True, ukuran_chunk=chunk,
+               laut_path=os.path.join(tmpdir, 'laut.parquet'), dir_partisi=os.path.join(tmpdir, 'partisi'))
+    return r['baris_dibaca']
+"""
+
+PENGUKUR = """
+import json, resource, sys, time
+raw_files, geojson, tmpdir, chunk = json.loads(sys.argv[1])
+rss_awal = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+n = jalankan(raw_files, geojson, tmpdir, chunk)
+detik = time.perf_counter() - t0
+rss_puncak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'baris': n, 'detik': detik, 'rss_puncak_mb': rss_puncak / 1024,
+                  'rss_tambahan_mb': (rss_puncak - rss_awal) / 1024}))
+"""
+
+
+def ukur(kode, raw_files, geojson, chunk):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        arg = json.dumps([raw_files, geojson, tmpdir, chunk])
+        hasil = subprocess.run([sys.executable, '-c', kode + PENGUKUR, arg], cwd=ROOT,
+                               env={**os.environ, 'PYTHONPATH': ROOT}, capture_output=True, text=True, check=True)
+    return json.loads(hasil.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--raw-dir', default=ROOT)
+    parser.add_argument('--geojson', default=os.path.join(ROOT, FILE_GEOJSON))
+    parser.add_argument('--chunk', type=int, default=UKURAN_CHUNK)
+    args = parser.parse_args()
+
+    raw_files = [os.path.abspath(f) for f in cari_file_raw(args.raw_dir)]
+    for nama, kode in [('notebook', KODE_LAMA), ('bertahap', KODE_BERTAHAP)]:
+        r = ukur(kode, raw_files, os.path.abspath(args.geojson), args.chunk)
+        print(f"{nama:9s} baris={r['baris']:>9,}  {r['baris'] / r['detik']:>10,.0f} baris/detik  "
+              f"RSS puncak={r['rss_puncak_mb']:7.1f} MB  (+{r['rss_tambahan_mb']:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
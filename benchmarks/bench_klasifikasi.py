@@ -0,0 +1,61 @@
+"""Benchmark klasifikasi magnitudo: `apply` per baris vs skala_magnitudo.
+
+Magnitudo sintetis (float64 dan float32) diklasifikasikan dengan fungsi
+skalar lama lewat `Series.apply` lalu dijadikan Categorical, dan dengan
+`skala_magnitudo.klasifikasi`. Dilaporkan waktu dan memori kolom hasil
+(label string per baris vs kode kategori).
+
+    python benchmarks/bench_klasifikasi.py [--n 1000000 10000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from skala_magnitudo import KATEGORI_URUTAN, klasifikasi  # noqa: E402
+
+
+# Disalin dari pages/1_Analisis_Interaktif.py sebelum skala_magnitudo.py
+def klasifikasi_bmkg(mag):
+    if mag < 2.5: return 'Mikro (Tidak Terasa, < 2.5)'
+    elif mag <= 5.4: return 'Ringan (Dirasakan, 2.5 - 5.4)'
+    elif mag <= 6.0: return 'Sedang (5.5 - 6.0)'
+    elif mag <= 6.9: return 'Kuat (6.1 - 6.9)'
+    elif mag <= 7.9: return 'Besar (7.0 - 7.9)'
+    else: return 'Dahsyat (>= 8.0)'
+
+
+def ukur(fungsi):
+    t0 = time.perf_counter()
+    hasil = fungsi()
+    return hasil, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n in args.n:
+        mag = pd.Series(np.round(rng.gamma(2.0, 1.0, n) + 2.0, 1))
+        label, t_apply = ukur(lambda: mag.apply(klasifikasi_bmkg))
+        lama, t_kategori = ukur(lambda: pd.Categorical(label, categories=KATEGORI_URUTAN, ordered=True))
+        baru, t_baru = ukur(lambda: klasifikasi(mag.to_numpy()))
+        baru32, t_baru32 = ukur(lambda: klasifikasi(mag.to_numpy(np.float32)))
+        assert (lama == baru).all() and (lama == baru32).all()
+        mb = lambda obj: pd.Series(obj).memory_usage(deep=True, index=False) / 2**20  # noqa: E731
+        print(f"n={n:>11,}")
+        print(f"    apply + Categorical  {t_apply + t_kategori:8.3f} s  (label string {mb(label):8.1f} MB)")
+        print(f"    vektor float64       {t_baru:8.3f} s  (kategori     {mb(baru):8.1f} MB)")
+        print(f"    vektor float32       {t_baru32:8.3f} s  ({(t_apply + t_kategori) / t_baru32:,.0f}x lebih cepat)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark filter dasbor: pemindaian tabel kejadian vs kubus agregat.
+
+Untuk katalog yang digandakan N kali, bandingkan waktu menjawab satu
+interaksi sidebar (ringkasan, crosstab profil, tren bulanan, komposisi).
+
+    python benchmarks/bench_kubus.py [--kali 1 10 100]
+"""
+import argparse
+import datetime as dt
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_gempa import FILE_CSV, FILE_PARQUET, baca_parquet, pastikan_parquet  # noqa: E402
+from kubus_agregat import KubusGempa  # noqa: E402
+
+FILTER = [(dt.date(2004, 1, 1), dt.date(2024, 12, 31), None),
+          (dt.date(2010, 3, 15), dt.date(2012, 7, 9), None),
+          (dt.date(2015, 6, 2), dt.date(2023, 1, 20), 'ACEH')]
+
+
+def pindai(df, mulai, selesai, provinsi):
+    # Jalur lama dari 1_Analisis_Interaktif.py
+    f = df[(df['time'].dt.date >= mulai) & (df['time'].dt.date <= selesai)]
+    if provinsi:
+        f = f[f['provinsi'] == provinsi]
+    f['mag'].max(), f['provinsi'].mode()
+    pd.crosstab(f['provinsi'], f['klasifikasi'])
+    f.set_index('time')['mag'].resample('ME').agg(['size', 'max'])
+    f['klasifikasi'].value_counts()
+
+
+def kubus(k, mulai, selesai, provinsi):
+    h = k.kueri(mulai, selesai, provinsi)
+    h.mag_maks(), h.provinsi_terbanyak(), h.profil(), h.tren_bulanan(), h.komposisi()
+
+
+def waktu_ms(fungsi, *args, ulang=3):
+    terbaik = float('inf')
+    for _ in range(ulang):
+        t0 = time.perf_counter()
+        fungsi(*args)
+        terbaik = min(terbaik, time.perf_counter() - t0)
+    return terbaik * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--kali', type=int, nargs='+', default=[1, 10, 100])
+    args = parser.parse_args()
+
+    pastikan_parquet(os.path.join(ROOT, FILE_CSV), os.path.join(ROOT, FILE_PARQUET))
+    dasar = baca_parquet(os.path.join(ROOT, FILE_PARQUET))
+    for kali in args.kali:
+        df = pd.concat([dasar] * kali, ignore_index=True)
+        t0 = time.perf_counter()
+        k = KubusGempa(df)
+        bangun = (time.perf_counter() - t0) * 1000
+        t_pindai = sum(waktu_ms(pindai, df, *f) for f in FILTER) / len(FILTER)
+        t_kubus = sum(waktu_ms(kubus, k, *f) for f in FILTER) / len(FILTER)
+        print(f"x{kali:<4d} {len(df):>10,} kejadian  pindai={t_pindai:9.1f} ms  kubus={t_kubus:6.1f} ms  "
+              f"(bangun kubus sekali: {bangun:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark kueri bahaya: pemindaian penuh vs indeks waktu + KD-tree.
+
+Katalog sintetis disebar di kotak Indonesia. Dibandingkan: kueri ambang
+(mag/kedalaman/jendela waktu), kueri radius di sekitar satu titik, dan
+penilaian batch banyak lokasi fasilitas.
+
+    python benchmarks/bench_kueri_bahaya.py [--n 100000 1000000] [--lokasi 5000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kueri_bahaya import R_BUMI_KM, KueriBahaya  # noqa: E402
+
+
+def buat_katalog(n, rng):
+    waktu = pd.Timestamp('2004-01-01', tz='UTC') + pd.to_timedelta(np.sort(rng.uniform(0, 21 * 365, n)), unit='D')
+    return pd.DataFrame({
+        'time': waktu.astype('datetime64[ns, UTC]'),
+        'latitude': rng.uniform(-11, 6, n).astype(np.float32),
+        'longitude': rng.uniform(95, 141, n).astype(np.float32),
+        'depth': rng.gamma(1.5, 30.0, n).astype(np.float32),
+        'mag': np.round(rng.gamma(2.0, 0.8, n) + 2.5, 1).astype(np.float32),
+        'provinsi': pd.Categorical(rng.integers(0, 38, n)),
+    })
+
+
+def haversine(lat, lon, lat0, lon0):
+    lat, lon, lat0, lon0 = map(np.radians, (lat, lon, lat0, lon0))
+    a = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat) * np.cos(lat0) * np.sin((lon - lon0) / 2) ** 2
+    return 2 * R_BUMI_KM * np.arcsin(np.sqrt(a))
+
+
+def ukur(fungsi, ulang=5):
+    t0 = time.perf_counter()
+    for _ in range(ulang):
+        hasil = fungsi()
+    return hasil, (time.perf_counter() - t0) / ulang * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--lokasi', type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n in args.n:
+        df = buat_katalog(n, rng)
+        t0 = time.perf_counter()
+        kueri = KueriBahaya(df)
+        print(f"n={n:>10,}  bangun indeks {time.perf_counter() - t0:6.2f} s")
+        lat, lon = df['latitude'].to_numpy(np.float64), df['longitude'].to_numpy(np.float64)
+
+        scan, ms_scan = ukur(lambda: df[(df['mag'] >= 6.0) & (df['depth'] < 70) & (df['time'] >= '2010-01-01') & (df['time'] < '2016-01-01')])
+        hasil, ms = ukur(lambda: kueri.ambang(6.0, 70, '2010-01-01', '2015-12-31'))
+        assert len(scan) == len(hasil)
+        print(f"    ambang             scan {ms_scan:9.2f} ms   indeks {ms:7.2f} ms  ({len(hasil):,} kejadian)")
+
+        scan, ms_scan = ukur(lambda: np.flatnonzero(haversine(lat, lon, -6.9147, 107.6098) <= 100))
+        hasil, ms = ukur(lambda: kueri.radius(-6.9147, 107.6098, 100))
+        assert len(scan) == len(hasil)
+        print(f"    radius 100 km      scan {ms_scan:9.2f} ms   indeks {ms:7.2f} ms  ({len(hasil):,} kejadian)")
+
+        la, lo = rng.uniform(-10, 5, args.lokasi), rng.uniform(96, 140, args.lokasi)
+        hasil, ms = ukur(lambda: kueri.skor_lokasi(la, lo, 50, mag_min=5.0), ulang=1)
+        ms_scan = ukur(lambda: [(haversine(lat, lon, a, b) <= 50).sum() for a, b in zip(la[:50], lo[:50])], ulang=1)[1]
+        print(f"    {args.lokasi:,} lokasi 50 km  scan {ms_scan * args.lokasi / 50:9.0f} ms*  indeks {ms:7.0f} ms  "
+              "(*diekstrapolasi dari 50 lokasi)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark cold-load: jalur CSV lama vs file Parquet bertipe.
+
+Setiap jalur dijalankan di proses Python baru sehingga tidak ada cache pandas
+yang terbawa, lalu dicatat waktu muat, pertambahan memori residen (RSS), dan
+ukuran frame hasilnya. Opsi --kali menggandakan katalog N kali untuk melihat
+perilaku pada data yang lebih besar.
+
+    python benchmarks/bench_load_data.py [--ulang 5] [--kali 1 10 100]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_gempa import FILE_CSV, FILE_PARQUET, konversi_csv_ke_parquet, pastikan_parquet  # noqa: E402
+
+# Kode jalur lama disalin apa adanya dari load_data() sebelum lapisan data bersama.
+KODE_CSV = """
+import pandas as pd
+def klasifikasi_bmkg(mag):
+    if mag < 2.5: return 'Mikro (Tidak Terasa, < 2.5)'
+    elif mag <= 5.4: return 'Ringan (Dirasakan, 2.5 - 5.4)'
+    elif mag <= 6.0: return 'Sedang (5.5 - 6.0)'
+    elif mag <= 6.9: return 'Kuat (6.1 - 6.9)'
+    elif mag <= 7.9: return 'Besar (7.0 - 7.9)'
+    else: return 'Dahsyat (>= 8.0)'
+def muat(csv_path, parquet_path):
+    df = pd.read_csv(csv_path)
+    df['time'] = pd.to_datetime(df['time'], format='ISO8601')
+    df['klasifikasi'] = df['mag'].apply(klasifikasi_bmkg)
+    return df
+"""
+
+KODE_PARQUET = """
+from data_gempa import baca_parquet
+def muat(csv_path, parquet_path):
+    return baca_parquet(parquet_path)
+"""
+
+# pyarrow dimuat sebelum pengukuran di kedua jalur (pandas juga memakainya untuk
+# kolom string), jadi yang terukur hanya biaya membaca dan menyiapkan data.
+PENGUKUR = """
+import json, os, sys, time
+import pyarrow.parquet
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+rss_awal = rss_mb()
+t0 = time.perf_counter()
+df = muat(sys.argv[1], sys.argv[2])
+detik = time.perf_counter() - t0
+print(json.dumps({'detik': detik, 'rss_mb': rss_mb() - rss_awal,
+                  'frame_mb': df.memory_usage(deep=True).sum() / 2**20, 'baris': len(df)}))
+"""
+
+
+def jalankan(kode, csv_path, parquet_path):
+    hasil = subprocess.run([sys.executable, '-c', kode + PENGUKUR, csv_path, parquet_path], cwd=ROOT,
+                           env={**os.environ, 'PYTHONPATH': ROOT}, capture_output=True, text=True, check=True)
+    return json.loads(hasil.stdout.strip().splitlines()[-1])
+
+
+def siapkan_file(kali, tmpdir):
+    csv_path, parquet_path = os.path.join(ROOT, FILE_CSV), os.path.join(ROOT, FILE_PARQUET)
+    if kali == 1:
+        pastikan_parquet(csv_path, parquet_path)
+        return csv_path, parquet_path
+    df = pd.read_csv(csv_path)
+    csv_besar = os.path.join(tmpdir, f'gempa_x{kali}.csv')
+    parquet_besar = os.path.join(tmpdir, f'gempa_x{kali}.parquet')
+    pd.concat([df] * kali, ignore_index=True).to_csv(csv_besar, index=False)
+    konversi_csv_ke_parquet(csv_besar, parquet_besar)
+    return csv_besar, parquet_besar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ulang', type=int, default=5)
+    parser.add_argument('--kali', type=int, nargs='+', default=[1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for kali in args.kali:
+            csv_path, parquet_path = siapkan_file(kali, tmpdir)
+            for nama, kode in [('csv', KODE_CSV), ('parquet', KODE_PARQUET)]:
+                runs = [jalankan(kode, csv_path, parquet_path) for _ in range(args.ulang)]
+                print(f"x{kali:<4d} {nama:8s} baris={runs[0]['baris']:>10,}  "
+                      f"muat={statistics.median(r['detik'] for r in runs) * 1000:9.1f} ms  "
+                      f"RSS+={statistics.median(r['rss_mb'] for r in runs):7.1f} MB  "
+                      f"frame={runs[0]['frame_mb']:7.2f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark katalog terpartisi: build paralel dan baca terpangkas vs satu file Parquet.
+
+Katalog mentah sintetis (lihat katalog_sintetis.py) dibangun dua kali: sebagai
+satu store Parquet lewat `ingest_gempa.ingest` dan sebagai partisi
+wilayah/tahun lewat `partisi_katalog.bangun_partisi` dengan 1 dan `--proses`
+proses. Lalu untuk beberapa filter dasbor dibandingkan: baca seluruh store +
+`saring_tanggal` (jalur `load_data`) vs baca partisi yang tersentuh filter
+saja. Dilaporkan jumlah partisi yang dibuka, waktu, dan ukuran frame hasil.
+
+    python benchmarks/bench_partisi.py [--n 1000000] [--proses 4] [--ulang 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_gempa import FILE_GEOJSON, baca_parquet  # noqa: E402
+from ingest_gempa import ingest  # noqa: E402
+from katalog_sintetis import baca_template, buat_katalog_raw, tulis_katalog_raw  # noqa: E402
+from kubus_agregat import KubusGempa, _kubus_partisi  # noqa: E402
+from partisi_katalog import WILAYAH_BAWAAN, baca_partisi, bangun_partisi, daftar_partisi, petakan, saring  # noqa: E402
+
+WILAYAH = (WILAYAH_BAWAAN,)
+
+
+def ukur(fungsi, ulang):
+    """(hasil terakhir, detik tercepat)."""
+    terbaik = float('inf')
+    for _ in range(ulang):
+        t0 = time.perf_counter()
+        hasil = fungsi()
+        terbaik = min(terbaik, time.perf_counter() - t0)
+    return hasil, terbaik
+
+
+def mb(df):
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--proses', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--ulang', type=int, default=3)
+    parser.add_argument('--geojson', default=os.path.join(ROOT, FILE_GEOJSON))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_files = tulis_katalog_raw(buat_katalog_raw(args.n, args.seed, baca_template()), tmp)
+        store = os.path.join(tmp, 'store.parquet')
+        dir_partisi = os.path.join(tmp, 'partisi')
+        wilayah = {WILAYAH_BAWAAN: args.geojson}
+
+        t0 = time.perf_counter()
+        ingest(raw_files, store_path=store, csv_path=os.path.join(tmp, 'darat.csv'),
+               manifest_path=os.path.join(tmp, 'manifest.json'), geojson_path=args.geojson, penuh=True,
+               laut_path=os.path.join(tmp, 'laut.parquet'), dir_partisi=dir_partisi)
+        print(f"n={args.n:,} mentah, {len(raw_files)} file")
+        print(f"build satu file (ingest):              {time.perf_counter() - t0:7.2f}s")
+        for n_proses in sorted({1, args.proses}):
+            t0 = time.perf_counter()
+            info = bangun_partisi(raw_files, dir_partisi, wilayah, lepas_pantai=True, n_proses=n_proses)
+            print(f"build partisi, {n_proses} proses:                {time.perf_counter() - t0:7.2f}s "
+                  f"({len(info['partisi'])} partisi)")
+
+        df_penuh = baca_parquet(store)
+        tahun = int(df_penuh['time'].dt.year.max())
+        provinsi = df_penuh['provinsi'].value_counts().index[0]
+        filter_ = [
+            ('semua tahun', f'{tahun - 40}-01-01', f'{tahun}-12-31', None),
+            ('5 tahun', f'{tahun - 4}-01-01', f'{tahun}-12-31', None),
+            ('1 tahun', f'{tahun}-01-01', f'{tahun}-12-31', None),
+            ('1 tahun, 1 provinsi', f'{tahun}-01-01', f'{tahun}-12-31', provinsi),
+            ('1 bulan, 1 provinsi', f'{tahun}-06-01', f'{tahun}-06-30', provinsi),
+        ]
+        print(f"\n{'filter':<22}{'baris':>10}{'partisi':>9}{'satu file':>12}{'terpangkas':>12}{'MB penuh':>10}{'MB hasil':>10}")
+        for nama, mulai, selesai, prov in filter_:
+            lama, dt_lama = ukur(lambda: saring(baca_parquet(store), mulai, selesai, prov), args.ulang)
+            baru, dt_baru = ukur(lambda: baca_partisi(dir_partisi, WILAYAH, mulai, selesai, prov), args.ulang)
+            assert len(lama) == len(baru), (nama, len(lama), len(baru))
+            n_partisi = len(daftar_partisi(dir_partisi, WILAYAH, mulai, selesai))
+            print(f"{nama:<22}{len(baru):>10,}{n_partisi:>9}{dt_lama:>11.3f}s{dt_baru:>11.3f}s"
+                  f"{mb(df_penuh):>10.1f}{mb(baru):>10.1f}")
+
+        paths = [(p,) for p in daftar_partisi(dir_partisi, WILAYAH)]
+        _, dt_satu = ukur(lambda: KubusGempa(df_penuh), args.ulang)
+        print(f"\nkubus dari frame penuh (sudah dimuat):  {dt_satu:7.3f}s")
+        for n_proses in sorted({1, args.proses}):
+            kubus, dt = ukur(lambda: KubusGempa.gabung(petakan(_kubus_partisi, paths, n_proses)), args.ulang)
+            print(f"kubus per partisi, {n_proses} proses (baca+gabung): {dt:7.3f}s")
+        acuan = KubusGempa(df_penuh).kueri(f'{tahun - 4}-01-01', f'{tahun}-12-31')
+        assert kubus.kueri(f'{tahun - 4}-01-01', f'{tahun}-12-31').profil().equals(acuan.profil())
+        print(f"\nbaris darat: satu file {len(df_penuh):,}, partisi {len(baca_partisi(dir_partisi, WILAYAH)):,}")
+
+
+if __name__ == '__main__':
+    pd.set_option('display.width', 140)
+    main()
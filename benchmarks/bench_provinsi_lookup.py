@@ -0,0 +1,70 @@
+"""Benchmark penentuan provinsi: `gpd.sjoin(predicate="within")` vs PencariProvinsi.
+
+Memakai seluruh katalog mentah (semua file CSV USGS), memastikan pasangan
+(titik, provinsi) dari kedua cara identik, lalu melaporkan waktunya.
+
+    python benchmarks/bench_provinsi_lookup.py [--raw-dir .] [--geojson ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_gempa import FILE_GEOJSON, nama_kolom_provinsi  # noqa: E402
+from katalog_mentah import DTYPE_RAW, cari_file_raw  # noqa: E402
+from provinsi_lookup import PencariProvinsi  # noqa: E402
+
+
+def waktu(fungsi, ulang):
+    hasil, terbaik = None, float('inf')
+    for _ in range(ulang):
+        t0 = time.perf_counter()
+        hasil = fungsi()
+        terbaik = min(terbaik, time.perf_counter() - t0)
+    return hasil, terbaik
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--raw-dir', default=ROOT)
+    parser.add_argument('--geojson', default=os.path.join(ROOT, FILE_GEOJSON))
+    parser.add_argument('--ulang', type=int, default=3)
+    args = parser.parse_args()
+
+    df = pd.concat([pd.read_csv(f, usecols=['latitude', 'longitude'], dtype=DTYPE_RAW)
+                    for f in cari_file_raw(args.raw_dir)], ignore_index=True)
+    gdf_provinsi = gpd.read_file(args.geojson)
+    prov_col_name = nama_kolom_provinsi(gdf_provinsi)
+    lon, lat = df['longitude'].to_numpy(), df['latitude'].to_numpy()
+
+    def pakai_sjoin():
+        gdf_gempa = gpd.GeoDataFrame(geometry=gpd.points_from_xy(lon, lat), crs="EPSG:4326")
+        j = gpd.sjoin(gdf_gempa, gdf_provinsi.to_crs(gdf_gempa.crs), how="inner", predicate="within")
+        return j.index.to_numpy(), j['index_right'].to_numpy()
+
+    (sj_titik, sj_prov), t_sjoin = waktu(pakai_sjoin, args.ulang)
+    pencari, t_bangun = waktu(lambda: PencariProvinsi(gdf_provinsi, kolom_nama=prov_col_name), 1)
+    (pc_titik, pc_prov), t_lookup = waktu(lambda: pencari.pasangan(lon, lat), args.ulang)
+
+    urutan = np.lexsort((sj_prov, sj_titik))
+    sama = np.array_equal(sj_titik[urutan], pc_titik) and np.array_equal(sj_prov[urutan], pc_prov)
+    jumlah_sel = pencari.grid.size
+    print(f"{len(df):,} titik, {len(gdf_provinsi)} provinsi, {len(pc_titik):,} pasangan di darat, hasil identik: {sama}")
+    print(f"sel grid: {jumlah_sel:,} ({(pencari.grid == -1).mean():.0%} kosong, {(pencari.grid >= 0).mean():.0%} pasti, "
+          f"{(pencari.grid == -2).mean():.0%} ambigu)")
+    print(f"sjoin            : {t_sjoin * 1000:8.1f} ms")
+    print(f"PencariProvinsi  : {t_lookup * 1000:8.1f} ms  (bangun indeks sekali: {t_bangun * 1000:.1f} ms)  "
+          f"-> {t_sjoin / t_lookup:.1f}x lebih cepat")
+    if not sama:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark statistik Gutenberg-Richter: loop pandas per kelompok vs histogram tervektorisasi.
+
+Katalog sintetis dengan magnitudo mengikuti G-R (b = 1) di atas Mc yang
+berbeda per provinsi. Jalur loop menghitung Mc dan nilai b per provinsi dan
+per jendela geser dengan groupby seperti analisis notebook; jalur baru
+memakai statistik_seismik. Bootstrap diukur dengan 1 proses dan dengan semua
+CPU.
+
+    python benchmarks/bench_statistik_seismik.py [--n 100000 1000000] [--ulang 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from statistik_seismik import DM, MIN_KEJADIAN, bootstrap_b, histogram_tahunan, statistik_jendela, statistik_provinsi  # noqa: E402
+
+
+def buat_katalog(n, rng, n_provinsi=38):
+    prov = rng.integers(0, n_provinsi, n)
+    mc = 3.0 + (prov % 5) * 0.3
+    mag = mc - 0.5 + rng.exponential(np.log10(np.e) / 1.0, n)
+    # Kejadian di bawah Mc sebagian tidak tercatat
+    tercatat = rng.random(n) < np.clip(1 - (mc - mag), 0, 1)
+    waktu = pd.Timestamp('2004-01-01', tz='UTC') + pd.to_timedelta(rng.uniform(0, 21 * 365, n), unit='D')
+    return pd.DataFrame({'time': waktu, 'mag': np.round(mag, 1).astype(np.float32),
+                         'provinsi': pd.Categorical([f'P{p:02d}' for p in prov])})[tercatat].reset_index(drop=True)
+
+
+def b_loop(mag):
+    mb = np.rint(mag.astype(np.float64) / DM) * DM
+    nilai, jumlah = np.unique(np.round(mb, 1), return_counts=True)
+    mc = nilai[np.argmax(jumlah)] + 0.2
+    sel = mb[mb >= mc - 1e-9]
+    return np.log10(np.e) / (sel.mean() - (mc - DM / 2)) if len(sel) >= MIN_KEJADIAN else np.nan
+
+
+def jalur_loop(df, panjang=5):
+    per_prov = df.groupby('provinsi', observed=True)['mag'].apply(lambda m: b_loop(m.to_numpy()))
+    tahun = df['time'].dt.year
+    jendela = {}
+    for mulai in range(tahun.min(), tahun.max() - panjang + 2):
+        sub = df[(tahun >= mulai) & (tahun < mulai + panjang)]
+        for prov, g in sub.groupby('provinsi', observed=True):
+            jendela[(prov, mulai)] = b_loop(g['mag'].to_numpy())
+    return per_prov, jendela
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--ulang', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n in args.n:
+        df = buat_katalog(n, rng)
+        t0 = time.perf_counter()
+        per_prov, _ = jalur_loop(df)
+        t_loop = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        tabel = statistik_provinsi(df, n_ulang=0)
+        jendela = statistik_jendela(df)
+        t_vektor = time.perf_counter() - t0
+        assert np.allclose(tabel.loc[per_prov.index, 'b'], per_prov, equal_nan=True)
+        print(f"n={len(df):>10,}  loop {t_loop * 1000:8.0f} ms   vektor {t_vektor * 1000:6.1f} ms  "
+              f"({len(tabel)} provinsi, {len(jendela)} provinsi x jendela)")
+
+        H = histogram_tahunan(df)[0].sum(axis=1)
+        for n_proses in sorted({1, os.cpu_count() or 1}):
+            t0 = time.perf_counter()
+            bootstrap_b(H, args.ulang, n_proses=n_proses)
+            print(f"    bootstrap {args.ulang} replikasi, {n_proses} proses: {(time.perf_counter() - t0) * 1000:7.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
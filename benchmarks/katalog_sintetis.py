@@ -0,0 +1,169 @@
+"""Katalog gempa sintetis berskema CSV mentah USGS untuk benchmark skala besar.
+
+Lokasi, kedalaman, jenis magnitudo, dan teks `place` diambil ulang dari katalog
+mentah asli di root repo (template), jadi kepadatan spasial mengikuti zona
+subduksi dan sesar di Indonesia. Di atasnya ditambahkan:
+
+- magnitudo Gutenberg-Richter (b = 1) di atas MC, dibulatkan 0.1;
+- waktu kejadian latar seragam di rentang katalog;
+- deret gempa susulan: induk dipilih sebanding 10^(ALFA (M - MC)), jarak
+  dalam skala panjang runtuhan induk, waktu Omori (c, p), dan magnitudo lebih
+  kecil dari induknya;
+- sebagian kecil baris duplikat versi lama (kolom `updated` lebih awal) serta
+  kejadian non-`earthquake`/non-`reviewed`, agar dedupe dan filter ingesti
+  ikut teruji.
+
+Semua acak berasal dari satu seed, jadi katalog yang sama dapat dibuat ulang.
+
+    python benchmarks/katalog_sintetis.py --n 1000000 --tujuan /tmp/sintetis
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from katalog_mentah import baca_raw_bertahap, bersihkan, cari_file_raw  # noqa: E402
+
+KOLOM_RAW = ['time', 'latitude', 'longitude', 'depth', 'mag', 'magType', 'nst', 'gap', 'dmin', 'rms', 'net', 'id',
+             'updated', 'place', 'type', 'horizontalError', 'depthError', 'magError', 'magNst', 'status',
+             'locationSource', 'magSource']
+MULAI, SELESAI = '2004-01-01', '2025-01-01'
+# Pembagian file seperti unduhan USGS di repo
+PERIODE_FILE = [(2004, 2008), (2009, 2013), (2014, 2018), (2019, 2024)]
+MC = 4.0
+B = 1.0
+MAG_MAKS = 9.1
+ALFA = 0.8
+FRAKSI_SUSULAN = 0.35
+OMORI_C, OMORI_P, OMORI_MAKS_HARI = 0.05, 1.1, 365.0
+JITTER_DERAJAT = 0.15
+FRAKSI_DUPLIKAT = 0.01
+FRAKSI_BUKAN_GEMPA = 0.005
+
+
+def baca_template(raw_dir=ROOT):
+    """Kolom template (lokasi, kedalaman, magType, place) dari katalog mentah asli."""
+    df = pd.concat([bersihkan(c) for c in baca_raw_bertahap(cari_file_raw(raw_dir))], ignore_index=True)
+    return df[['latitude', 'longitude', 'depth', 'magType', 'place']].reset_index(drop=True)
+
+
+def _magnitudo(rng, n, mc=MC, maks=MAG_MAKS):
+    # Eksponensial terpotong: inversi CDF G-R di [mc, maks]
+    beta = B * np.log(10)
+    u = rng.random(n)
+    return mc - np.log(1 - u * (1 - np.exp(-beta * (maks - mc)))) / beta
+
+
+def _omori_hari(rng, n):
+    # Inversi CDF Omori termodifikasi (c, p) terpotong di OMORI_MAKS_HARI
+    q = 1 - OMORI_P
+    atas = (OMORI_MAKS_HARI + OMORI_C) ** q - OMORI_C ** q
+    return (OMORI_C ** q + rng.random(n) * atas) ** (1 / q) - OMORI_C
+
+
+def _iso(waktu_ns):
+    return np.char.add(np.datetime_as_string(waktu_ns.astype('datetime64[ms]'), unit='ms'), 'Z')
+
+
+def buat_katalog_raw(n, seed=0, template=None):
+    """DataFrame `n` baris berskema CSV mentah USGS (termasuk duplikat dan non-gempa)."""
+    rng = np.random.default_rng(seed)
+    template = baca_template() if template is None else template
+    n_dup = int(n * FRAKSI_DUPLIKAT)
+    n_unik = n - n_dup
+    n_susulan = int(n_unik * FRAKSI_SUSULAN)
+    n_latar = n_unik - n_susulan
+
+    t0, t1 = pd.Timestamp(MULAI).value, pd.Timestamp(SELESAI).value
+    asal = rng.integers(0, len(template), n_latar)
+    lat = template['latitude'].to_numpy(np.float64)[asal] + rng.normal(0, JITTER_DERAJAT, n_latar)
+    lon = template['longitude'].to_numpy(np.float64)[asal] + rng.normal(0, JITTER_DERAJAT, n_latar)
+    depth = np.maximum(template['depth'].to_numpy(np.float64)[asal] * rng.lognormal(0, 0.1, n_latar), 0.5)
+    mag = _magnitudo(rng, n_latar)
+    waktu = rng.integers(t0, t1, n_latar)
+
+    # Gempa susulan di sekitar induk latar; induk besar mendapat lebih banyak susulan
+    bobot = 10 ** (ALFA * (mag - MC))
+    induk = rng.choice(n_latar, n_susulan, p=bobot / bobot.sum())
+    panjang_km = 10 ** (0.5 * mag[induk] - 1.8)  # skala panjang runtuhan (Wells & Coppersmith, kasar)
+    jarak = np.abs(rng.normal(0, panjang_km))
+    arah = rng.uniform(0, 2 * np.pi, n_susulan)
+    dlat = jarak * np.cos(arah) / 111.2
+    dlon = jarak * np.sin(arah) / (111.2 * np.cos(np.radians(lat[induk])))
+    mag_s = np.minimum(_magnitudo(rng, n_susulan), mag[induk] - 0.1)
+    asal = np.concatenate([asal, asal[induk]])
+    lat = np.concatenate([lat, lat[induk] + dlat])
+    lon = np.concatenate([lon, lon[induk] + dlon])
+    depth = np.concatenate([depth, np.maximum(depth[induk] + rng.normal(0, 5, n_susulan), 0.5)])
+    mag = np.round(np.concatenate([mag, np.maximum(mag_s, MC)]), 1)
+    waktu = np.concatenate([waktu, np.minimum(waktu[induk] + (_omori_hari(rng, n_susulan) * 86_400e9).astype(np.int64), t1 - 1)])
+    waktu = waktu.astype('datetime64[ns]')
+    updated = waktu + (rng.uniform(1, 400, n_unik) * 86_400e9).astype('timedelta64[ns]')
+
+    jenis = template['magType'].to_numpy(object)[asal]
+    jenis[mag >= 5.5] = 'mww'
+    bukan_gempa = rng.random(n_unik) < FRAKSI_BUKAN_GEMPA
+    df = pd.DataFrame({
+        'time': _iso(waktu),
+        'latitude': np.round(lat, 4),
+        'longitude': np.round(lon, 4),
+        'depth': np.round(depth, 3),
+        'mag': mag,
+        'magType': jenis,
+        'nst': rng.integers(5, 400, n_unik),
+        'gap': np.round(rng.uniform(10, 250, n_unik), 1),
+        'dmin': np.round(rng.uniform(0.1, 10, n_unik), 3),
+        'rms': np.round(rng.uniform(0.3, 1.5, n_unik), 2),
+        'net': 'us',
+        'id': np.char.add('sx', np.char.zfill(np.arange(n_unik).astype(str), 9)),
+        'updated': _iso(updated),
+        'place': template['place'].to_numpy(object)[asal],
+        'type': np.where(bukan_gempa & (rng.random(n_unik) < 0.5), 'explosion', 'earthquake'),
+        'horizontalError': np.round(rng.uniform(2, 12, n_unik), 1),
+        'depthError': np.round(rng.uniform(1, 10, n_unik), 1),
+        'magError': np.round(rng.uniform(0.02, 0.2, n_unik), 3),
+        'magNst': rng.integers(1, 300, n_unik),
+        'status': np.where(bukan_gempa, 'automatic', 'reviewed'),
+        'locationSource': 'us',
+        'magSource': 'us',
+    })
+    # Versi lama dari sebagian kejadian: `updated` lebih awal, magnitudo sedikit berbeda
+    idx_dup = rng.choice(n_unik, n_dup, replace=False)
+    dup = df.iloc[idx_dup].copy()
+    dup['updated'] = _iso(updated[idx_dup] - np.timedelta64(1, 'D'))
+    dup['mag'] = np.round(dup['mag'] + rng.choice([-0.1, 0.1], n_dup), 1)
+    df = pd.concat([df, dup], ignore_index=True)
+    return df.iloc[rng.permutation(len(df))].reset_index(drop=True)[KOLOM_RAW]
+
+
+def tulis_katalog_raw(df, tujuan):
+    """Tulis katalog per periode tahun seperti file unduhan di repo; mengembalikan daftar path."""
+    os.makedirs(tujuan, exist_ok=True)
+    tahun = df['time'].str[:4].astype(int)
+    paths = []
+    for awal, akhir in PERIODE_FILE:
+        path = os.path.join(tujuan, f'{awal}-{akhir}.csv')
+        df[(tahun >= awal) & (tahun <= akhir)].to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tujuan', required=True)
+    args = parser.parse_args()
+
+    paths = tulis_katalog_raw(buat_katalog_raw(args.n, args.seed), args.tujuan)
+    for path in paths:
+        print(f"{path}: {os.path.getsize(path) / 1e6:,.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
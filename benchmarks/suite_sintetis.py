@@ -0,0 +1,181 @@
+"""Suite benchmark tahap-tahap dasbor pada katalog sintetis 100k/1M/10M baris.
+
+Untuk setiap ukuran, katalog mentah sintetis (lihat katalog_sintetis.py)
+ditulis ke direktori sementara, lalu setiap tahap diukur tanpa browser:
+ingesti (baca, dedupe, join provinsi, tulis), konversi dan baca katalog darat
+seperti `load_data`, filter sidebar, agregasi crosstab/resample vs kubus, dan
+pembangunan peta. Hasil ditulis sebagai laporan JSON; dengan `--banding`,
+laporan lama dipakai sebagai baseline dan rasio waktunya dicetak.
+
+    python benchmarks/suite_sintetis.py [--n 100000 1000000 10000000] [--ulang 3]
+        [--keluaran hasil_suite.json] [--banding baseline.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import folium
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_gempa import FILE_GEOJSON, baca_parquet, konversi_csv_ke_parquet, saring_tanggal  # noqa: E402
+from indeks_spasial import KOLOM_TITIK, IndeksTitik  # noqa: E402
+from ingest_gempa import ingest  # noqa: E402
+from katalog_mentah import baca_raw_bertahap, bersihkan, gabung_provinsi, siapkan_provinsi  # noqa: E402
+from katalog_sintetis import baca_template, buat_katalog_raw, tulis_katalog_raw  # noqa: E402
+from kubus_agregat import KubusGempa  # noqa: E402
+from peta_risiko import VIEWPORT_AWAL, ZOOM_AWAL, bangun_lapisan_titik, bangun_peta_risiko, hitung_centroid_provinsi  # noqa: E402
+
+UKURAN = [100_000, 1_000_000, 10_000_000]
+# Filter sidebar yang diukur: lima tahun terakhir, satu provinsi (yang paling banyak kejadiannya)
+FILTER_MULAI, FILTER_SELESAI = '2020-01-01', '2024-12-31'
+
+
+def ukur(fungsi, ulang):
+    """(hasil terakhir, daftar detik) dari `ulang` kali pemanggilan."""
+    detik = []
+    for _ in range(ulang):
+        t0 = time.perf_counter()
+        hasil = fungsi()
+        detik.append(time.perf_counter() - t0)
+    return hasil, detik
+
+
+def agregasi_pandas(df):
+    # Jalur lama halaman interaktif: crosstab provinsi x klasifikasi, resample bulanan, komposisi
+    profil = pd.crosstab(df['provinsi'], df['klasifikasi'])
+    tren = df.set_index('time').resample('ME')['mag'].agg(['count', 'max'])
+    return profil, tren, df['klasifikasi'].value_counts()
+
+
+def render_peta(m):
+    return len(m.get_root().render())
+
+
+def jalankan(n, seed, ulang, geojson, template, dir_data):
+    tahap = {}
+
+    def catat(nama, fungsi):
+        hasil, detik = ukur(fungsi, ulang)
+        tahap[nama] = {'detik': min(detik), 'semua': detik}
+        print(f"  {nama:<40} {min(detik):9.3f}s")
+        return hasil
+
+    t0 = time.perf_counter()
+    raw_files = tulis_katalog_raw(buat_katalog_raw(n, seed, template), dir_data)
+    detik_buat = time.perf_counter() - t0
+    store, csv = os.path.join(dir_data, 'store.parquet'), os.path.join(dir_data, 'darat.csv')
+    parquet = os.path.join(dir_data, 'darat.parquet')
+
+    catat('ingest: total (ingest_gempa.ingest)', lambda: ingest(
+        raw_files, store_path=store, csv_path=csv, manifest_path=os.path.join(dir_data, 'manifest.json'),
+        geojson_path=geojson, penuh=True, laut_path=os.path.join(dir_data, 'laut.parquet'),
+        dir_partisi=os.path.join(dir_data, 'partisi')))
+    raw = catat('ingest: baca mentah', lambda: pd.concat(baca_raw_bertahap(raw_files), ignore_index=True))
+    bersih = catat('ingest: bersihkan + dedupe', lambda: bersihkan(raw).sort_values('updated').drop_duplicates('id', keep='last'))
+    del raw
+    gdf_provinsi = gpd.read_file(geojson)
+    pencari = catat('join: bangun indeks provinsi', lambda: siapkan_provinsi(gdf_provinsi))
+    catat('join: gabung_provinsi', lambda: gabung_provinsi(bersih, pencari))
+    del bersih
+
+    catat('load_data: csv -> parquet', lambda: konversi_csv_ke_parquet(csv, parquet))
+    df = catat('load_data: baca parquet', lambda: baca_parquet(parquet))
+    provinsi = df['provinsi'].value_counts().index[0]
+
+    def filter_pandas():
+        hasil = saring_tanggal(df, FILTER_MULAI, FILTER_SELESAI)
+        return hasil[hasil['provinsi'] == provinsi]
+    tersaring = catat('filter: pandas', filter_pandas)
+    kubus = catat('filter: bangun kubus', lambda: KubusGempa(df))
+    hasil = catat('filter: kueri kubus', lambda: kubus.kueri(FILTER_MULAI, FILTER_SELESAI, provinsi))
+    catat('agregasi: crosstab + resample (pandas)', lambda: agregasi_pandas(tersaring))
+    catat('agregasi: kubus', lambda: (hasil.profil(), hasil.tren_bulanan(), hasil.komposisi()))
+
+    centroid = catat('peta: centroid provinsi', lambda: hitung_centroid_provinsi(gdf_provinsi))
+
+    def peta_ringkasan():
+        profil = kubus.kueri(pd.Timestamp(df['time'].min()).date(), pd.Timestamp(df['time'].max()).date()).profil()
+        profil['total'] = profil.sum(axis=1)
+        return render_peta(bangun_peta_risiko(profil, centroid))
+    catat('peta: ringkasan provinsi (bangun + HTML)', peta_ringkasan)
+    indeks = catat('peta: bangun indeks titik', lambda: IndeksTitik(df[KOLOM_TITIK]))
+
+    def peta_titik():
+        jenis, fitur = indeks.kueri(*VIEWPORT_AWAL, ZOOM_AWAL)
+        m = folium.Map(location=[-2.5, 118], zoom_start=ZOOM_AWAL, tiles='CartoDB positron')
+        bangun_lapisan_titik(jenis, fitur).add_to(m)
+        return render_peta(m)
+    catat('peta: titik viewport awal (kueri + HTML)', peta_titik)
+
+    return {'n_raw': n, 'n_darat': len(df), 'detik_buat_katalog': detik_buat,
+            'mb_raw': sum(os.path.getsize(p) for p in raw_files) / 1e6, 'tahap': tahap}
+
+
+def metadata(seed, ulang):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'waktu': datetime.now(timezone.utc).isoformat(timespec='seconds'), 'commit': commit, 'seed': seed,
+            'ulang': ulang, 'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__,
+            'platform': platform.platform(), 'cpu': os.cpu_count()}
+
+
+def banding(laporan, baseline):
+    """Cetak rasio waktu (baru / baseline) per ukuran dan tahap."""
+    lama = {h['n_raw']: h['tahap'] for h in baseline['hasil']}
+    print(f"\nDibanding baseline {baseline['meta'].get('commit')} ({baseline['meta']['waktu']}):")
+    for h in laporan['hasil']:
+        if h['n_raw'] not in lama:
+            continue
+        print(f"n={h['n_raw']:,}")
+        for nama, t in h['tahap'].items():
+            if nama in lama[h['n_raw']]:
+                t_lama = lama[h['n_raw']][nama]['detik']
+                print(f"  {nama:<40} {t_lama:9.3f}s -> {t['detik']:9.3f}s  ({t['detik'] / t_lama:5.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, nargs='+', default=UKURAN)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ulang', type=int, default=3, help="Pengulangan per tahap; yang dilaporkan waktu tercepat")
+    parser.add_argument('--geojson', default=os.path.join(ROOT, FILE_GEOJSON))
+    parser.add_argument('--keluaran', default='hasil_suite.json')
+    parser.add_argument('--banding', help="Laporan JSON baseline untuk dibandingkan")
+    parser.add_argument('--simpan-data', help="Simpan katalog sintetis di direktori ini (bawaan: direktori sementara)")
+    args = parser.parse_args()
+
+    template = baca_template()
+    laporan = {'meta': metadata(args.seed, args.ulang), 'hasil': []}
+    for n in args.n:
+        print(f"n={n:,}")
+        if args.simpan_data:
+            hasil = jalankan(n, args.seed, args.ulang, args.geojson, template, os.path.join(args.simpan_data, str(n)))
+        else:
+            with tempfile.TemporaryDirectory() as dir_data:
+                hasil = jalankan(n, args.seed, args.ulang, args.geojson, template, dir_data)
+        laporan['hasil'].append(hasil)
+        # Ditulis setelah setiap ukuran agar hasil parsial tetap ada jika ukuran besar gagal
+        with open(args.keluaran, 'w', encoding='utf-8') as f:
+            json.dump(laporan, f, indent=2)
+    print(f"Laporan ditulis ke {args.keluaran}")
+    if args.banding:
+        with open(args.banding, encoding='utf-8') as f:
+            banding(laporan, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
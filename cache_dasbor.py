@@ -0,0 +1,229 @@
+"""Lapisan cache dasbor: versi data berbasis konten dan LRU berbatas memori.
+
+Dua jenis cache dipakai bersama oleh semua sesi:
+
+- data dasar (katalog dan poligon provinsi) disimpan dengan
+  `st.cache_resource` dengan kunci versi data, yaitu hash SHA-1 konten file
+  sumbernya. Hash hanya dihitung ulang jika mtime/ukuran file berubah, jadi
+  memeriksa versi di setiap rerun cukup beberapa `os.stat`. File yang dibuat
+  ulang langsung terbaca tanpa restart server, dan objeknya tidak disalin
+  per sesi seperti `st.cache_data`;
+- hasil turunan (kubus, indeks, tabel statistik, dsb.) masuk ke satu
+  `CacheLRU` proses yang dibatasi jumlah byte (`DASBOR_CACHE_MB`, bawaan
+  MAKS_MB). Ukuran setiap entri diperkirakan saat disimpan, dan entri yang
+  paling lama tidak dipakai dibuang saat anggaran terlampaui. Kolom yang
+  hanya merujuk buffer data dasar (ditandai `tandai_bersama`) tidak ikut
+  dihitung, karena memorinya milik `st.cache_resource`, bukan LRU.
+
+Objek dari kedua cache dibagi antarsesi dan harus diperlakukan hanya-baca.
+"""
+import functools
+import hashlib
+import inspect
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+MAKS_MB = 512
+
+
+@functools.lru_cache(maxsize=32)
+def _sha1_tercache(path, mtime_ns, ukuran):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for blok in iter(lambda: f.read(1 << 20), b''):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def versi_file(path):
+    """Hash konten file (None jika tidak ada); dihitung ulang hanya jika mtime/ukuran berubah."""
+    try:
+        st_file = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return _sha1_tercache(os.path.abspath(path), st_file.st_mtime_ns, st_file.st_size)
+
+
+# Rentang alamat (awal, akhir) buffer kolom frame data dasar bersama, per id frame
+_BUFFER_BERSAMA = {}
+
+
+def _buffer_kolom(kolom, akar=False):
+    """(alamat, byte) buffer data satu kolom: ndarray (kode untuk kategori) atau buffer Arrow.
+
+    Dengan `akar`, ndarray diganti array dasar yang dirujuknya, sehingga
+    rentangnya juga mencakup view kolom lain dari blok yang sama.
+    """
+    arr = kolom.array
+    data = getattr(arr, '_codes', getattr(arr, '_ndarray', None))
+    if isinstance(data, np.ndarray):
+        if akar:
+            while isinstance(data.base, np.ndarray):
+                data = data.base
+        return [(data.__array_interface__['data'][0], data.nbytes)]
+    data = getattr(arr, '_pa_array', None)
+    if data is not None:
+        return [(b.address, b.size) for chunk in data.chunks for b in chunk.buffers() if b is not None]
+    return []
+
+
+def tandai_bersama(df):
+    """Tandai frame data dasar bersama (`st.cache_resource`); view kolomnya tidak dibebankan ke entri LRU.
+
+    Tanda hilang sendiri saat frame dibuang (mis. versi data berganti).
+    """
+    _BUFFER_BERSAMA[id(df)] = [(awal, awal + byte) for _, kolom in df.items()
+                               for awal, byte in _buffer_kolom(kolom, akar=True)]
+    weakref.finalize(df, _BUFFER_BERSAMA.pop, id(df), None)
+    return df
+
+
+def _alamat_bersama(alamat):
+    return any(awal <= alamat < akhir for rentang in _BUFFER_BERSAMA.values() for awal, akhir in rentang)
+
+
+def _ukuran_kolom(kolom):
+    buffer = _buffer_kolom(kolom) if _BUFFER_BERSAMA else []
+    if buffer and all(_alamat_bersama(alamat) for alamat, _ in buffer):
+        return 0
+    return int(kolom.memory_usage(deep=True, index=False))
+
+
+def perkiraan_ukuran(obj, _dilihat=None):
+    """Perkiraan byte yang ditahan `obj` (frame, array, koleksi, atau atribut objek).
+
+    Kolom yang buffernya milik frame dasar bersama (`tandai_bersama`) dihitung
+    nol: memori itu ditahan `st.cache_resource` sekali saja, bukan oleh
+    setiap entri yang merujuknya.
+    """
+    dilihat = set() if _dilihat is None else _dilihat
+    if id(obj) in dilihat:
+        return 0
+    dilihat.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.index.memory_usage(deep=True)) + sum(_ukuran_kolom(kolom) for _, kolom in obj.items())
+    if isinstance(obj, pd.Series):
+        return int(obj.index.memory_usage(deep=True)) + _ukuran_kolom(obj)
+    if isinstance(obj, pd.Index):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return 0 if obj.nbytes and _alamat_bersama(obj.__array_interface__['data'][0]) else obj.nbytes
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(perkiraan_ukuran(k, dilihat) + perkiraan_ukuran(v, dilihat) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(perkiraan_ukuran(v, dilihat) for v in obj)
+    if hasattr(obj, '__dict__'):
+        return sys.getsizeof(obj) + sum(perkiraan_ukuran(v, dilihat) for v in vars(obj).values())
+    # Objek ekstensi (mis. cKDTree): hanya atribut array yang umum
+    return sys.getsizeof(obj) + sum(perkiraan_ukuran(getattr(obj, a), dilihat) for a in ('data', 'indices') if hasattr(obj, a))
+
+
+class CacheLRU:
+    """Cache LRU aman-thread dengan anggaran byte."""
+
+    def __init__(self, maks_byte):
+        self.maks_byte = maks_byte
+        self._entri = OrderedDict()  # kunci -> (nilai, byte)
+        self._kunci_hitung = {}  # kunci -> [lock, jumlah thread yang memegang/menunggu]
+        self._lock = threading.Lock()
+        self.byte = 0
+        self.hit = self.miss = self.dibuang = 0
+
+    def __len__(self):
+        return len(self._entri)
+
+    def _cari(self, kunci):
+        with self._lock:
+            if kunci in self._entri:
+                self._entri.move_to_end(kunci)
+                self.hit += 1
+                return True, self._entri[kunci][0]
+        return False, None
+
+    def ambil(self, kunci, buat):
+        """Nilai untuk `kunci`; jika belum ada, `buat()` dipanggil sekali walau diminta banyak sesi.
+
+        Lock per kunci hidup selama masih ada thread yang memegang atau
+        menunggunya (dihitung), jadi thread yang datang belakangan memakai
+        lock yang sama dan mendapati nilainya di cache setelah lock dilepas.
+        """
+        ada, nilai = self._cari(kunci)
+        if ada:
+            return nilai
+        with self._lock:
+            entri = self._kunci_hitung.setdefault(kunci, [threading.Lock(), 0])
+            entri[1] += 1
+        try:
+            with entri[0]:
+                ada, nilai = self._cari(kunci)
+                if ada:
+                    return nilai
+                with self._lock:
+                    self.miss += 1
+                nilai = buat()
+                self.simpan(kunci, nilai)
+                return nilai
+        finally:
+            with self._lock:
+                entri[1] -= 1
+                if not entri[1]:
+                    del self._kunci_hitung[kunci]
+
+    def simpan(self, kunci, nilai):
+        byte = perkiraan_ukuran(nilai)
+        with self._lock:
+            if byte > self.maks_byte:
+                return
+            if kunci in self._entri:
+                self.byte -= self._entri.pop(kunci)[1]
+            self._entri[kunci] = (nilai, byte)
+            self.byte += byte
+            while self.byte > self.maks_byte:
+                _, (_, byte_lama) = self._entri.popitem(last=False)
+                self.byte -= byte_lama
+                self.dibuang += 1
+
+    def kosongkan(self):
+        with self._lock:
+            self._entri.clear()
+            self.byte = 0
+
+    def statistik(self):
+        with self._lock:
+            return {'entri': len(self._entri), 'byte': self.byte, 'maks_byte': self.maks_byte,
+                    'hit': self.hit, 'miss': self.miss, 'dibuang': self.dibuang}
+
+
+@st.cache_resource
+def cache_lru():
+    """LRU hasil turunan bersama untuk proses ini (ikut terhapus oleh "Clear cache" Streamlit)."""
+    return CacheLRU(int(float(os.environ.get('DASBOR_CACHE_MB', MAKS_MB)) * 2**20))
+
+
+def diturunkan(versi):
+    """Dekorator pembuat: hasil fungsi di-cache di `cache_lru()` dengan kunci (fungsi, `versi()`, argumen).
+
+    Argumen dinormalisasi lewat signature fungsi, jadi `f()` dan `f(bawaan)`
+    berbagi satu entri.
+    """
+    def dekorator(fungsi):
+        signature = inspect.signature(fungsi)
+        nama = f"{fungsi.__module__}.{fungsi.__qualname__}"
+
+        @functools.wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            terikat = signature.bind(*args, **kwargs)
+            terikat.apply_defaults()
+            kunci = (nama, versi(), tuple(terikat.arguments.items()))
+            return cache_lru().ambil(kunci, lambda: fungsi(*args, **kwargs))
+        return pembungkus
+    return dekorator
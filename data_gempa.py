@@ -0,0 +1,163 @@
+"""Lapisan data bersama untuk semua halaman dasbor SiagaGempa.
+
+Katalog gempa darat (`data_gempa_darat.csv`) dikonversi sekali menjadi file
+Parquet bertipe: `time` disimpan sebagai timestamp int64 UTC, `provinsi` dan
+`magType` sebagai kategori, klasifikasi BMKG sudah dihitung, dan kolom numerik
+sebagai float32. Halaman-halaman cukup memanggil `load_data()`.
+
+Katalog dan poligon provinsi di-cache per versi data (hash konten CSV dan
+GeoJSON, lihat cache_dasbor.py) dan dibagi antarsesi tanpa disalin; hasil
+turunan memakai dekorator `cache_turunan`.
+
+Jalankan `python data_gempa.py` untuk membangun ulang file Parquet secara manual.
+"""
+import os
+
+import geopandas as gpd
+import pandas as pd
+import pyarrow.parquet as pq
+import streamlit as st
+
+from cache_dasbor import diturunkan, tandai_bersama, versi_file
+from provinsi_lookup import PencariProvinsi
+from skala_magnitudo import klasifikasi
+
+FILE_CSV = 'data_gempa_darat.csv'
+FILE_PARQUET = 'data_gempa_darat.parquet'
+# Gempa lepas pantai dari ingest_gempa.py; hanya dipakai sebagai masukan deklasterisasi
+FILE_PARQUET_LAUT = 'data_gempa_laut.parquet'
+FILE_GEOJSON = 'Batas Provinsi 50m.geojson'
+# Katalog terpartisi per wilayah/tahun (partisi_katalog.py); `_versi.json` ditulis terakhir saat build
+DIR_PARTISI = 'katalog_partisi'
+FILE_VERSI_PARTISI = '_versi.json'
+
+KOLOM_NUMERIK = ['latitude', 'longitude', 'depth', 'mag']
+KOLOM_KATEGORI = ['magType', 'provinsi']
+
+
+def nama_kolom_provinsi(gdf_provinsi):
+    prov_col_name = next((col for col in ['PROVINSI', 'NAMOBJ'] if col in gdf_provinsi.columns), None)
+    if not prov_col_name:
+        raise ValueError("Kolom nama provinsi (PROVINSI/NAMOBJ) tidak ditemukan di file GeoJSON.")
+    return prov_col_name
+
+
+def batas_tanggal(mulai=None, selesai=None):
+    """Batas UTC [t0, t1) untuk rentang tanggal inklusif; None untuk sisi yang terbuka.
+
+    Tanggal tanpa jam mencakup seluruh hari `selesai`; timestamp berjam
+    dipakai apa adanya. Waktu naif dianggap UTC. Semua filter rentang tanggal
+    (sidebar, kubus, kueri bahaya, partisi) memakai batas ini.
+    """
+    t0 = t1 = None
+    if mulai is not None:
+        t0 = pd.Timestamp(mulai)
+        t0 = t0.tz_localize('UTC') if t0.tzinfo is None else t0.tz_convert('UTC')
+    if selesai is not None:
+        ts = pd.Timestamp(selesai)
+        ts = ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+        t1 = ts + pd.Timedelta(days=1) if ts == ts.normalize() else ts + pd.Timedelta(1, 'ns')
+    return t0, t1
+
+
+def saring_tanggal(df, mulai=None, selesai=None):
+    """Kejadian dengan waktu di rentang `batas_tanggal(mulai, selesai)`, seperti filter sidebar."""
+    t0, t1 = batas_tanggal(mulai, selesai)
+    if t0 is not None:
+        df = df[df['time'] >= t0]
+    if t1 is not None:
+        df = df[df['time'] < t1]
+    return df
+
+
+def siapkan_tipe(df):
+    """Ubah frame katalog mentah menjadi skema kolumnar yang ringkas."""
+    df = df.copy()
+    df['time'] = pd.to_datetime(df['time'], format='ISO8601', utc=True).astype('datetime64[ns, UTC]')
+    if 'updated' in df.columns:
+        df['updated'] = pd.to_datetime(df['updated'], format='ISO8601', utc=True).astype('datetime64[ns, UTC]')
+    df['klasifikasi'] = klasifikasi(df['mag'].to_numpy())
+    for col in KOLOM_NUMERIK:
+        df[col] = df[col].astype('float32')
+    for col in KOLOM_KATEGORI:
+        df[col] = df[col].astype('category')
+    return df
+
+
+def gabung_katalog(frames):
+    """Gabungkan beberapa frame bertipe tanpa kehilangan dtype kategori."""
+    df = pd.concat(frames, ignore_index=True)
+    for col in KOLOM_KATEGORI:
+        df[col] = df[col].astype('category')
+    return df
+
+
+def simpan_parquet(df, path=FILE_PARQUET):
+    df.to_parquet(path, index=False, engine='pyarrow')
+
+
+def konversi_csv_ke_parquet(csv_path=FILE_CSV, parquet_path=FILE_PARQUET):
+    df = siapkan_tipe(pd.read_csv(csv_path))
+    simpan_parquet(df, parquet_path)
+    return df
+
+
+def pastikan_parquet(csv_path=FILE_CSV, parquet_path=FILE_PARQUET):
+    """Bangun file Parquet jika belum ada atau lebih lama dari CSV sumbernya."""
+    if not os.path.exists(parquet_path) or (
+        os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(parquet_path)
+    ):
+        konversi_csv_ke_parquet(csv_path, parquet_path)
+
+
+def baca_parquet(path=FILE_PARQUET):
+    # memory_map=True: halaman file dipetakan langsung oleh OS, tanpa salinan buffer tambahan
+    return pq.read_table(path, memory_map=True).to_pandas()
+
+
+def baca_gempa_laut(path=FILE_PARQUET_LAUT):
+    """Gempa lepas pantai hasil ingesti, atau None jika belum pernah di-ingest."""
+    return baca_parquet(path) if os.path.exists(path) else None
+
+
+def versi_data():
+    """Versi data dasbor: hash konten CSV katalog, GeoJSON provinsi, daftar katalog terpartisi, dan store lepas pantai."""
+    return (versi_file(FILE_CSV), versi_file(FILE_GEOJSON), versi_file(os.path.join(DIR_PARTISI, FILE_VERSI_PARTISI)),
+            versi_file(FILE_PARQUET_LAUT))
+
+
+# Hasil turunan data dasbor: LRU bersama dengan kunci versi data
+cache_turunan = diturunkan(versi_data)
+
+
+@st.cache_resource(max_entries=1)
+def _load_data(versi):
+    pastikan_parquet()
+    return tandai_bersama(baca_parquet()), _load_gdf_provinsi(versi[1])
+
+
+@st.cache_resource(max_entries=1)
+def _load_gdf_provinsi(versi_geojson):
+    return tandai_bersama(gpd.read_file(FILE_GEOJSON))
+
+
+def load_data():
+    """(katalog, poligon provinsi) untuk versi data saat ini; objek bersama, hanya-baca."""
+    return _load_data(versi_data())
+
+
+def load_gdf_provinsi():
+    """Poligon provinsi bersama (hanya-baca) untuk struktur turunan seperti centroid."""
+    return _load_gdf_provinsi(versi_file(FILE_GEOJSON))
+
+
+@cache_turunan
+def load_pencari_provinsi():
+    """Indeks provinsi bersama untuk menentukan provinsi titik ad-hoc di dasbor."""
+    gdf_provinsi = load_gdf_provinsi()
+    return PencariProvinsi(gdf_provinsi, kolom_nama=nama_kolom_provinsi(gdf_provinsi))
+
+
+if __name__ == '__main__':
+    df = konversi_csv_ke_parquet()
+    print(f"{len(df)} baris dikonversi dari {FILE_CSV} ke {FILE_PARQUET}")
@@ -0,0 +1,203 @@
+"""Deklasterisasi katalog (pemisahan gempa utama dan susulan) dengan jendela ruang-waktu.
+
+Metode jendela Gardner-Knopoff (atau Uhrhammer): kejadian diproses dari
+magnitudo terbesar. Setiap kejadian yang belum masuk klaster menjadi gempa
+utama, dan semua kejadian yang lebih kecil di dalam jendela jarak L(M) dan
+jendela waktu T(M) di sekitarnya (susulan sesudahnya, pendahuluan
+sebelumnya) masuk ke klasternya.
+
+Kandidat tidak dicari dengan membandingkan semua pasangan. Kejadian
+dikelompokkan ke grid sel UKURAN_SEL derajat dan diurutkan berdasarkan
+(sel, waktu), sehingga untuk setiap gempa utama hanya sel yang bersinggungan
+dengan lingkaran L(M) yang dibuka, dan di setiap sel rentang waktunya dicari
+dengan `searchsorted` atas kunci gabungan sel x waktu.
+
+Katalog dasbor hanya berisi gempa darat, padahal di Indonesia banyak deret
+susulan di darat dipicu gempa utama di laut. Karena itu deklasterisasi
+dijalankan atas gempa darat ditambah gempa lepas pantai di sekitarnya
+(partisi `<wilayah>-laut`, atau store lepas pantai hasil ingesti), lalu label
+digabungkan kembali ke gempa darat lewat `id`.
+"""
+import numpy as np
+import pandas as pd
+
+from data_gempa import baca_gempa_laut, cache_turunan
+from partisi_katalog import AKHIRAN_LAUT, baca_partisi, daftar_wilayah, load_rentang, saring
+
+R_BUMI_KM = 6371.0088
+KM_PER_DERAJAT = np.pi * R_BUMI_KM / 180
+UKURAN_SEL = 0.5  # derajat
+BLOK = 50_000  # kejadian per blok saat membangun pasangan kandidat
+KOLOM_MASUKAN = ['id', 'time', 'latitude', 'longitude', 'mag']
+
+
+def jendela_gardner_knopoff(mag):
+    """(jarak km, waktu hari) menurut Gardner & Knopoff (1974)."""
+    mag = np.asarray(mag, dtype=np.float64)
+    jarak = 10 ** (0.1238 * mag + 0.983)
+    waktu = np.where(mag >= 6.5, 10 ** (0.032 * mag + 2.7389), 10 ** (0.5409 * mag - 0.547))
+    return jarak, waktu
+
+
+def jendela_uhrhammer(mag):
+    """(jarak km, waktu hari) menurut Uhrhammer (1986)."""
+    mag = np.asarray(mag, dtype=np.float64)
+    return np.exp(-1.024 + 0.804 * mag), np.exp(-2.87 + 1.235 * mag)
+
+
+JENDELA = {
+    'gardner_knopoff': jendela_gardner_knopoff,
+    'uhrhammer': jendela_uhrhammer,
+}
+
+
+def _haversine_km(lat0, lon0, lat, lon):
+    lat0, lon0, lat, lon = map(np.radians, (lat0, lon0, lat, lon))
+    a = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat0) * np.cos(lat) * np.sin((lon - lon0) / 2) ** 2
+    return 2 * R_BUMI_KM * np.arcsin(np.sqrt(a))
+
+
+def _pasangan(hari, lat, lon, mag, jarak_maks, waktu_maks, ukuran_sel, blok=BLOK):
+    """Pasangan kandidat (CSR): `tetangga[ptr[i]:ptr[i+1]]` adalah kejadian lain
+    dengan magnitudo <= mag[i] di dalam jendela jarak dan waktu kejadian i."""
+    n = len(mag)
+    lat0, lon0 = lat.min(), lon.min()
+    iy = ((lat - lat0) // ukuran_sel).astype(np.int64)
+    ix = ((lon - lon0) // ukuran_sel).astype(np.int64)
+    ny, nx = int(iy.max()) + 1, int(ix.max()) + 1
+    # Kunci gabungan sel * rentang + waktu; waktu digeser agar t - T(M) tidak negatif
+    t_rel = hari - hari.min() + waktu_maks.max()
+    rentang = t_rel.max() + waktu_maks.max() + 1
+    kunci = (iy * nx + ix) * rentang + t_rel
+    urutan = np.argsort(kunci, kind='stable')
+    kunci = kunci[urutan]
+
+    # Kotak sel yang bersinggungan dengan lingkaran L(M) setiap kejadian
+    dlat = jarak_maks / KM_PER_DERAJAT
+    dlon = dlat / np.maximum(np.cos(np.radians(np.minimum(np.abs(lat) + dlat, 89.0))), 1e-6)
+    y0 = np.clip((lat - dlat - lat0) // ukuran_sel, 0, ny - 1).astype(np.int64)
+    y1 = np.clip((lat + dlat - lat0) // ukuran_sel, 0, ny - 1).astype(np.int64)
+    x0 = np.clip((lon - dlon - lon0) // ukuran_sel, 0, nx - 1).astype(np.int64)
+    x1 = np.clip((lon + dlon - lon0) // ukuran_sel, 0, nx - 1).astype(np.int64)
+    lebar = x1 - x0 + 1
+
+    jumlah = np.zeros(n, dtype=np.int64)
+    semua = []
+    # Diproses per blok kejadian agar memori pasangan sementara tetap terbatas
+    for mulai in range(0, n, blok):
+        ev = np.arange(mulai, min(mulai + blok, n))
+        n_sel = (y1[ev] - y0[ev] + 1) * lebar[ev]
+        ev = np.repeat(ev, n_sel)
+        k = np.arange(len(ev)) - np.repeat(np.cumsum(n_sel) - n_sel, n_sel)
+        sel = (y0[ev] + k // lebar[ev]) * nx + x0[ev] + k % lebar[ev]
+        awal = np.searchsorted(kunci, sel * rentang + (t_rel[ev] - waktu_maks[ev]), side='left')
+        akhir = np.searchsorted(kunci, sel * rentang + (t_rel[ev] + waktu_maks[ev]), side='right')
+        panjang = akhir - awal
+        sumber = np.repeat(ev, panjang)
+        tujuan = urutan[np.repeat(akhir - np.cumsum(panjang), panjang) + np.arange(panjang.sum())]
+        cocok = (tujuan != sumber) & (mag[tujuan] <= mag[sumber])
+        sumber, tujuan = sumber[cocok], tujuan[cocok]
+        cocok = _haversine_km(lat[sumber], lon[sumber], lat[tujuan], lon[tujuan]) <= jarak_maks[sumber]
+        jumlah += np.bincount(sumber[cocok], minlength=n)
+        semua.append(tujuan[cocok])
+    ptr = np.concatenate([[0], np.cumsum(jumlah)])
+    return ptr, np.concatenate(semua)
+
+
+def deklasterisasi(waktu, lat, lon, mag, metode='gardner_knopoff', ukuran_sel=UKURAN_SEL):
+    """Label klaster untuk setiap kejadian.
+
+    Mengembalikan (id_klaster, utama): `id_klaster` bernilai -1 untuk kejadian
+    tunggal dan 0, 1, 2, ... untuk anggota klaster (urut dari gempa utama
+    terbesar); `utama` True untuk kejadian tunggal dan gempa utama klaster.
+    """
+    hari = (pd.to_datetime(pd.Series(waktu)).dt.tz_localize(None).to_numpy('datetime64[ns]').view(np.int64)
+            / 86_400e9)
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    mag = np.asarray(mag, dtype=np.float64)
+    n = len(mag)
+    id_klaster = np.full(n, -1, dtype=np.int64)
+    utama = np.ones(n, dtype=bool)
+    if not n:
+        return id_klaster, utama
+    jarak_maks, waktu_maks = JENDELA[metode](mag)
+    ptr, tetangga = _pasangan(hari, lat, lon, mag, jarak_maks, waktu_maks, ukuran_sel)
+
+    # Magnitudo terbesar lebih dulu; jika sama, yang lebih awal. Kejadian tanpa
+    # kandidat dilewati: ia hanya bisa diklaim kejadian yang lebih besar, atau
+    # yang sama besar (jendelanya simetris, jadi ia juga akan punya kandidat).
+    terpakai = np.zeros(n, dtype=bool)
+    id_berikut = 0
+    urutan = np.lexsort((hari, -mag))
+    for i in urutan[np.diff(ptr)[urutan] > 0]:
+        if terpakai[i]:
+            continue
+        terpakai[i] = True
+        kandidat = tetangga[ptr[i]:ptr[i + 1]]
+        kandidat = kandidat[~terpakai[kandidat]]
+        if len(kandidat):
+            terpakai[kandidat] = True
+            id_klaster[i] = id_klaster[kandidat] = id_berikut
+            utama[kandidat] = False
+            id_berikut += 1
+    return id_klaster, utama
+
+
+def label_klaster(df, metode='gardner_knopoff'):
+    """DataFrame (index sama dengan `df`) berisi kolom id_klaster dan utama."""
+    id_klaster, utama = deklasterisasi(df['time'], df['latitude'], df['longitude'], df['mag'], metode)
+    return pd.DataFrame({'id_klaster': id_klaster, 'utama': utama}, index=df.index)
+
+
+def label_dengan_laut(darat, laut, metode='gardner_knopoff'):
+    """Label klaster `darat` setelah dideklasterisasi bersama gempa lepas pantai `laut`.
+
+    Kejadian `laut` yang id-nya sudah ada di `darat` tidak dihitung dua kali.
+    Gempa laut ikut menjadi gempa utama, jadi susulannya di darat berlabel
+    susulan.
+    """
+    # Katalog darat lama tanpa kolom `id` (dibangun dari CSV notebook) hanya bisa dideklasterisasi sendiri
+    if laut is None or not len(laut) or 'id' not in darat.columns:
+        return label_klaster(darat, metode)
+    laut = laut[~laut['id'].isin(darat['id'])]
+    gabungan = pd.concat([darat[KOLOM_MASUKAN], laut[KOLOM_MASUKAN]], ignore_index=True)
+    label = label_klaster(gabungan, metode).set_axis(gabungan['id'])
+    return label.loc[darat['id']].set_axis(darat.index)
+
+
+def gempa_laut(wilayah=None):
+    """Gempa lepas pantai di sekitar `wilayah` yang belum termasuk katalognya (None jika tidak ada).
+
+    Diambil dari partisi `<nama>-laut` jika katalog terpartisi dibangun dengan
+    `--lepas-pantai`; selain itu dari store lepas pantai hasil ingesti.
+    """
+    if wilayah is not None:
+        tersedia = set(daftar_wilayah())
+        if any(nama.endswith(AKHIRAN_LAUT) for nama in tersedia):
+            tambahan = tuple(sorted(tersedia & {nama + AKHIRAN_LAUT for nama in wilayah} - set(wilayah)))
+            return baca_partisi(wilayah=tambahan, kolom=KOLOM_MASUKAN) if tambahan else None
+    return baca_gempa_laut()
+
+
+@cache_turunan
+def load_label_klaster(metode='gardner_knopoff', wilayah=None):
+    # Klaster bisa melintasi batas tahun dan provinsi, jadi selalu dihitung atas seluruh katalog wilayah
+    return label_dengan_laut(load_rentang(wilayah=wilayah), gempa_laut(wilayah), metode)
+
+
+@cache_turunan
+def _katalog_utama(metode, wilayah=None):
+    df = load_rentang(wilayah=wilayah)
+    return df[load_label_klaster(metode, wilayah)['utama'].to_numpy()]
+
+
+def load_katalog(hanya_utama=False, metode='gardner_knopoff', wilayah=None, mulai=None, selesai=None, provinsi=None):
+    """Katalog dasbor untuk filter sidebar; dengan `hanya_utama`, gempa susulan dan pendahuluan dibuang.
+
+    Tanpa `hanya_utama`, katalog terpartisi hanya dibaca dari partisi yang
+    tersentuh filter (lihat `partisi_katalog.load_rentang`).
+    """
+    if not hanya_utama:
+        return load_rentang(mulai, selesai, provinsi, wilayah)
+    return saring(_katalog_utama(metode, wilayah), mulai, selesai, provinsi)
@@ -0,0 +1,124 @@
+"""Batas provinsi yang disederhanakan dan dikuantisasi untuk peta choropleth.
+
+GeoJSON batas provinsi asli terlalu rinci untuk peta skala nasional. Modul ini
+menyiapkan beberapa tingkat penyederhanaan:
+
+- geometri disederhanakan sebagai satu *coverage* (`shapely.coverage_simplify`),
+  jadi batas yang dipakai bersama dua provinsi disederhanakan dengan cara yang
+  sama dan tidak muncul celah atau tumpang tindih baru;
+- koordinat dibulatkan ke sejumlah desimal (GeoJSON terkuantisasi) dan hanya
+  kolom nama provinsi yang disimpan;
+- hasilnya di-cache di disk per (hash file sumber, tingkat), sehingga hanya
+  dihitung sekali per versi GeoJSON.
+
+Peta choropleth dibangun dari satu lapisan `folium.GeoJson` yang membawa
+warna isian sekaligus properti tooltip, sehingga poligon hanya diserialisasi
+sekali.
+"""
+import json
+import os
+
+import folium
+import geopandas as gpd
+import numpy as np
+import shapely
+from branca.colormap import StepColormap
+from branca.utilities import color_brewer
+
+from cache_dasbor import versi_file
+from data_gempa import FILE_GEOJSON, nama_kolom_provinsi
+
+DIR_CACHE = 'cache_geometri'
+# tingkat -> (toleransi penyederhanaan dalam derajat, jumlah desimal koordinat)
+TINGKAT = {
+    'kasar': (0.05, 2),
+    'sedang': (0.01, 3),
+    'halus': (0.002, 4),
+}
+
+
+def _kuantisasi(koordinat, desimal):
+    if isinstance(koordinat[0], (list, tuple)):
+        return [_kuantisasi(k, desimal) for k in koordinat]
+    return [round(float(v), desimal) for v in koordinat]
+
+
+def sederhanakan(gdf_provinsi, toleransi, desimal):
+    """FeatureCollection (dict) hasil penyederhanaan coverage dengan koordinat terkuantisasi.
+
+    Setiap fitur hanya membawa properti `provinsi`.
+    """
+    gdf_provinsi = gdf_provinsi.to_crs("EPSG:4326")
+    kolom = nama_kolom_provinsi(gdf_provinsi)
+    geoms = shapely.make_valid(gdf_provinsi.geometry.values)
+    if hasattr(shapely, 'coverage_simplify'):
+        geoms = shapely.coverage_simplify(geoms, toleransi)
+    else:
+        # shapely < 2.1: per poligon, batas bersama bisa sedikit bergeser
+        geoms = shapely.simplify(geoms, toleransi, preserve_topology=True)
+    fitur = []
+    for nama, geom in zip(gdf_provinsi[kolom], geoms):
+        if geom is None or geom.is_empty:
+            continue
+        geo = shapely.geometry.mapping(geom)
+        fitur.append({'type': 'Feature', 'properties': {'provinsi': nama},
+                      'geometry': {'type': geo['type'], 'coordinates': _kuantisasi(geo['coordinates'], desimal)}})
+    return {'type': 'FeatureCollection', 'features': fitur}
+
+
+def pastikan_geojson_ringkas(tingkat='sedang', sumber=FILE_GEOJSON, dir_cache=DIR_CACHE):
+    """Path file GeoJSON ringkas untuk `tingkat`; dibangun jika belum ada untuk versi sumber ini."""
+    toleransi, desimal = TINGKAT[tingkat]
+    path = os.path.join(dir_cache, f"{versi_file(sumber)[:16]}-{tingkat}.geojson")
+    if not os.path.exists(path):
+        os.makedirs(dir_cache, exist_ok=True)
+        koleksi = sederhanakan(gpd.read_file(sumber), toleransi, desimal)
+        sementara = path + '.tmp'
+        with open(sementara, 'w', encoding='utf-8') as f:
+            json.dump(koleksi, f, separators=(',', ':'), ensure_ascii=False)
+        os.replace(sementara, path)
+    return path
+
+
+def baca_geojson_ringkas(tingkat='sedang', sumber=FILE_GEOJSON, dir_cache=DIR_CACHE):
+    with open(pastikan_geojson_ringkas(tingkat, sumber, dir_cache), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def skala_warna(nilai, fill_color='YlOrRd', bins=6, caption=''):
+    """Skala warna bertingkat seperti `folium.Choropleth` (histogram `bins` kelas)."""
+    nilai = np.asarray(nilai, dtype=float)
+    tepi = np.histogram(nilai, bins=bins)[1]
+    return StepColormap(color_brewer(fill_color, n=bins), index=tepi, vmin=tepi[0], vmax=tepi[-1], caption=caption)
+
+
+def peta_choropleth_ringkas(koleksi, properti, kolom_nilai, tooltip_fields, tooltip_aliases,
+                            fill_color='YlOrRd', legend_name=''):
+    """Peta folium dengan satu lapisan GeoJson untuk isian warna dan tooltip.
+
+    `properti` memetakan nama provinsi ke dict properti fitur (harus memuat
+    `kolom_nilai` dan semua `tooltip_fields`). Warna isian dihitung di sini
+    dan ikut disimpan sebagai properti `warna`.
+    """
+    colormap = skala_warna([p[kolom_nilai] for p in properti.values()], fill_color=fill_color, caption=legend_name)
+    fitur = []
+    for f in koleksi['features']:
+        nama = f['properties']['provinsi']
+        if nama not in properti:
+            continue
+        p = dict(properti[nama], warna=colormap(properti[nama][kolom_nilai]))
+        fitur.append({'type': 'Feature', 'properties': p, 'geometry': f['geometry']})
+
+    m = folium.Map(location=[-2.5, 118], zoom_start=5, tiles='CartoDB positron')
+    folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': fitur}, name='choropleth',
+        style_function=lambda x: {'fillColor': x['properties']['warna'], 'color': 'black',
+                                  'weight': 1, 'fillOpacity': 0.7, 'opacity': 0.2},
+        tooltip=folium.features.GeoJsonTooltip(
+            fields=tooltip_fields, aliases=tooltip_aliases,
+            style=("background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px;"),
+            localize=True),
+    ).add_to(m)
+    colormap.add_to(m)
+    folium.LayerControl().add_to(m)
+    return m
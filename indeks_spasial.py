@@ -0,0 +1,113 @@
+"""Indeks spasial multi-resolusi untuk menampilkan titik kejadian di peta.
+
+Setiap kejadian diberi kode quadtree (kurva Morton) pada grid Web Mercator
+2^MAKS_LEVEL x 2^MAKS_LEVEL, lalu semua array diurutkan berdasarkan kode itu.
+Karena urutannya Morton, setiap sel quadtree di level mana pun adalah satu
+rentang yang bersambung di array terurut. Jumlah kejadian dan centroid sebuah
+sel cukup dihitung dengan dua `searchsorted` dan prefix sum. Tidak perlu
+menyimpan agregat untuk setiap level.
+
+Untuk viewport dan zoom tertentu, `kueri()` mengembalikan klaster (sel
+berukuran sekitar 64 px) pada zoom rendah atau kejadian mentah jika jumlahnya
+sudah kecil. Dengan begitu jumlah fitur yang dikirim ke browser tetap
+dibatasi, berapa pun ukuran katalognya.
+"""
+import numpy as np
+import pandas as pd
+
+from data_gempa import cache_turunan
+from deklasterisasi import load_katalog
+
+MAKS_LEVEL = 24
+# Sel level (zoom + 2) berukuran 256 / 4 = 64 px di layar
+OFFSET_LEVEL = 2
+BATAS_FITUR = 2000
+MAKS_LAT = 85.05112878
+KOLOM_TITIK = ['time', 'latitude', 'longitude', 'depth', 'mag', 'place', 'klasifikasi']
+
+
+def proyeksi(lon, lat):
+    """Koordinat Web Mercator ternormalisasi di [0, 1); y = 0 di utara."""
+    lat = np.clip(np.asarray(lat, dtype=np.float64), -MAKS_LAT, MAKS_LAT)
+    x = (np.asarray(lon, dtype=np.float64) + 180.0) / 360.0
+    sin_lat = np.sin(np.radians(lat))
+    y = 0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * np.pi)
+    return x, y
+
+
+def _sebar_bit(v):
+    v = v.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    for geser, topeng in [(16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                          (2, 0x3333333333333333), (1, 0x5555555555555555)]:
+        v = (v | (v << np.uint64(geser))) & np.uint64(topeng)
+    return v
+
+
+def kode_morton(ix, iy):
+    return _sebar_bit(ix) | (_sebar_bit(iy) << np.uint64(1))
+
+
+class IndeksTitik:
+    """Indeks quadtree atas frame kejadian (kolom latitude, longitude, mag, dan kolom atribut lain)."""
+
+    def __init__(self, df, maks_level=MAKS_LEVEL):
+        self.maks_level = maks_level
+        n = 1 << maks_level
+        x, y = proyeksi(df['longitude'].to_numpy(), df['latitude'].to_numpy())
+        ix = np.clip((x * n).astype(np.int64), 0, n - 1)
+        iy = np.clip((y * n).astype(np.int64), 0, n - 1)
+        kode = kode_morton(ix, iy)
+        urutan = np.argsort(kode, kind='stable')
+        self.kode = kode[urutan]
+        self.df = df.iloc[urutan].reset_index(drop=True)
+        self.lat = self.df['latitude'].to_numpy(np.float64)
+        self.lon = self.df['longitude'].to_numpy(np.float64)
+        # Prefix sum untuk centroid dan rata-rata magnitudo sel di level mana pun
+        self.kum = {kolom: np.concatenate([[0.0], np.cumsum(self.df[kolom].to_numpy(np.float64))])
+                    for kolom in ['latitude', 'longitude', 'mag']}
+
+    def __len__(self):
+        return len(self.kode)
+
+    def _sel_viewport(self, barat, selatan, timur, utara, level):
+        n = 1 << level
+        x0, y0 = proyeksi(barat, utara)
+        x1, y1 = proyeksi(timur, selatan)
+        ix = np.arange(np.clip(int(x0 * n), 0, n - 1), np.clip(int(x1 * n), 0, n - 1) + 1)
+        iy = np.arange(np.clip(int(y0 * n), 0, n - 1), np.clip(int(y1 * n), 0, n - 1) + 1)
+        return ix, iy
+
+    def kueri(self, barat, selatan, timur, utara, zoom, batas=BATAS_FITUR):
+        """Kembalikan (jenis, frame) untuk viewport; jenis 'titik' atau 'klaster'."""
+        level = int(np.clip(int(zoom) + OFFSET_LEVEL, 0, self.maks_level))
+        ix, iy = self._sel_viewport(barat, selatan, timur, utara, level)
+        # Viewport yang sangat besar (mis. zoom tidak sesuai bounds) dinaikkan ke level yang lebih kasar
+        while len(ix) * len(iy) > batas and level > 0:
+            level -= 1
+            ix, iy = self._sel_viewport(barat, selatan, timur, utara, level)
+
+        gx, gy = np.meshgrid(ix, iy, indexing='ij')
+        geser = np.uint64(2 * (self.maks_level - level))
+        kode_sel = kode_morton(gx.ravel(), gy.ravel())
+        awal = np.searchsorted(self.kode, kode_sel << geser, side='left')
+        akhir = np.searchsorted(self.kode, (kode_sel + np.uint64(1)) << geser, side='left')
+        isi = akhir > awal
+        awal, akhir = awal[isi], akhir[isi]
+
+        if (akhir - awal).sum() <= batas:
+            idx = np.concatenate([np.arange(a, z) for a, z in zip(awal, akhir)]) if len(awal) else np.array([], dtype=np.int64)
+            lat, lon = self.lat[idx], self.lon[idx]
+            di_dalam = (lat >= selatan) & (lat <= utara) & (lon >= barat) & (lon <= timur)
+            return 'titik', self.df.iloc[idx[di_dalam]]
+
+        jumlah = akhir - awal
+        rata = {kolom: (kum[akhir] - kum[awal]) / jumlah for kolom, kum in self.kum.items()}
+        return 'klaster', pd.DataFrame({'latitude': rata['latitude'], 'longitude': rata['longitude'],
+                                        'jumlah': jumlah, 'mag_rata': rata['mag']})
+
+
+@cache_turunan
+def load_indeks_titik(mulai, selesai, provinsi=None, hanya_utama=False, wilayah=None):
+    """Indeks titik untuk satu kombinasi filter sidebar (rentang tanggal inklusif, provinsi opsional)."""
+    df = load_katalog(hanya_utama, wilayah=wilayah, mulai=mulai, selesai=selesai, provinsi=provinsi)
+    return IndeksTitik(df[KOLOM_TITIK])
@@ -0,0 +1,193 @@
+"""Ingesti inkremental katalog USGS mentah menjadi katalog gempa darat.
+
+Menggantikan sel preprocessing pertama di `EDA_Gempa.ipynb`. Sebuah manifest
+mencatat file mentah mana yang sudah diproses (ukuran, mtime, sha1) dan versi
+`updated` terakhir dari setiap `id` kejadian. Pada setiap run hanya file yang
+berubah yang dibaca, per potongan (chunk) berukuran tetap, dan hanya baris
+dengan `id` baru atau `updated` yang lebih baru yang difilter dan di-join
+secara spasial ke poligon provinsi (lihat `provinsi_lookup.py`) sebelum potongan berikutnya dibaca. Hasilnya
+digabungkan ke store gempa darat; gempa yang tidak jatuh di provinsi mana pun
+disimpan di store lepas pantai (`FILE_PARQUET_LAUT`) sebagai masukan
+deklasterisasi. Jika katalog terpartisi (`partisi_katalog.py`)
+sudah dibangun, partisi yang tersentuh kejadian baru/diperbarui ikut ditulis
+ulang di run yang sama, jadi semua halaman membaca katalog yang sama.
+
+    python ingest_gempa.py            # proses file baru/berubah saja
+    python ingest_gempa.py --penuh    # bangun ulang dari nol
+"""
+import argparse
+import json
+import os
+import time
+
+import geopandas as gpd
+import pandas as pd
+import pyarrow.parquet as pq
+
+from cache_dasbor import versi_file
+from data_gempa import (DIR_PARTISI, FILE_CSV, FILE_GEOJSON, FILE_PARQUET, FILE_PARQUET_LAUT, baca_parquet,
+                        gabung_katalog, siapkan_tipe, simpan_parquet)
+from katalog_mentah import (KOLOM_FINAL, POLA_RAW, UKURAN_CHUNK, baca_raw_bertahap, bersihkan, cari_file_raw,
+                            gabung_provinsi, siapkan_provinsi)
+from partisi_katalog import LEPAS_PANTAI, perbarui_partisi
+
+FILE_MANIFEST = 'manifest_ingest.json'
+
+
+def baca_manifest(path=FILE_MANIFEST):
+    if not os.path.exists(path):
+        return {'files': {}, 'events': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def tulis_manifest(manifest, path=FILE_MANIFEST):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+
+def cek_file(path, entry):
+    """Kembalikan (berubah, info_baru). sha1 hanya dihitung jika ukuran/mtime berbeda."""
+    st_ = os.stat(path)
+    info = {'size': st_.st_size, 'mtime_ns': st_.st_mtime_ns}
+    if entry and entry['size'] == info['size'] and entry['mtime_ns'] == info['mtime_ns']:
+        return False, entry
+    info['sha1'] = versi_file(path)
+    if entry and entry.get('sha1') == info['sha1']:
+        # Isi sama (mis. hanya tersentuh oleh git checkout), cukup perbarui stat
+        return False, info
+    return True, info
+
+
+def pilih_baris_baru(df, events):
+    """Dedupe berdasarkan `id` (simpan `updated` terbaru) dan buang versi yang sudah diproses.
+
+    `events` adalah peta id -> `updated` yang sudah terlihat, baik dari run
+    sebelumnya maupun dari chunk sebelumnya di run ini.
+    """
+    df = df.dropna(subset=['id', 'updated'])
+    df = df.assign(_updated=pd.to_datetime(df['updated'], format='ISO8601', utc=True))
+    df = df.sort_values('_updated').drop_duplicates(subset='id', keep='last')
+    if events:
+        # Lookup dict lewat list biasa jauh lebih cepat daripada Series.map pada kolom string Arrow
+        sebelumnya = pd.to_datetime(pd.Series([events.get(i) for i in df['id'].tolist()], index=df.index),
+                                    format='ISO8601', utc=True)
+        df = df[sebelumnya.isna() | (df['_updated'] > sebelumnya)]
+    return df.drop(columns='_updated')
+
+
+def versi_terbaru(df, events):
+    """Satu id bisa muncul di beberapa chunk; pertahankan hanya versi `updated` terbaru menurut manifest."""
+    terbaru = [events[i] for i in df['id'].tolist()]
+    return df[df['updated'] == terbaru].drop_duplicates(subset='id')
+
+
+def ekspor_csv(store, path=FILE_CSV):
+    store[KOLOM_FINAL].to_csv(path, index=False)
+
+
+def perbarui_store(path, baru, ids_disentuh, penuh):
+    """Isi store Parquet setelah versi lama id yang disentuh dibuang dan kejadian `baru` (belum bertipe) ditambahkan."""
+    frames = []
+    if not penuh:
+        store = baca_parquet(path)
+        # Versi lama dari id yang diperbarui dibuang, termasuk yang kini tidak lolos filter
+        frames.append(store[~store['id'].isin(ids_disentuh)])
+    frames.append(siapkan_tipe(baru))
+    return gabung_katalog(frames).sort_values('time', ascending=False, ignore_index=True)
+
+
+def ingest(raw_files, store_path=FILE_PARQUET, csv_path=FILE_CSV, manifest_path=FILE_MANIFEST,
+           geojson_path=FILE_GEOJSON, penuh=False, ukuran_chunk=UKURAN_CHUNK, laut_path=FILE_PARQUET_LAUT,
+           dir_partisi=DIR_PARTISI, wilayah=None):
+    manifest = baca_manifest(manifest_path)
+    # Store tanpa kolom `id` (mis. dibangun ulang dari CSV lama) atau tanpa
+    # store lepas pantai tidak bisa diperbarui per kejadian, jadi perlakukan
+    # sebagai build penuh.
+    if (penuh or not os.path.exists(store_path) or not os.path.exists(laut_path)
+            or 'id' not in pq.read_schema(store_path).names):
+        penuh = True
+        manifest = {'files': {}, 'events': {}}
+
+    berubah = {}
+    for path in raw_files:
+        nama = os.path.basename(path)
+        beda, info = cek_file(path, manifest['files'].get(nama))
+        if beda:
+            berubah[nama] = (path, info)
+        else:
+            manifest['files'][nama] = info
+
+    ringkasan = {'file_berubah': len(berubah), 'baris_dibaca': 0, 'baris_baru': 0, 'gempa_darat_baru': 0,
+                 'gempa_laut_baru': 0, 'penuh': penuh}
+    if not berubah:
+        tulis_manifest(manifest, manifest_path)
+        return ringkasan
+
+    pencari = None
+    darat_chunks, laut_chunks, ids_disentuh, ids_lama = [], [], [], []
+    for chunk in baca_raw_bertahap([path for path, _ in berubah.values()], ukuran_chunk):
+        ringkasan['baris_dibaca'] += len(chunk)
+        baru = pilih_baris_baru(chunk, manifest['events'])
+        if baru.empty:
+            continue
+        # Id yang sudah ada di manifest mungkin punya versi lama di partisi mana pun
+        ids_lama.append(baru['id'][[i in manifest['events'] for i in baru['id'].tolist()]])
+        manifest['events'].update(zip(baru['id'], baru['updated']))
+        ids_disentuh.append(baru['id'])
+        bersih = bersihkan(baru)
+        if len(bersih):
+            if pencari is None:
+                pencari = siapkan_provinsi(gpd.read_file(geojson_path))
+            darat = gabung_provinsi(bersih, pencari)
+            darat_chunks.append(darat)
+            # Sisanya gempa lepas pantai: tidak masuk katalog darat, tetapi dibutuhkan deklasterisasi
+            laut = bersih[~bersih.index.isin(darat.index)]
+            laut_chunks.append(laut.assign(provinsi=LEPAS_PANTAI)[KOLOM_FINAL])
+
+    if ids_disentuh:
+        ids_disentuh = pd.concat(ids_disentuh).unique()
+        ringkasan['baris_baru'] = len(ids_disentuh)
+        # Satu id bisa muncul di beberapa chunk; pertahankan hanya versi `updated` terbaru
+        darat, laut = (versi_terbaru(pd.concat(c, ignore_index=True), manifest['events']) if c
+                       else pd.DataFrame(columns=KOLOM_FINAL) for c in (darat_chunks, laut_chunks))
+        ringkasan['gempa_darat_baru'], ringkasan['gempa_laut_baru'] = len(darat), len(laut)
+        store = perbarui_store(store_path, darat, ids_disentuh, penuh)
+        # CSV ditulis lebih dulu agar Parquet tetap lebih baru dan tidak dibangun ulang darinya
+        ekspor_csv(store, csv_path)
+        simpan_parquet(store, store_path)
+        simpan_parquet(perbarui_store(laut_path, laut, ids_disentuh, penuh), laut_path)
+        # `wilayah` (nama -> GeoJSON) harus sama dengan saat katalog terpartisi dibangun; bawaannya WILAYAH
+        perbarui_partisi(pd.concat([darat, laut], ignore_index=True), ids_disentuh, pd.concat(ids_lama).unique(),
+                         dir_partisi, wilayah, penuh=penuh)
+
+    for nama, (_, info) in berubah.items():
+        manifest['files'][nama] = info
+    tulis_manifest(manifest, manifest_path)
+    return ringkasan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingesti inkremental katalog gempa USGS ke katalog gempa darat.")
+    parser.add_argument('--raw-dir', default='.', help="Direktori file CSV mentah USGS")
+    parser.add_argument('--pola', default=POLA_RAW, help="Pola glob file mentah")
+    parser.add_argument('--penuh', action='store_true', help="Abaikan manifest dan bangun ulang semuanya")
+    parser.add_argument('--chunk', type=int, default=UKURAN_CHUNK, help="Jumlah baris per potongan baca")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    raw_files = cari_file_raw(args.raw_dir, args.pola)
+    if not raw_files:
+        raise FileNotFoundError("Tidak ada file CSV data gempa yang ditemukan.")
+    ringkasan = ingest(raw_files, penuh=args.penuh, ukuran_chunk=args.chunk)
+    print(f"{len(raw_files)} file mentah diperiksa, {ringkasan['file_berubah']} berubah "
+          f"({ringkasan['baris_dibaca']} baris dibaca).")
+    print(f"{ringkasan['baris_baru']} kejadian baru/diperbarui, {ringkasan['gempa_darat_baru']} di antaranya gempa darat "
+          f"dan {ringkasan['gempa_laut_baru']} gempa lepas pantai.")
+    print(f"Selesai dalam {time.perf_counter() - t0:.2f} detik.")
+
+
+if __name__ == '__main__':
+    main()
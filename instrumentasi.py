@@ -0,0 +1,164 @@
+"""Instrumentasi ringan untuk halaman Streamlit: pengukur waktu per tahap dan ukuran payload.
+
+Setiap rerun halaman membuat satu `Pencatat` lewat `mulai_pencatatan()`.
+Tahap diukur dengan context manager `ukur('nama tahap')` atau dekorator
+`diukur('nama tahap')` untuk fungsi tahap di modul; di luar rerun yang sedang
+dicatat keduanya tidak melakukan apa-apa, jadi fungsi modul yang didekorasi
+tetap bisa dipanggil dari skrip build atau benchmark.
+
+Ukuran payload (HTML folium, JSON Plotly, DataFrame) umumnya butuh
+serialisasi ulang, sehingga `catat_ukuran()` hanya menghitungnya saat mode
+debug di sidebar aktif. Waktu per tahap selalu dicatat. Di akhir rerun
+catatannya ditambahkan sebagai satu baris ke log JSONL hanya jika
+`DASBOR_LOG_KINERJA` diset (path log) atau mode debug aktif (`FILE_LOG_DEBUG`).
+Log yang melewati `MAKS_LOG_BYTE` diputar ke `<path>.1`.
+"""
+import contextvars
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+
+from cache_dasbor import cache_lru
+
+FILE_LOG = os.environ.get('DASBOR_LOG_KINERJA') or None
+FILE_LOG_DEBUG = 'log_kinerja.jsonl'
+MAKS_LOG_BYTE = 5 * 2**20
+KUNCI_DEBUG = 'debug_kinerja'
+
+_aktif = contextvars.ContextVar('pencatat_aktif', default=None)
+
+
+class Pencatat:
+    def __init__(self, halaman, ukur_payload=False):
+        self.halaman = halaman
+        self.ukur_payload = ukur_payload
+        self.tahap = {}
+        self.ukuran = {}
+        self.konteks = {}
+        self.t0 = time.perf_counter()
+        self.total = None
+
+    @contextmanager
+    def ukur(self, tahap):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Tahap dengan nama sama dalam satu rerun dijumlahkan
+            self.tahap[tahap] = self.tahap.get(tahap, 0.0) + time.perf_counter() - t0
+
+    def catat_ukuran(self, nama, nilai):
+        """Catat ukuran (byte); `nilai` boleh callable yang hanya dievaluasi saat payload diukur."""
+        if self.ukur_payload:
+            self.ukuran[nama] = int(nilai() if callable(nilai) else nilai)
+
+    def selesai(self, path=FILE_LOG):
+        """Tutup pencatatan rerun ini dan tambahkan catatannya ke log JSONL."""
+        self.total = time.perf_counter() - self.t0
+        catatan = self.ke_dict()
+        if path:
+            if os.path.exists(path) and os.path.getsize(path) > MAKS_LOG_BYTE:
+                os.replace(path, path + '.1')
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(catatan, ensure_ascii=False) + '\n')
+        return catatan
+
+    def ke_dict(self):
+        total = self.total if self.total is not None else time.perf_counter() - self.t0
+        return {
+            'waktu': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'halaman': self.halaman,
+            'total_ms': round(total * 1000, 1),
+            'tahap_ms': {k: round(v * 1000, 1) for k, v in self.tahap.items()},
+            'ukuran_byte': self.ukuran,
+            'konteks': self.konteks,
+        }
+
+    def tabel(self):
+        """Rincian waktu per tahap, terlama lebih dulu, dengan baris sisa (render Streamlit, dll.)."""
+        total = self.total if self.total is not None else time.perf_counter() - self.t0
+        tahap = pd.Series(self.tahap, dtype=float)
+        tahap['(lainnya)'] = max(total - tahap.sum(), 0.0)
+        tabel = pd.DataFrame({'ms': tahap * 1000}).sort_values('ms', ascending=False)
+        tabel['persen'] = tabel['ms'] / (total * 1000) * 100
+        return tabel
+
+
+def mulai_pencatatan(halaman):
+    """Mulai pencatatan untuk satu rerun halaman; dipanggil di awal skrip halaman."""
+    pencatat = Pencatat(halaman, ukur_payload=bool(st.session_state.get(KUNCI_DEBUG)))
+    _aktif.set(pencatat)
+    return pencatat
+
+
+def pencatat_aktif():
+    return _aktif.get()
+
+
+@contextmanager
+def ukur(tahap):
+    pencatat = _aktif.get()
+    if pencatat is None:
+        yield
+        return
+    with pencatat.ukur(tahap):
+        yield
+
+
+def diukur(tahap):
+    """Dekorator: setiap panggilan fungsi dicatat sebagai `tahap` lewat `ukur`."""
+    def dekorator(fungsi):
+        @functools.wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            with ukur(tahap):
+                return fungsi(*args, **kwargs)
+        return pembungkus
+    return dekorator
+
+
+def catat_ukuran(nama, nilai):
+    pencatat = _aktif.get()
+    if pencatat is not None:
+        pencatat.catat_ukuran(nama, nilai)
+
+
+def ukuran_folium(m):
+    return len(m.get_root().render().encode('utf-8'))
+
+
+def ukuran_plotly(fig):
+    return len(fig.to_json().encode('utf-8'))
+
+
+def ukuran_dataframe(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def panel_debug(pencatat, path=FILE_LOG):
+    """Tutup pencatatan dan tampilkan rinciannya di sidebar jika mode debug aktif."""
+    aktif = st.sidebar.checkbox("⏱️ Mode debug kinerja", key=KUNCI_DEBUG,
+                                help="Tampilkan rincian waktu rerun dan ukuran payload. Pengukuran payload menambah waktu rerun.")
+    catatan = pencatat.selesai(path or (FILE_LOG_DEBUG if aktif else None))
+    if not aktif:
+        return
+    with st.sidebar.expander("Rincian rerun terakhir", expanded=True):
+        st.metric("Total rerun", f"{catatan['total_ms']:,.0f} ms")
+        st.dataframe(pencatat.tabel(), width='stretch', column_config={
+            'ms': st.column_config.NumberColumn("Waktu", format="%.1f ms"),
+            'persen': st.column_config.ProgressColumn("Porsi", format="%.0f%%", min_value=0, max_value=100),
+        })
+        if pencatat.ukuran:
+            st.dataframe(pd.DataFrame({'KB': pd.Series(pencatat.ukuran) / 1024}), width='stretch',
+                         column_config={'KB': st.column_config.NumberColumn("Ukuran", format="%.1f KB")})
+        elif not pencatat.ukur_payload:
+            st.caption("Ukuran payload diukur mulai rerun berikutnya.")
+        cache = cache_lru().statistik()
+        st.caption(f"Cache turunan: {cache['entri']} entri, {cache['byte'] / 2**20:,.1f} / {cache['maks_byte'] / 2**20:,.0f} MB, "
+                   f"{cache['hit']:,} hit, {cache['miss']:,} miss, {cache['dibuang']:,} dibuang.")
+        st.caption(f"Dicatat ke `{path or FILE_LOG_DEBUG}`.")
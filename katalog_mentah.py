@@ -0,0 +1,64 @@
+"""Pembacaan dan pembersihan katalog USGS mentah, bersama untuk ingesti dan katalog terpartisi.
+
+File mentah dibaca per potongan (chunk) berukuran tetap dengan dtype
+eksplisit, dibersihkan dengan aturan notebook (`bersihkan`), lalu di-join
+secara spasial ke poligon provinsi (lihat `provinsi_lookup.py`).
+"""
+import glob
+import os
+
+import pandas as pd
+
+from data_gempa import nama_kolom_provinsi
+from provinsi_lookup import PencariProvinsi
+
+POLA_RAW = '*.csv'
+# Sama seperti notebook: file hasil olahan tidak ikut dianggap data mentah
+KATA_DIKECUALIKAN = ['darat', 'enriched', 'bersih']
+
+# Hanya kolom yang benar-benar dipakai yang diparse, dengan dtype eksplisit.
+# Koordinat dan magnitudo tetap float64 agar hasil join spasial dan klasifikasi
+# identik dengan jalur lama; kolom berulang dijadikan kategori.
+DTYPE_RAW = {
+    'time': 'str', 'latitude': 'float64', 'longitude': 'float64', 'depth': 'float32', 'mag': 'float64',
+    'magType': 'category', 'place': 'str', 'type': 'category', 'status': 'category', 'id': 'str', 'updated': 'str',
+}
+UKURAN_CHUNK = 20_000
+
+KOLOM_KRITIS = ['time', 'latitude', 'longitude', 'depth', 'mag', 'magType', 'type', 'status']
+KOLOM_FINAL = ['time', 'latitude', 'longitude', 'depth', 'mag', 'magType', 'place', 'provinsi', 'id', 'updated']
+
+
+def cari_file_raw(raw_dir='.', pola=POLA_RAW):
+    files = sorted(glob.glob(os.path.join(raw_dir, pola)))
+    return [f for f in files if not any(kata in os.path.basename(f) for kata in KATA_DIKECUALIKAN)]
+
+
+def baca_raw_bertahap(paths, ukuran_chunk=UKURAN_CHUNK):
+    """Baca file mentah sebagai potongan berukuran tetap agar memori tidak tumbuh dengan ukuran input."""
+    for path in paths:
+        yield from pd.read_csv(path, usecols=list(DTYPE_RAW), dtype=DTYPE_RAW, chunksize=ukuran_chunk)
+
+
+def bersihkan(df):
+    df = df.copy()
+    for col in ['latitude', 'longitude', 'depth', 'mag']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['time'] = pd.to_datetime(df['time'], format='ISO8601', utc=True, errors='coerce')
+    df = df.dropna(subset=KOLOM_KRITIS)
+    return df[(df['type'] == 'earthquake') & (df['status'] == 'reviewed')]
+
+
+def siapkan_provinsi(gdf_provinsi):
+    """Bangun indeks provinsi sekali saja, sebelum dipakai di setiap chunk."""
+    return PencariProvinsi(gdf_provinsi, kolom_nama=nama_kolom_provinsi(gdf_provinsi))
+
+
+def gabung_provinsi(df, pencari):
+    """Pertahankan hanya gempa yang titiknya berada di dalam poligon provinsi.
+
+    Setara dengan `gpd.sjoin(..., how="inner", predicate="within")`.
+    """
+    idx_titik, idx_prov = pencari.pasangan(df['longitude'].to_numpy(), df['latitude'].to_numpy())
+    darat = df.iloc[idx_titik].assign(provinsi=pencari.nama[idx_prov])
+    return darat[KOLOM_FINAL]
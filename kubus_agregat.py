@@ -0,0 +1,218 @@
+"""Kubus agregat (bulan x provinsi x klasifikasi) untuk filter dasbor.
+
+Setiap sel kubus menyimpan jumlah kejadian, magnitudo maksimum, serta jumlah
+dan jumlah kuadrat dari magnitudo dan kedalaman. Metrik ringkasan, profil per
+provinsi, komposisi kekuatan dan tren bulanan dijawab dari irisan bulan
+kubus ini, sehingga biaya kueri sebanding dengan bulan x provinsi, bukan
+dengan jumlah kejadian.
+
+Rentang tanggal dari sidebar tidak harus jatuh di awal bulan. Bulan penuh
+diambil dari kubus, sedangkan potongan bulan di tepi rentang dihitung dari
+tabel kejadian yang terurut waktu (paling banyak dua potongan bulan).
+
+Untuk katalog terpartisi (partisi_katalog.py) setiap partisi wilayah/tahun
+diagregasi menjadi kubus sendiri, lalu digabung dengan `KubusGempa.gabung`.
+Di dasbor ini dikerjakan di proses server: kubus per partisi cukup murah,
+sedangkan process pool per permintaan harus mem-fork server dan mengirim
+balik semua array kejadian.
+"""
+import numpy as np
+import pandas as pd
+
+from data_gempa import batas_tanggal, cache_turunan
+from deklasterisasi import load_katalog
+from partisi_katalog import baca_file_partisi, daftar_partisi
+from skala_magnitudo import KATEGORI_URUTAN
+
+# Ukuran yang dapat dijumlahkan per sel kubus
+UKURAN_JUMLAH = ['jumlah', 'sum_mag', 'sumsq_mag', 'sum_depth', 'sumsq_depth']
+
+
+def _bulan(waktu_ns):
+    """Indeks bulan sejak 1970-01 (UTC) untuk array datetime64[ns]."""
+    return waktu_ns.astype('datetime64[M]').astype(np.int64)
+
+
+def _awal_bulan(b):
+    return np.datetime64(b, 'M').astype('datetime64[ns]')
+
+
+class KubusGempa:
+    def __init__(self, df):
+        df = df.sort_values('time', kind='stable')
+        self.provinsi = list(df['provinsi'].cat.categories)
+        self.kategori = KATEGORI_URUTAN
+        # Tabel kejadian terurut waktu untuk potongan bulan di tepi rentang
+        self.waktu = df['time'].dt.tz_localize(None).to_numpy('datetime64[ns]')
+        self.kode_prov = df['provinsi'].cat.codes.to_numpy(np.int64)
+        self.kode_kelas = pd.Categorical(df['klasifikasi'], categories=self.kategori).codes.astype(np.int64)
+        self.mag = df['mag'].to_numpy(np.float64)
+        self.depth = df['depth'].to_numpy(np.float64)
+
+        bulan = _bulan(self.waktu)
+        self.bulan0 = int(bulan.min()) if len(bulan) else 0
+        self.n_bulan = int(bulan.max()) - self.bulan0 + 1 if len(bulan) else 1
+        self.sel = self._agregasi(bulan - self.bulan0, np.s_[:], self.n_bulan)
+
+    @classmethod
+    def gabung(cls, daftar):
+        """Satu kubus dari kubus-kubus partisi; rentang waktunya boleh tumpang tindih (wilayah berbeda)."""
+        daftar = [k for k in daftar if len(k.waktu)]
+        kubus = cls.__new__(cls)
+        kubus.provinsi = sorted(set().union(*(k.provinsi for k in daftar)))
+        kubus.kategori = KATEGORI_URUTAN
+        P, K = len(kubus.provinsi), len(kubus.kategori)
+        peta_prov = [np.searchsorted(kubus.provinsi, k.provinsi).astype(np.int64) for k in daftar]
+        waktu = np.concatenate([k.waktu for k in daftar]) if daftar else np.array([], dtype='datetime64[ns]')
+        urutan = np.argsort(waktu, kind='stable')
+        kubus.waktu = waktu[urutan]
+        kubus.kode_prov = np.concatenate([p[k.kode_prov] for p, k in zip(peta_prov, daftar)] or [[]]).astype(np.int64)[urutan]
+        for atribut in ['kode_kelas', 'mag', 'depth']:
+            setattr(kubus, atribut, np.concatenate([getattr(k, atribut) for k in daftar] or [[]])[urutan])
+        kubus.kode_kelas = kubus.kode_kelas.astype(np.int64)
+
+        kubus.bulan0 = min((k.bulan0 for k in daftar), default=0)
+        kubus.n_bulan = max((k.bulan0 + k.n_bulan for k in daftar), default=1) - kubus.bulan0
+        kubus.sel = {u: np.zeros((kubus.n_bulan, P, K)) for u in UKURAN_JUMLAH}
+        kubus.sel['mag_maks'] = np.full((kubus.n_bulan, P, K), -np.inf)
+        for p, k in zip(peta_prov, daftar):
+            irisan = np.s_[k.bulan0 - kubus.bulan0:k.bulan0 - kubus.bulan0 + k.n_bulan]
+            for u in UKURAN_JUMLAH:
+                kubus.sel[u][irisan, p] += k.sel[u]
+            kubus.sel['mag_maks'][irisan, p] = np.maximum(kubus.sel['mag_maks'][irisan, p], k.sel['mag_maks'])
+        kubus.sel['jumlah'] = kubus.sel['jumlah'].astype(np.int64)
+        return kubus
+
+    def _agregasi(self, idx_bulan, irisan, n_bulan):
+        """Agregasi kejadian `irisan` ke array berbentuk (n_bulan, provinsi, kategori)."""
+        P, K = len(self.provinsi), len(self.kategori)
+        idx = (idx_bulan * P + self.kode_prov[irisan]) * K + self.kode_kelas[irisan]
+        n = n_bulan * P * K
+        mag, depth = self.mag[irisan], self.depth[irisan]
+        hasil = {
+            'jumlah': np.bincount(idx, minlength=n),
+            'sum_mag': np.bincount(idx, weights=mag, minlength=n),
+            'sumsq_mag': np.bincount(idx, weights=mag * mag, minlength=n),
+            'sum_depth': np.bincount(idx, weights=depth, minlength=n),
+            'sumsq_depth': np.bincount(idx, weights=depth * depth, minlength=n),
+        }
+        mag_maks = np.full(n, -np.inf)
+        np.maximum.at(mag_maks, idx, mag)
+        hasil['mag_maks'] = mag_maks
+        return {k: v.reshape(n_bulan, P, K) for k, v in hasil.items()}
+
+    def _potongan(self, t0, t1):
+        """Agregat satu potongan bulan [t0, t1) langsung dari tabel kejadian."""
+        i0, i1 = np.searchsorted(self.waktu, [t0, t1])
+        return self._agregasi(np.zeros(i1 - i0, dtype=np.int64), np.s_[i0:i1], 1)
+
+    def _blok(self, mulai, selesai):
+        """Blok (bulan, provinsi, kategori) untuk rentang tanggal inklusif [mulai, selesai] (lihat `batas_tanggal`)."""
+        t0, t1 = (np.datetime64(t.value, 'ns') for t in batas_tanggal(mulai, selesai))
+        b_awal, b_akhir = int(_bulan(t0)), int(_bulan(t1 - np.timedelta64(1, 'ns')))
+        n = b_akhir - b_awal + 1
+        P, K = len(self.provinsi), len(self.kategori)
+        blok = {k: np.zeros((n, P, K)) for k in UKURAN_JUMLAH}
+        blok['mag_maks'] = np.full((n, P, K), -np.inf)
+
+        # Bulan di tengah rentang selalu penuh dan diambil langsung dari kubus
+        self._salin(blok, b_awal, b_awal + 1, b_akhir)
+        # Bulan di tepi rentang: dari kubus jika tercakup penuh, selain itu dari tabel kejadian
+        for b in sorted({b_awal, b_akhir}):
+            a, z = max(t0, _awal_bulan(b)), min(t1, _awal_bulan(b + 1))
+            if a == _awal_bulan(b) and z == _awal_bulan(b + 1):
+                self._salin(blok, b_awal, b, b + 1)
+            else:
+                potongan = self._potongan(a, z)
+                for k in blok:
+                    blok[k][b - b_awal] = potongan[k][0]
+        return b_awal, blok
+
+    def _salin(self, blok, b_awal, b0, b1):
+        """Salin bulan [b0, b1) dari kubus ke blok yang dimulai pada bulan b_awal."""
+        k0, k1 = max(b0 - self.bulan0, 0), min(b1 - self.bulan0, self.n_bulan)
+        if k1 > k0:
+            tujuan = np.s_[k0 + self.bulan0 - b_awal:k1 + self.bulan0 - b_awal]
+            for k in blok:
+                blok[k][tujuan] = self.sel[k][k0:k1]
+
+    def _pilih_provinsi(self, blok, provinsi):
+        if provinsi is None:
+            return blok
+        p = self.provinsi.index(provinsi) if provinsi in self.provinsi else None
+        return {k: (v[:, p:p + 1] if p is not None else v[:, :0]) for k, v in blok.items()}
+
+    def kueri(self, mulai, selesai, provinsi=None):
+        """Ringkasan lengkap untuk filter sidebar; provinsi=None berarti semua provinsi."""
+        b_awal, blok = self._blok(mulai, selesai)
+        nama_prov = self.provinsi if provinsi is None else [p for p in self.provinsi if p == provinsi]
+        blok = self._pilih_provinsi(blok, provinsi)
+        return HasilKueri(b_awal, blok, nama_prov, self.kategori)
+
+
+class HasilKueri:
+    """Hasil kueri kubus; semua turunan dihitung dari blok kecil bulan x provinsi x kategori."""
+
+    def __init__(self, b_awal, blok, provinsi, kategori):
+        self.b_awal = b_awal
+        self.blok = blok
+        self.provinsi = provinsi
+        self.kategori = kategori
+        self.jumlah_pk = blok['jumlah'].sum(axis=0)
+        self.total = int(self.jumlah_pk.sum())
+
+    def mag_maks(self):
+        return float(self.blok['mag_maks'].max()) if self.total else 0
+
+    def provinsi_terbanyak(self):
+        # Sama seperti mode(): jika seri, provinsi pertama menurut abjad
+        return self.provinsi[int(np.argmax(self.jumlah_pk.sum(axis=1)))] if self.total else None
+
+    def statistik(self):
+        """Rata-rata dan simpangan baku magnitudo serta kedalaman dari jumlah dan jumlah kuadrat."""
+        hasil = {}
+        for kolom in ['mag', 'depth']:
+            s, ss = self.blok[f'sum_{kolom}'].sum(), self.blok[f'sumsq_{kolom}'].sum()
+            n = self.total
+            rata = s / n if n else np.nan
+            var = (ss - s * s / n) / (n - 1) if n > 1 else np.nan
+            hasil[kolom] = {'rata_rata': rata, 'std': np.sqrt(max(var, 0)) if n > 1 else np.nan}
+        return hasil
+
+    def profil(self):
+        """Tabel provinsi x kategori seperti pd.crosstab (hanya provinsi yang punya kejadian)."""
+        tabel = pd.DataFrame(self.jumlah_pk.astype(np.int64), index=pd.Index(self.provinsi, name='provinsi'),
+                             columns=pd.Index(self.kategori, name='klasifikasi'))
+        return tabel[tabel.sum(axis=1) > 0]
+
+    def komposisi(self):
+        jumlah = pd.Series(self.jumlah_pk.sum(axis=0).astype(np.int64), index=self.kategori, name='count')
+        return jumlah[jumlah > 0].sort_values(ascending=False)
+
+    def tren_bulanan(self):
+        """Setara `resample('ME').agg(['size', 'max'])`: dari bulan pertama hingga terakhir yang berisi kejadian."""
+        jumlah = self.blok['jumlah'].sum(axis=(1, 2)).astype(np.int64)
+        mag_maks = self.blok['mag_maks'].max(axis=(1, 2))
+        ada = np.flatnonzero(jumlah)
+        if not len(ada):
+            return pd.DataFrame(columns=['Jumlah Gempa', 'Magnitudo Maks'])
+        irisan = np.s_[ada[0]:ada[-1] + 1]
+        index = pd.date_range(pd.Timestamp(_awal_bulan(self.b_awal + int(ada[0]))), periods=ada[-1] - ada[0] + 1,
+                              freq='ME', tz='UTC', name='time')
+        return pd.DataFrame({'Jumlah Gempa': jumlah[irisan], 'Magnitudo Maks': np.where(np.isfinite(mag_maks[irisan]), mag_maks[irisan], 0)},
+                            index=index)
+
+
+KOLOM_KUBUS = ['time', 'provinsi', 'klasifikasi', 'mag', 'depth']
+
+
+def _kubus_partisi(path):
+    return KubusGempa(baca_file_partisi([path], kolom=KOLOM_KUBUS))
+
+
+@cache_turunan
+def load_kubus(hanya_utama=False, wilayah=None):
+    """Kubus untuk katalog dasar (`wilayah=None`) atau gabungan partisi wilayah terpilih."""
+    if wilayah is None or hanya_utama:
+        return KubusGempa(load_katalog(hanya_utama, wilayah=wilayah))
+    return KubusGempa.gabung([_kubus_partisi(p) for p in daftar_partisi(wilayah=wilayah)])
@@ -0,0 +1,145 @@
+"""Kueri bahaya atas katalog gempa darat: ambang magnitudo/kedalaman dan pencarian radius.
+
+Kejadian disimpan terurut waktu, sehingga jendela waktu cukup dicari dengan
+`searchsorted` dan menjadi satu rentang indeks. Untuk pencarian jarak,
+koordinat diubah ke vektor satuan di bola (x, y, z) dan dimasukkan ke
+`scipy.spatial.cKDTree`. Jarak lurus (chord) di bola naik monoton terhadap
+jarak lingkaran besar (haversine), jadi pencarian radius dan k-terdekat di
+pohon ini setara dengan pencarian haversine.
+
+Selain dipakai panel sidebar di halaman interaktif, kelas ini juga bisa
+dipakai langsung untuk pekerjaan batch, misalnya menilai ribuan lokasi
+fasilitas sekaligus dengan `skor_lokasi()`.
+"""
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from data_gempa import batas_tanggal, cache_turunan
+from partisi_katalog import load_rentang
+
+R_BUMI_KM = 6371.0088
+# Ambang "gempa dangkal berbahaya" dari analisis notebook
+MAG_BERBAHAYA = 6.0
+KEDALAMAN_DANGKAL = 70.0
+
+
+def ke_xyz(lat, lon):
+    """Vektor satuan (n, 3) untuk koordinat derajat."""
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def km_ke_chord(km):
+    return 2 * np.sin(np.minimum(np.asarray(km, dtype=np.float64) / R_BUMI_KM, np.pi) / 2)
+
+
+def chord_ke_km(chord):
+    return 2 * R_BUMI_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+class KueriBahaya:
+    def __init__(self, df):
+        self.df = df.sort_values('time', kind='stable').reset_index(drop=True)
+        self.waktu = self.df['time'].dt.tz_localize(None).to_numpy('datetime64[ns]').view(np.int64)
+        # Magnitudo dibandingkan dalam dtype simpanannya (float32), seperti skala_magnitudo
+        self.mag = self.df['mag'].to_numpy()
+        self.depth = self.df['depth'].to_numpy()
+        self.tree = cKDTree(ke_xyz(self.df['latitude'], self.df['longitude']))
+
+    def __len__(self):
+        return len(self.df)
+
+    def _rentang_waktu(self, mulai=None, selesai=None):
+        """Rentang indeks [i0, i1) untuk jendela waktu `batas_tanggal(mulai, selesai)`."""
+        t0, t1 = batas_tanggal(mulai, selesai)
+        i0 = 0 if t0 is None else int(np.searchsorted(self.waktu, t0.value, side='left'))
+        i1 = len(self.waktu) if t1 is None else int(np.searchsorted(self.waktu, t1.value, side='left'))
+        return i0, i1
+
+    def _lolos(self, idx, mag_min=None, depth_maks=None, mulai=None, selesai=None):
+        """Mask untuk indeks `idx` yang lolos ambang magnitudo, kedalaman, dan jendela waktu."""
+        i0, i1 = self._rentang_waktu(mulai, selesai)
+        lolos = (idx >= i0) & (idx < i1)
+        if mag_min is not None:
+            lolos &= self.mag[idx] >= self.mag.dtype.type(mag_min)
+        if depth_maks is not None:
+            lolos &= self.depth[idx] < self.depth.dtype.type(depth_maks)
+        return lolos
+
+    def ambang(self, mag_min=MAG_BERBAHAYA, depth_maks=KEDALAMAN_DANGKAL, mulai=None, selesai=None):
+        """Kejadian dengan mag >= mag_min dan depth < depth_maks dalam jendela waktu."""
+        i0, i1 = self._rentang_waktu(mulai, selesai)
+        idx = np.arange(i0, i1)
+        idx = idx[self._lolos(idx, mag_min, depth_maks)]
+        return self.df.iloc[idx]
+
+    def per_provinsi(self, **filter_):
+        """Jumlah kejadian hasil `ambang()` per provinsi, terbanyak lebih dulu."""
+        hasil = self.ambang(**filter_)['provinsi'].value_counts()
+        return hasil[hasil > 0]
+
+    def radius(self, lat, lon, radius_km, **filter_):
+        """Kejadian dalam `radius_km` dari (lat, lon), terurut dari yang terdekat, dengan kolom `jarak_km`."""
+        titik = ke_xyz(lat, lon)[0]
+        idx = np.asarray(self.tree.query_ball_point(titik, km_ke_chord(radius_km)), dtype=np.int64)
+        idx = idx[self._lolos(idx, **filter_)]
+        jarak = chord_ke_km(np.linalg.norm(self.tree.data[idx] - titik, axis=1))
+        urutan = np.argsort(jarak, kind='stable')
+        return self.df.iloc[idx[urutan]].assign(jarak_km=jarak[urutan])
+
+    def terdekat(self, lat, lon, k=10, **filter_):
+        """k kejadian terdekat dari (lat, lon) yang lolos filter, dengan kolom `jarak_km`."""
+        n = len(self)
+        if n == 0 or k <= 0:
+            return self.df.iloc[:0].assign(jarak_km=np.zeros(0))
+        titik = ke_xyz(lat, lon)[0]
+        # Filter diterapkan setelah pencarian; jumlah kandidat diperbesar sampai cukup
+        kandidat = k
+        while True:
+            kandidat = min(kandidat, n)
+            jarak, idx = self.tree.query(titik, k=kandidat)
+            jarak, idx = np.atleast_1d(jarak), np.atleast_1d(idx)
+            ada = idx < n
+            jarak, idx = jarak[ada], idx[ada]
+            lolos = self._lolos(idx, **filter_)
+            if lolos.sum() >= k or kandidat == n:
+                break
+            kandidat *= 4
+        jarak, idx = jarak[lolos][:k], idx[lolos][:k]
+        return self.df.iloc[idx].assign(jarak_km=chord_ke_km(jarak))
+
+    def skor_lokasi(self, lat, lon, radius_km, pencari=None, **filter_):
+        """Ringkasan bahaya untuk banyak lokasi sekaligus (array lat/lon).
+
+        Mengembalikan DataFrame per lokasi: jumlah kejadian dalam radius,
+        magnitudo maksimum, dan jarak ke kejadian terdekat di dalam radius.
+        Jika `pencari` (`PencariProvinsi`) diberikan, provinsi setiap lokasi
+        ikut ditambahkan sebagai kolom 'provinsi'.
+        """
+        titik = ke_xyz(lat, lon)
+        daftar = self.tree.query_ball_point(titik, km_ke_chord(radius_km))
+        panjang = np.fromiter((len(d) for d in daftar), dtype=np.int64, count=len(daftar))
+        idx = np.concatenate([np.asarray(d, dtype=np.int64) for d in daftar]) if panjang.sum() else np.zeros(0, dtype=np.int64)
+        lokasi = np.repeat(np.arange(len(daftar)), panjang)
+        lolos = self._lolos(idx, **filter_)
+        idx, lokasi = idx[lolos], lokasi[lolos]
+
+        jumlah = np.bincount(lokasi, minlength=len(daftar))
+        mag_maks = np.full(len(daftar), np.nan)
+        np.fmax.at(mag_maks, lokasi, self.mag[idx].astype(np.float64))
+        jarak = chord_ke_km(np.linalg.norm(self.tree.data[idx] - titik[lokasi], axis=1))
+        jarak_min = np.full(len(daftar), np.nan)
+        np.fmin.at(jarak_min, lokasi, jarak)
+        hasil = pd.DataFrame({'latitude': np.asarray(lat, dtype=np.float64), 'longitude': np.asarray(lon, dtype=np.float64),
+                              'jumlah': jumlah, 'mag_maks': mag_maks, 'jarak_terdekat_km': jarak_min})
+        if pencari is not None:
+            hasil['provinsi'] = pencari.lookup(hasil['longitude'].to_numpy(), hasil['latitude'].to_numpy())
+        return hasil
+
+
+@cache_turunan
+def load_kueri_bahaya(wilayah=None):
+    return KueriBahaya(load_rentang(wilayah=wilayah))
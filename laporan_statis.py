@@ -0,0 +1,239 @@
+"""Artefak prerender untuk halaman Laporan Statis.
+
+Halaman laporan menampilkan analisis atas seluruh data tanpa filter, jadi
+grafik dan peta cukup dirender sekali per versi data. Versi data adalah hash
+konten dari file CSV katalog, GeoJSON provinsi, dan `_versi.json` katalog
+terpartisi (ditambah VERSI_ARTEFAK, dinaikkan jika kode render berubah).
+Artefak disimpan di `DIR_ARTEFAK/<hash>/` dan halaman hanya membaca file-file
+ini.
+
+Jika katalog terpartisi sudah dibangun, laporan dibaca dari partisi wilayah
+bawaan, katalog yang sama dengan pilihan awal halaman interaktif.
+
+Artefak dapat dibangun di muka sebagai langkah build:
+
+    python laporan_statis.py
+
+Jika data berubah dan artefak untuk hash baru belum ada, halaman membangunnya
+sekali saat kunjungan pertama (regenerasi malas).
+"""
+import os
+import shutil
+import tempfile
+from hashlib import sha1
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib.ticker import PercentFormatter
+
+from cache_dasbor import versi_file
+from data_gempa import (DIR_PARTISI, FILE_CSV, FILE_GEOJSON, FILE_PARQUET, FILE_VERSI_PARTISI, baca_parquet,
+                        pastikan_parquet)
+from geometri_provinsi import baca_geojson_ringkas, peta_choropleth_ringkas
+from partisi_katalog import WILAYAH_BAWAAN, baca_partisi
+from skala_magnitudo import BATAS_ATAS, BATAS_MIKRO, KATEGORI_URUTAN, WARNA_KATEGORI
+from statistik_seismik import SEMUA, distribusi_frekuensi, statistik_jendela, statistik_provinsi
+
+DIR_ARTEFAK = 'artefak_laporan'
+VERSI_ARTEFAK = '4'
+# Tingkat penyederhanaan batas provinsi untuk peta choropleth (lihat geometri_provinsi.py)
+TINGKAT_PETA = 'sedang'
+DPI = 100
+
+# Nama file artefak
+PARETO = 'pareto.png'
+DISTRIBUSI = 'distribusi.png'
+KORELASI = 'korelasi.png'
+HEATMAP = 'heatmap.png'
+CHOROPLETH = 'choropleth.html'
+GR_GAMBAR = 'gutenberg_richter.png'
+GR_TABEL = 'gutenberg_richter.csv'
+
+
+def kunci_data(paths=(FILE_CSV, FILE_GEOJSON, os.path.join(DIR_PARTISI, FILE_VERSI_PARTISI))):
+    """Hash konten file data; hanya dihitung ulang jika mtime/ukuran file berubah."""
+    h = sha1(VERSI_ARTEFAK.encode())
+    for path in paths:
+        h.update(str(versi_file(path)).encode())
+    return h.hexdigest()[:16]
+
+
+def baca_katalog():
+    """Katalog darat untuk laporan: partisi wilayah bawaan jika ada, selain itu store Parquet."""
+    df = baca_partisi(wilayah=(WILAYAH_BAWAAN,))
+    if df is None:
+        pastikan_parquet()
+        df = baca_parquet(FILE_PARQUET)
+    return df
+
+
+def _simpan(fig, path):
+    fig.savefig(path, dpi=DPI, bbox_inches='tight')
+    plt.close(fig)
+
+
+def gambar_pareto(df):
+    df_pareto = pd.DataFrame({'jumlah': df['provinsi'].value_counts()})
+    df_pareto = df_pareto.sort_values(by='jumlah', ascending=False)
+    df_pareto['persen_kumulatif'] = (df_pareto['jumlah'].cumsum() / df_pareto['jumlah'].sum()) * 100
+    fig, ax = plt.subplots(figsize=(12, 7))
+    ax.bar(df_pareto.index[:15], df_pareto['jumlah'][:15], color="C0")
+    ax.set_ylabel("Jumlah Total Gempa Darat")
+    plt.setp(ax.get_xticklabels(), rotation=75, ha="right")
+    ax2 = ax.twinx()
+    ax2.plot(df_pareto.index[:15], df_pareto['persen_kumulatif'][:15], color="C1", marker="o", ms=5)
+    ax2.yaxis.set_major_formatter(PercentFormatter())
+    ax2.set_ylabel("Persentase Kumulatif")
+    fig.tight_layout()
+    return fig
+
+
+def gambar_distribusi(df):
+    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+    # Tahun dihitung sebagai Series lokal; frame yang di-cache tidak diubah
+    tahun = df['time'].dt.year.rename('year')
+    sns.countplot(ax=axes[0], y=tahun, hue=tahun, palette="viridis", order=tahun.value_counts().index, legend=False)
+    axes[0].set_title('Jumlah Gempa per Tahun')
+    axes[0].set_xlabel('Jumlah Kejadian')
+    axes[0].set_ylabel('Tahun')
+    sns.histplot(ax=axes[1], data=df, x='mag', kde=True, bins=20, color='royalblue')
+    # Garis batas kelas skala BMKG, diwarnai dengan warna kelas di atas batas
+    for i, batas in enumerate([BATAS_MIKRO] + BATAS_ATAS, start=1):
+        axes[1].axvline(batas, color=WARNA_KATEGORI[KATEGORI_URUTAN[i]], linestyle='--', linewidth=1)
+    axes[1].set_title('Distribusi Magnitudo')
+    axes[1].set_xlabel('Magnitudo')
+    sns.histplot(ax=axes[2], data=df[df['depth'] <= 300], x='depth', kde=True, bins=25, color='darkorange')
+    axes[2].set_title('Distribusi Kedalaman (km)')
+    axes[2].set_xlabel('Kedalaman (km)')
+    fig.tight_layout()
+    return fig
+
+
+def gambar_korelasi(df):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    # Fokus pada kedalaman < 300km agar lebih jelas; titik transparan untuk melihat kepadatan
+    sns.regplot(data=df[df['depth'] <= 300], x='depth', y='mag', scatter_kws={'alpha': 0.2},
+                line_kws={'color': 'red'}, ax=ax)
+    ax.set_xlabel("Kedalaman (km)")
+    ax.set_ylabel("Magnitudo")
+    ax.set_title("Hubungan Sebaran Magnitudo dan Kedalaman")
+    return fig
+
+
+def gambar_heatmap(df):
+    correlation_matrix = df[['mag', 'depth']].corr(method='pearson')
+    fig, ax = plt.subplots(figsize=(6, 5))
+    sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', fmt=".2f", ax=ax)
+    ax.set_title("Korelasi Pearson")
+    return fig
+
+
+def gambar_gutenberg_richter(df, tabel):
+    """FMD seluruh Indonesia dengan garis fit G-R, dan nilai b jendela geser 5 tahun."""
+    fig, (ax_fmd, ax_b) = plt.subplots(1, 2, figsize=(18, 6))
+    fmd = distribusi_frekuensi(df)
+    semua = tabel.loc[SEMUA]
+    ax_fmd.semilogy(fmd['mag'], fmd['kumulatif'], 'o', color='C0', ms=4, label='Kumulatif N(M ≥ m)')
+    ax_fmd.semilogy(fmd['mag'], fmd['jumlah'].where(fmd['jumlah'] > 0), 's', color='C7', ms=3, label='Per bin 0.1')
+    if pd.notna(semua['b']):
+        m = fmd['mag'][fmd['mag'] >= semua['mc']]
+        durasi = 10 ** (np.log10(semua['n']) - semua['a'] + semua['b'] * semua['mc'])
+        ax_fmd.semilogy(m, durasi * 10 ** (semua['a'] - semua['b'] * m), color='red',
+                        label=f"Fit G-R: b = {semua['b']:.2f} ± {semua['sigma_b']:.2f}")
+        ax_fmd.axvline(semua['mc'], color='gray', linestyle='--', label=f"Mc = {semua['mc']:.1f}")
+    ax_fmd.set_xlabel('Magnitudo')
+    ax_fmd.set_ylabel('Jumlah Kejadian')
+    ax_fmd.set_title('Distribusi Frekuensi-Magnitudo (Seluruh Provinsi)')
+    ax_fmd.legend()
+
+    jendela = statistik_jendela(df, panjang=5)
+    teratas = [SEMUA] + tabel.drop(index=SEMUA).sort_values('n', ascending=False).index[:4].tolist()
+    for i, nama in enumerate(teratas):
+        baris = jendela[jendela['provinsi'] == nama]
+        tengah = (baris['tahun_mulai'] + baris['tahun_selesai']) / 2
+        ax_b.plot(tengah, baris['b'], marker='o', ms=3, color=f'C{i}', label=nama)
+        ax_b.fill_between(tengah, baris['b'] - baris['sigma_b'], baris['b'] + baris['sigma_b'], color=f'C{i}', alpha=0.15)
+    ax_b.set_xlabel('Tengah Jendela 5 Tahun')
+    ax_b.set_ylabel('Nilai b')
+    ax_b.set_title('Perubahan Nilai b (Jendela Geser 5 Tahun, ± Shi & Bolt)')
+    ax_b.legend()
+    fig.tight_layout()
+    return fig
+
+
+def peta_choropleth(df, koleksi):
+    """HTML mandiri peta choropleth jumlah gempa per provinsi dari GeoJSON ringkas `koleksi`."""
+    per_provinsi = df.groupby('provinsi')
+    idx_max_mag = per_provinsi['mag'].idxmax()
+    max_mag_events = df.loc[idx_max_mag, ['provinsi', 'mag', 'time']].set_index('provinsi')
+    jumlah = per_provinsi.size()
+    properti = {}
+    for f in koleksi['features']:
+        nama = f['properties']['provinsi']
+        ada = nama in max_mag_events.index and jumlah.get(nama, 0) > 0
+        properti[nama] = {
+            'provinsi': nama,
+            'jumlah_gempa': int(jumlah.get(nama, 0)),
+            'magnitudo_maks': round(float(max_mag_events.at[nama, 'mag']), 2) if ada else 0,
+            'tahun_mag_maks': int(max_mag_events.at[nama, 'time'].year) if ada else 'N/A',
+        }
+    m = peta_choropleth_ringkas(
+        koleksi, properti, 'jumlah_gempa',
+        tooltip_fields=['provinsi', 'jumlah_gempa', 'magnitudo_maks', 'tahun_mag_maks'],
+        tooltip_aliases=['Provinsi:', 'Jumlah Gempa:', 'Magnitudo Tertinggi:', 'Tahun Magnitudo Tertinggi:'],
+        fill_color='YlOrRd', legend_name='Jumlah Total Gempa Darat')
+    return m.get_root().render()
+
+
+def bangun_artefak(df, koleksi, tujuan):
+    """Render semua artefak ke direktori `tujuan`."""
+    sns.set_style("whitegrid")
+    _simpan(gambar_pareto(df), os.path.join(tujuan, PARETO))
+    _simpan(gambar_distribusi(df), os.path.join(tujuan, DISTRIBUSI))
+    _simpan(gambar_korelasi(df), os.path.join(tujuan, KORELASI))
+    _simpan(gambar_heatmap(df), os.path.join(tujuan, HEATMAP))
+    tabel_gr = statistik_provinsi(df)
+    tabel_gr.to_csv(os.path.join(tujuan, GR_TABEL))
+    _simpan(gambar_gutenberg_richter(df, tabel_gr), os.path.join(tujuan, GR_GAMBAR))
+    with open(os.path.join(tujuan, CHOROPLETH), 'w', encoding='utf-8') as f:
+        f.write(peta_choropleth(df, koleksi))
+
+
+def pastikan_artefak(dir_artefak=DIR_ARTEFAK):
+    """Direktori artefak untuk versi data saat ini; dibangun jika belum ada.
+
+    Artefak dirender di direktori sementara lalu di-rename, sehingga pembaca
+    tidak pernah melihat set artefak yang setengah jadi. Versi lama dihapus.
+    """
+    kunci = kunci_data()
+    tujuan = os.path.join(dir_artefak, kunci)
+    if os.path.isdir(tujuan):
+        return tujuan
+
+    os.makedirs(dir_artefak, exist_ok=True)
+    df = baca_katalog()
+    koleksi = baca_geojson_ringkas(TINGKAT_PETA)
+    sementara = tempfile.mkdtemp(dir=dir_artefak, prefix='.bangun-')
+    try:
+        bangun_artefak(df, koleksi, sementara)
+        os.chmod(sementara, 0o755)
+        os.replace(sementara, tujuan)
+    except OSError:
+        # Proses lain sudah lebih dulu menyelesaikan versi yang sama
+        shutil.rmtree(sementara, ignore_errors=True)
+        if not os.path.isdir(tujuan):
+            raise
+    except BaseException:
+        shutil.rmtree(sementara, ignore_errors=True)
+        raise
+
+    for nama in os.listdir(dir_artefak):
+        if nama != kunci and not nama.startswith('.'):
+            shutil.rmtree(os.path.join(dir_artefak, nama), ignore_errors=True)
+    return tujuan
+
+
+if __name__ == '__main__':
+    print(f"Artefak laporan: {pastikan_artefak()}")
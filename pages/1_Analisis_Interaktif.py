@@ -1,148 +1,249 @@
 import streamlit as st
 import pandas as pd
-import geopandas as gpd
 import folium
 from streamlit_folium import st_folium
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from skala_magnitudo import WARNA_KATEGORI, KATEGORI_URUTAN
+from kubus_agregat import load_kubus
+from peta_risiko import bangun_peta_risiko, load_centroid_provinsi, viewport_dari_state, bangun_lapisan_titik
+from indeks_spasial import load_indeks_titik
+from statistik_seismik import load_statistik_provinsi, load_statistik_jendela, distribusi_frekuensi, SEMUA, MIN_KEJADIAN
+from kueri_bahaya import load_kueri_bahaya, MAG_BERBAHAYA, KEDALAMAN_DANGKAL
+from deklasterisasi import load_katalog
+from data_gempa import load_pencari_provinsi
+from partisi_katalog import daftar_wilayah, WILAYAH_BAWAAN
+from instrumentasi import mulai_pencatatan, ukur, catat_ukuran, ukuran_folium, ukuran_plotly, ukuran_dataframe, panel_debug
+
 # Konfigurasi halaman ini
 st.set_page_config(layout="wide", page_title="Dasbor Interaktif", page_icon="🌋")
-
-@st.cache_data
-def load_data():
-    df = pd.read_csv('data_gempa_darat.csv')
-    df['time'] = pd.to_datetime(df['time'], format='ISO8601')
-    def klasifikasi_bmkg(mag):
-        if mag < 2.5: return 'Mikro (Tidak Terasa, < 2.5)'
-        elif mag <= 5.4: return 'Ringan (Dirasakan, 2.5 - 5.4)'
-        elif mag <= 6.0: return 'Sedang (5.5 - 6.0)'
-        elif mag <= 6.9: return 'Kuat (6.1 - 6.9)'
-        elif mag <= 7.9: return 'Besar (7.0 - 7.9)'
-        else: return 'Dahsyat (>= 8.0)'
-    df['klasifikasi'] = df['mag'].apply(klasifikasi_bmkg)
-    geojson = gpd.read_file('Batas Provinsi 50m.geojson')
-    return df, geojson
-
-df_darat, gdf_provinsi = load_data()
+pencatat = mulai_pencatatan("1_Analisis_Interaktif")
 
 st.title("🌋 Dasbor Interaktif Kejadian Gempa di Indonesia")
 st.sidebar.header("Filter Dasbor")
-min_date = df_darat['time'].min().date()
-max_date = df_darat['time'].max().date()
+# Jika katalog terpartisi sudah dibangun (partisi_katalog.py), hanya partisi wilayah/tahun yang tersentuh filter yang dibaca
+pilihan_wilayah = daftar_wilayah()
+wilayah = None
+if pilihan_wilayah:
+    terpilih = st.sidebar.multiselect("Wilayah Katalog:", pilihan_wilayah,
+                                      default=[w for w in pilihan_wilayah if w == WILAYAH_BAWAAN] or pilihan_wilayah[:1])
+    wilayah = tuple(sorted(terpilih)) or (WILAYAH_BAWAAN,)
+
+with ukur("muat data"):
+    # Rentang tanggal dan daftar provinsi diambil dari kubus, tanpa memuat seluruh tabel kejadian
+    kubus_wilayah = load_kubus(False, wilayah)
+min_date = pd.Timestamp(kubus_wilayah.waktu[0]).date()
+max_date = pd.Timestamp(kubus_wilayah.waktu[-1]).date()
 start_date, end_date = st.sidebar.date_input("Pilih Rentang Tanggal:", value=[min_date, max_date], min_value=min_date, max_value=max_date)
-list_provinsi = ['Semua Provinsi'] + sorted(df_darat['provinsi'].unique().tolist())
+list_provinsi = ['Semua Provinsi'] + kubus_wilayah.provinsi
 provinsi_terpilih = st.sidebar.selectbox("Pilih Provinsi:", list_provinsi)
+hanya_utama = st.sidebar.checkbox("Hanya gempa utama (tanpa susulan)",
+                                  help="Deklasterisasi jendela Gardner-Knopoff: gempa susulan dan pendahuluan di sekitar gempa yang lebih besar tidak dihitung.")
+pencatat.konteks.update(mulai=str(start_date), selesai=str(end_date), provinsi=provinsi_terpilih, hanya_utama=hanya_utama,
+                        wilayah=list(wilayah) if wilayah else None)
 
-df_filtered = df_darat[(df_darat['time'].dt.date >= start_date) & (df_darat['time'].dt.date <= end_date)]
-if provinsi_terpilih != 'Semua Provinsi':
-    df_main_filtered = df_filtered[df_filtered['provinsi'] == provinsi_terpilih]
-else:
-    df_main_filtered = df_filtered
+# --- Panel kueri bahaya: radius di sekitar titik acuan (titik terakhir yang diklik di peta) ---
+with st.sidebar.expander("🔎 Kueri Bahaya di Sekitar Lokasi"):
+    nilai_peta = st.session_state.get("map_titik" if st.session_state.get("mode_peta") == "Titik Kejadian" else "map_risiko") or {}
+    klik = nilai_peta.get('last_clicked')
+    st.caption("Klik peta untuk memilih titik acuan, atau isi koordinat secara manual.")
+    lat_acuan = st.number_input("Lintang", -90.0, 90.0, value=float(klik['lat']) if klik else -6.9147, format="%.4f")
+    lon_acuan = st.number_input("Bujur", -180.0, 180.0, value=float(klik['lng']) if klik else 107.6098, format="%.4f")
+    radius_km = st.slider("Radius (km)", 10, 500, 100, step=10)
+    mag_min = st.slider("Magnitudo minimum", 0.0, 9.0, MAG_BERBAHAYA, step=0.1)
+    depth_maks = st.slider("Kedalaman kurang dari (km)", 10, 700, int(KEDALAMAN_DANGKAL), step=10)
+    # Kueri (termasuk pemindaian per provinsi) hanya dijalankan saat diminta, tidak di setiap rerun
+    if st.toggle("Jalankan kueri", key="kueri_bahaya_aktif"):
+        with ukur("kueri bahaya"):
+            kueri_bahaya = load_kueri_bahaya(wilayah)
+            filter_bahaya = dict(mag_min=mag_min, depth_maks=depth_maks, mulai=start_date, selesai=end_date)
+            sekitar = kueri_bahaya.radius(lat_acuan, lon_acuan, radius_km, **filter_bahaya)
+            skor = kueri_bahaya.skor_lokasi(lat_acuan, lon_acuan, radius_km, pencari=load_pencari_provinsi(), **filter_bahaya).iloc[0]
+        st.metric(f"Kejadian dalam radius {radius_km} km", f"{len(sekitar):,}")
+        st.caption(f"Titik acuan: {skor['provinsi'] or 'di luar wilayah provinsi'}"
+                   + (f" · magnitudo maksimum dalam radius M {skor['mag_maks']:.1f}" if skor['jumlah'] else ""))
+        if len(sekitar) > 0:
+            st.dataframe(sekitar[['time', 'mag', 'depth', 'jarak_km', 'place']].head(10), hide_index=True,
+                         column_config={'time': st.column_config.DatetimeColumn("Waktu", format="DD MMM YYYY"),
+                                        'mag': st.column_config.NumberColumn("M", format="%.1f"),
+                                        'depth': st.column_config.NumberColumn("Kedalaman", format="%.0f km"),
+                                        'jarak_km': st.column_config.NumberColumn("Jarak", format="%.0f km"),
+                                        'place': "Lokasi"})
+        else:
+            terdekat = kueri_bahaya.terdekat(lat_acuan, lon_acuan, k=1, **filter_bahaya)
+            if len(terdekat) > 0:
+                st.caption(f"Kejadian terdekat yang memenuhi ambang: M {terdekat['mag'].iloc[0]:.1f} sejauh {terdekat['jarak_km'].iloc[0]:,.0f} km.")
+        st.markdown(f"**Gempa M ≥ {mag_min:.1f}, kedalaman < {depth_maks} km per provinsi**")
+        st.dataframe(kueri_bahaya.per_provinsi(**filter_bahaya).rename("Jumlah").head(10))
+
+# Semua agregat di bawah dijawab dari kubus bulan x provinsi x klasifikasi, tanpa memindai tabel kejadian
+with ukur("filter (kubus)"):
+    hasil_filter = load_kubus(hanya_utama, wilayah).kueri(start_date, end_date, None if provinsi_terpilih == 'Semua Provinsi' else provinsi_terpilih)
 
 st.header("Ringkasan Data Sesuai Filter")
-total_gempa = len(df_main_filtered)
-mag_tertinggi = df_main_filtered['mag'].max() if total_gempa > 0 else 0
-prov_paling_sering = df_main_filtered['provinsi'].mode()[0] if total_gempa > 0 and provinsi_terpilih == 'Semua Provinsi' else provinsi_terpilih
+total_gempa = hasil_filter.total
+mag_tertinggi = hasil_filter.mag_maks()
+prov_paling_sering = hasil_filter.provinsi_terbanyak() if total_gempa > 0 and provinsi_terpilih == 'Semua Provinsi' else provinsi_terpilih
 col1, col2, col3 = st.columns(3)
 col1.metric("Total Kejadian Gempa", f"{total_gempa:,}")
 col2.metric("Magnitudo Tertinggi", f"{mag_tertinggi:.2f}")
 col3.metric("Provinsi Terdampak Terbanyak", prov_paling_sering)
 st.divider()
 
-tab1, tab2, tab3 = st.tabs(["Peta Risiko Interaktif", "Analisis Tren & Komposisi", "Profil Risiko per Provinsi"])
+tab1, tab2, tab3, tab4 = st.tabs(["Peta Risiko Interaktif", "Analisis Tren & Komposisi", "Profil Risiko per Provinsi", "Statistik Seismik"])
 
 with tab1:
     st.header("Peta Sebaran dan Risiko Gempa Darat")
-    if df_main_filtered.empty:
+    if total_gempa == 0:
         st.warning("Tidak ada data untuk filter yang dipilih.")
     else:
-        WARNA_KATEGORI = {'Mikro (Tidak Terasa, < 2.5)': '#8FBC8F', 'Ringan (Dirasakan, 2.5 - 5.4)': '#87CEEB', 'Sedang (5.5 - 6.0)': '#FFD700', 'Kuat (6.1 - 6.9)': '#FFA500', 'Besar (7.0 - 7.9)': '#DC143C', 'Dahsyat (>= 8.0)': '#8B0000'}
-        KATEGORI_URUTAN = list(WARNA_KATEGORI.keys())
-        profil_kerusakan = pd.crosstab(df_main_filtered['provinsi'], df_main_filtered['klasifikasi'])
-        for kat in KATEGORI_URUTAN:
-            if kat not in profil_kerusakan.columns: profil_kerusakan[kat] = 0
-        profil_kerusakan['total'] = profil_kerusakan.sum(axis=1)
-        def style_marker(jumlah_gempa):
-            if jumlah_gempa < 100: return {'radius': 6, 'color': 'green'}
-            elif jumlah_gempa < 500: return {'radius': 9, 'color': 'orange'}
-            else: return {'radius': 12, 'color': 'red'}
-        m = folium.Map(location=[-2.5, 118], zoom_start=5, tiles='CartoDB positron')
-        for index, row in profil_kerusakan.iterrows():
-            nama_prov = index
-            prov_geom = gdf_provinsi[gdf_provinsi['PROVINSI'] == nama_prov]
-            if prov_geom.empty: prov_geom = gdf_provinsi[gdf_provinsi['NAMOBJ'] == nama_prov]
-            if not prov_geom.empty:
-                gdf_planar = prov_geom.to_crs("EPSG:3857")
-                centroid_planar = gdf_planar.geometry.centroid.iloc[0]
-                centroid_latlon = gpd.GeoSeries([centroid_planar], crs="EPSG:3857").to_crs("EPSG:4326").iloc[0]
-                data_chart = row.drop('total').reset_index(); data_chart.columns = ['klasifikasi', 'jumlah']
-                fig_popup = px.bar(data_chart, x='klasifikasi', y='jumlah', color='klasifikasi', color_discrete_map=WARNA_KATEGORI, category_orders={'klasifikasi': KATEGORI_URUTAN}, title=f"Detail Gempa di {nama_prov}")
-                fig_popup.update_layout(height=400, width=600, showlegend=False, yaxis=dict(tickmode='linear', tick0=0, dtick=50), margin=dict(b=150))
-                html_chart = fig_popup.to_html(full_html=False, include_plotlyjs='cdn')
-                iframe = folium.IFrame(html_chart, width=630, height=430)
-                popup = folium.Popup(iframe, max_width=650)
-                marker_style = style_marker(row['total'])
-                folium.CircleMarker(location=[centroid_latlon.y, centroid_latlon.x], radius=marker_style['radius'], color=marker_style['color'], fill=True, fill_color=marker_style['color'], fill_opacity=0.7, popup=popup, tooltip=f"<b>{nama_prov}</b><br>Total Gempa: {row['total']}<br>Klik untuk detail").add_to(m)
-        st_folium(m, use_container_width=True, height=600, key="map_risiko")
-        st.subheader("Legenda Jumlah Total Gempa per Provinsi")
-        leg_col1, leg_col2, leg_col3 = st.columns(3)
-        with leg_col1: st.markdown("<div style='display:flex; align-items:center;'><div style='background-color:green; width:20px; height:20px; border-radius:50%; margin-right:10px;'></div> < 100 Kejadian</div>", unsafe_allow_html=True)
-        with leg_col2: st.markdown("<div style='display:flex; align-items:center;'><div style='background-color:orange; width:20px; height:20px; border-radius:50%; margin-right:10px;'></div> 100 - 500 Kejadian</div>", unsafe_allow_html=True)
-        with leg_col3: st.markdown("<div style='display:flex; align-items:center;'><div style='background-color:red; width:20px; height:20px; border-radius:50%; margin-right:10px;'></div> > 500 Kejadian</div>", unsafe_allow_html=True)
+        mode_peta = st.radio("Tampilan peta:", ["Ringkasan per Provinsi", "Titik Kejadian"], horizontal=True, key="mode_peta")
+        if mode_peta == "Ringkasan per Provinsi":
+            with ukur("peta: profil dan centroid"):
+                profil_kerusakan = hasil_filter.profil()
+                profil_kerusakan['total'] = profil_kerusakan.sum(axis=1)
+                centroid = load_centroid_provinsi(wilayah)
+                tanpa_lokasi = [p for p in profil_kerusakan.index if p not in centroid]
+            # Waktu membangun marker dicatat oleh bangun_peta_risiko sendiri (instrumentasi.diukur)
+            m = bangun_peta_risiko(profil_kerusakan, centroid)
+            catat_ukuran("peta folium (HTML)", lambda: ukuran_folium(m))
+            with ukur("peta: st_folium"):
+                st_folium(m, use_container_width=True, height=600, key="map_risiko")
+            if tanpa_lokasi:
+                st.caption(f"Tidak tampil di peta karena tidak punya lokasi: {', '.join(tanpa_lokasi)} "
+                           f"({int(profil_kerusakan.loc[tanpa_lokasi, 'total'].sum()):,} kejadian, tetap dihitung di ringkasan).")
+            st.subheader("Legenda Jumlah Total Gempa per Provinsi")
+            leg_col1, leg_col2, leg_col3 = st.columns(3)
+            with leg_col1: st.markdown("<div style='display:flex; align-items:center;'><div style='background-color:green; width:20px; height:20px; border-radius:50%; margin-right:10px;'></div> < 100 Kejadian</div>", unsafe_allow_html=True)
+            with leg_col2: st.markdown("<div style='display:flex; align-items:center;'><div style='background-color:orange; width:20px; height:20px; border-radius:50%; margin-right:10px;'></div> 100 - 500 Kejadian</div>", unsafe_allow_html=True)
+            with leg_col3: st.markdown("<div style='display:flex; align-items:center;'><div style='background-color:red; width:20px; height:20px; border-radius:50%; margin-right:10px;'></div> > 500 Kejadian</div>", unsafe_allow_html=True)
+        else:
+            # Klaster/titik dipilih di server sesuai viewport terakhir sehingga jumlah marker tetap dibatasi
+            with ukur("peta: kueri indeks titik"):
+                indeks = load_indeks_titik(start_date, end_date, None if provinsi_terpilih == 'Semua Provinsi' else provinsi_terpilih, hanya_utama, wilayah)
+                (barat, selatan, timur, utara), zoom, center = viewport_dari_state(st.session_state.get("map_titik"))
+                jenis, fitur = indeks.kueri(barat, selatan, timur, utara, zoom)
+            m = folium.Map(location=[-2.5, 118], zoom_start=5, tiles='CartoDB positron')
+            lapisan = bangun_lapisan_titik(jenis, fitur)
+            with ukur("peta: st_folium"):
+                st_folium(m, use_container_width=True, height=600, key="map_titik", center=center, zoom=zoom,
+                          feature_group_to_add=lapisan, returned_objects=['bounds', 'zoom', 'center', 'last_clicked'])
+            # st_folium sudah menempelkan lapisan titik ke peta, jadi ukurannya ikut terhitung
+            catat_ukuran("peta folium (HTML)", lambda: ukuran_folium(m))
+            if jenis == 'klaster':
+                st.caption(f"{len(fitur):,} klaster mewakili {int(fitur['jumlah'].sum()):,} kejadian di area peta. Perbesar peta untuk melihat kejadian individual.")
+            else:
+                st.caption(f"{len(fitur):,} kejadian di area peta, diwarnai menurut klasifikasi BMKG.")
 with tab2:
     st.header("Analisis Tren dan Komposisi")
-    if df_main_filtered.empty:
+    if total_gempa == 0:
         st.warning("Tidak ada data untuk filter yang dipilih.")
     else:
         st.subheader("Tren Kejadian Gempa per Bulan")
-        df_ts = df_main_filtered.set_index('time')
-        tren_bulanan = df_ts['mag'].resample('ME').agg(['size', 'max'])
-        tren_bulanan.rename(columns={'size': 'Jumlah Gempa', 'max': 'Magnitudo Maks'}, inplace=True)
-        tren_bulanan['Magnitudo Maks'] = tren_bulanan['Magnitudo Maks'].fillna(0)
-        fig_ts = make_subplots(specs=[[{"secondary_y": True}]])
-        fig_ts.add_trace(go.Bar(x=tren_bulanan.index, y=tren_bulanan['Jumlah Gempa'], name='Jumlah Gempa'), secondary_y=False)
-        fig_ts.add_trace(go.Scatter(x=tren_bulanan.index, y=tren_bulanan['Magnitudo Maks'], name='Magnitudo Maks', marker_color='red'), secondary_y=True)
-        st.plotly_chart(fig_ts, use_container_width=True)
+        with ukur("plotly: tren bulanan"):
+            tren_bulanan = hasil_filter.tren_bulanan()
+            fig_ts = make_subplots(specs=[[{"secondary_y": True}]])
+            fig_ts.add_trace(go.Bar(x=tren_bulanan.index, y=tren_bulanan['Jumlah Gempa'], name='Jumlah Gempa'), secondary_y=False)
+            fig_ts.add_trace(go.Scatter(x=tren_bulanan.index, y=tren_bulanan['Magnitudo Maks'], name='Magnitudo Maks', marker_color='red'), secondary_y=True)
+            st.plotly_chart(fig_ts, use_container_width=True)
+        catat_ukuran("plotly: tren bulanan (JSON)", lambda: ukuran_plotly(fig_ts))
         st.subheader("Komposisi Kekuatan Gempa")
-        kategori_counts = df_main_filtered['klasifikasi'].value_counts()
-        fig_pie = px.pie(values=kategori_counts.values, names=kategori_counts.index, title='Proporsi Gempa Berdasarkan Kekuatan')
-        st.plotly_chart(fig_pie, use_container_width=True)
+        with ukur("plotly: komposisi"):
+            kategori_counts = hasil_filter.komposisi()
+            fig_pie = px.pie(values=kategori_counts.values, names=kategori_counts.index, title='Proporsi Gempa Berdasarkan Kekuatan')
+            st.plotly_chart(fig_pie, use_container_width=True)
+        catat_ukuran("plotly: komposisi (JSON)", lambda: ukuran_plotly(fig_pie))
 with tab3:
     st.header("Perbandingan Profil Risiko antar Provinsi")
     st.write("Grafik ini membandingkan komposisi kekuatan gempa (berdasarkan filter).")
     
-    if df_main_filtered.empty:
+    if total_gempa == 0:
         st.warning("Tidak ada data untuk filter yang dipilih.")
     else:
         # PERBAIKAN: Logika diubah untuk menampilkan semua provinsi atau satu provinsi
         
         if provinsi_terpilih == 'Semua Provinsi':
             # Langsung gunakan data yang sudah difilter tanpa batasan top 15
-            df_to_plot = df_main_filtered
+            profil_risiko = hasil_filter.profil()
             title = "Profil Risiko di Semua Provinsi"
         else:
             # Jika satu provinsi dipilih, gunakan data provinsi tersebut
-            df_to_plot = df_main_filtered
+            profil_risiko = hasil_filter.profil()
             title = f"Profil Risiko di {provinsi_terpilih}"
         
-        if not df_to_plot.empty:
-            profil_risiko = pd.crosstab(df_to_plot['provinsi'], df_to_plot['klasifikasi'])
-            
+        if not profil_risiko.empty:
             # Mengurutkan provinsi berdasarkan total gempa agar lebih rapi
             profil_risiko['total'] = profil_risiko.sum(axis=1)
             profil_risiko = profil_risiko.sort_values('total', ascending=False).drop(columns='total')
 
             # Reorder columns to ensure logical stacking
-            # Pastikan variabel KATEGORI_URUTAN dan WARNA_KATEGORI sudah didefinisikan di atas
-            # Jika belum, Anda bisa definisikan di sini
-            WARNA_KATEGORI = {'Mikro (Tidak Terasa, < 2.5)': '#8FBC8F', 'Ringan (Dirasakan, 2.5 - 5.4)': '#87CEEB', 'Sedang (5.5 - 6.0)': '#FFD700', 'Kuat (6.1 - 6.9)': '#FFA500', 'Besar (7.0 - 7.9)': '#DC143C', 'Dahsyat (>= 8.0)': '#8B0000'}
-            KATEGORI_URUTAN = list(WARNA_KATEGORI.keys())
             profil_risiko = profil_risiko.reindex(columns=KATEGORI_URUTAN, fill_value=0)
             
-            fig_bar = px.bar(profil_risiko, barmode='stack', title=title,
-                           color_discrete_map=WARNA_KATEGORI)
-            st.plotly_chart(fig_bar, use_container_width=True)
+            with ukur("plotly: profil risiko"):
+                fig_bar = px.bar(profil_risiko, barmode='stack', title=title,
+                               color_discrete_map=WARNA_KATEGORI)
+                st.plotly_chart(fig_bar, use_container_width=True)
+            catat_ukuran("plotly: profil risiko (JSON)", lambda: ukuran_plotly(fig_bar))
         else:
             st.info("Tidak ada data untuk ditampilkan pada provinsi yang dipilih.")
+with tab4:
+    st.header("Statistik Gutenberg-Richter")
+    st.write("Nilai a dan b, magnitudo kelengkapan (Mc), dan periode ulang untuk rentang tanggal yang dipilih.")
+    if total_gempa == 0:
+        st.warning("Tidak ada data untuk filter yang dipilih.")
+    else:
+        with ukur("statistik G-R"):
+            tabel_gr = load_statistik_provinsi(start_date, end_date, hanya_utama, wilayah)
+        kelompok = SEMUA if provinsi_terpilih == 'Semua Provinsi' else provinsi_terpilih
+        gr = tabel_gr.loc[kelompok]
+        if pd.isna(gr['b']):
+            st.info(f"Kejadian M ≥ Mc di {kelompok} kurang dari {MIN_KEJADIAN}, sehingga nilai b tidak dapat diestimasi dengan andal. Perlebar rentang tanggal.")
+        else:
+            gr_col1, gr_col2, gr_col3, gr_col4 = st.columns(4)
+            gr_col1.metric("Nilai b", f"{gr['b']:.2f} ± {gr['sigma_b']:.2f}", help=f"Interval bootstrap P5-P95: {gr['b_p05']:.2f} - {gr['b_p95']:.2f}")
+            gr_col2.metric("Nilai a (tahunan)", f"{gr['a']:.2f}")
+            gr_col3.metric("Magnitudo Kelengkapan (Mc)", f"{gr['mc']:.1f}")
+            gr_col4.metric("Kejadian M ≥ Mc", f"{int(gr['n']):,}")
+            pu_col1, pu_col2, pu_col3 = st.columns(3)
+            for kolom, mag in zip([pu_col1, pu_col2, pu_col3], [5, 6, 7]):
+                periode = gr[f'periode_ulang_m{mag}']
+                kolom.metric(f"Periode Ulang M ≥ {mag}", f"{periode:,.1f} tahun" if periode >= 1 else f"{periode * 365.25:,.0f} hari")
+
+        st.subheader(f"Distribusi Frekuensi-Magnitudo: {kelompok}")
+        with ukur("statistik G-R"):
+            df_gr = load_katalog(hanya_utama, wilayah=wilayah, mulai=start_date, selesai=end_date,
+                                 provinsi=None if kelompok == SEMUA else kelompok)
+            fmd = distribusi_frekuensi(df_gr)
+        fig_fmd = go.Figure()
+        fig_fmd.add_trace(go.Scatter(x=fmd['mag'], y=fmd['kumulatif'], mode='markers', name='Kumulatif N(M ≥ m)'))
+        fig_fmd.add_trace(go.Scatter(x=fmd['mag'], y=fmd['jumlah'].where(fmd['jumlah'] > 0), mode='markers', name='Per bin 0.1', marker_symbol='square', marker_color='gray'))
+        if pd.notna(gr['b']):
+            m_fit = fmd['mag'][fmd['mag'] >= gr['mc']]
+            # N(M >= m) selama rentang terpilih = N(M >= Mc) * 10^(-b (m - Mc))
+            fig_fmd.add_trace(go.Scatter(x=m_fit, y=gr['n'] * 10 ** (-gr['b'] * (m_fit - gr['mc'])), mode='lines', name=f"Fit G-R (b = {gr['b']:.2f})", line_color='red'))
+            fig_fmd.add_vline(x=gr['mc'], line_dash='dash', line_color='gray', annotation_text=f"Mc = {gr['mc']:.1f}")
+        fig_fmd.update_layout(xaxis_title='Magnitudo', yaxis_title='Jumlah Kejadian', yaxis_type='log')
+        with ukur("plotly: FMD"):
+            st.plotly_chart(fig_fmd, use_container_width=True)
+        catat_ukuran("plotly: FMD (JSON)", lambda: ukuran_plotly(fig_fmd))
+
+        st.subheader("Perubahan Nilai b (Jendela Geser 5 Tahun)")
+        with ukur("statistik G-R"):
+            jendela = load_statistik_jendela(start_date, end_date, hanya_utama=hanya_utama, wilayah=wilayah)
+        jendela = jendela[(jendela['provinsi'] == kelompok) & jendela['b'].notna()]
+        if jendela.empty:
+            st.info("Rentang tanggal terlalu pendek atau kejadian terlalu sedikit untuk jendela 5 tahun.")
+        else:
+            fig_b = go.Figure(go.Scatter(x=jendela['tahun_mulai'].astype(str) + '-' + jendela['tahun_selesai'].astype(str), y=jendela['b'],
+                                         error_y=dict(type='data', array=jendela['sigma_b']), mode='lines+markers', name='Nilai b'))
+            fig_b.update_layout(xaxis_title='Jendela', yaxis_title='Nilai b')
+            st.plotly_chart(fig_b, use_container_width=True)
+
+        with st.expander("Tabel statistik semua provinsi"):
+            tabel_tampil = tabel_gr.dropna(subset=['b']).sort_values('n', ascending=False).round(2)
+            catat_ukuran("tabel statistik (DataFrame)", lambda: ukuran_dataframe(tabel_tampil))
+            st.dataframe(tabel_tampil)
+
+panel_debug(pencatat)
@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 
+from skala_magnitudo import tabel_skala
+
 st.set_page_config(page_title="Informasi Gempa", page_icon="📚", layout="wide")
 
 st.title("📚 Panduan Kesiapsiagaan Gempa Bumi")
@@ -14,18 +16,7 @@ with st.expander("❓ **Mengenal Skala Magnitudo**", expanded=True):
     st.write("""
     Ukuran kekuatan gempa bumi yang menggambarkan besarnya energi seismik yang dipancarkan oleh sumber gempa dan merupakan hasil pengamatan seismograf.
     """)
-    skala_data = {
-        "Magnitudo": ["< 2.5", "2.5 - 5.4", "5.5 - 6.0", "6.1 - 6.9", "7.0 - 7.9", "8.0 >"],
-        "Efek yang Dirasakan": [
-            "Biasanya tidak terasa, tetapi dapat direkam dengan seismograf.",
-            "Sering dirasakan, tetapi hanya menyebabkan kerusakan kecil.",
-            "Dapat menyebabakan kerusakan ringan pada bangunan dan struktur lainnya.",
-            "Dapat menyebabkan kerusakan di daerah berpenduduk padat.",
-            "Gempa bumi besar dengan kerusakan serius.",
-            "Gempa hebat dan dapat menghancurkan komunitas di dekat pusat gempa."
-        ]
-    }
-    st.table(pd.DataFrame(skala_data))
+    st.table(tabel_skala())
 
 with st.expander("💡 **Apa yang Harus Dilakukan SEBELUM Gempa?**"):
     st.markdown("""
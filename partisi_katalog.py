@@ -0,0 +1,376 @@
+"""Katalog gempa terpartisi per wilayah dan tahun (direktori Parquet gaya Hive).
+
+    katalog_partisi/
+        _versi.json                          build aktif, daftar partisi dan jumlah baris
+        bangun-20241231T000000/
+            wilayah=indonesia/tahun=2004/bagian-0.parquet
+            wilayah=indonesia-laut/tahun=2004/bagian-0.parquet
+            ...
+
+Setiap wilayah di `WILAYAH` punya GeoJSON batas provinsinya sendiri, jadi
+katalog negara tetangga cukup ditambahkan sebagai entri baru. Dengan
+`--lepas-pantai`, gempa yang tidak jatuh di poligon mana pun tetapi masih di
+dalam kotak batas suatu wilayah (diperlebar `MARGIN_LEPAS_PANTAI` derajat)
+disimpan di wilayah `<nama>-laut` dengan provinsi `LEPAS_PANTAI`.
+
+Pembangunan berjalan di process pool dalam dua tahap: setiap file mentah
+dibersihkan, ditentukan wilayah/provinsinya, dan dipecah per (wilayah, tahun)
+ke file pecahan; lalu setiap partisi di-dedupe (versi `updated` terbaru per
+`id`, sama seperti `ingest_gempa.py`) dan ditulis ke direktori build baru.
+Build baru aktif saat `_versi.json` yang menunjuk ke sana menggantikan yang
+lama lewat satu `os.replace`, jadi pembaca selalu melihat build lama atau
+build baru yang utuh. Build yang dirujuk versi sebelumnya disimpan agar
+pembaca yang masih memegang daftar lama tidak kehilangan file; build lain dan
+sisa build yang gagal dihapus.
+
+Setelah dibangun, katalog terpartisi dipelihara oleh `ingest_gempa.py`: setiap
+run ingesti memanggil `perbarui_partisi`, yang hanya menulis ulang partisi
+yang menerima kejadian baru/diperbarui atau menyimpan versi lamanya. Partisi
+lain tetap merujuk file di build sebelumnya, jadi `_versi.json` bisa menunjuk
+ke beberapa direktori build.
+
+Dasbor hanya membaca partisi yang tersentuh filter wilayah dan rentang
+tanggal; filter waktu dan provinsi di dalam partisi diteruskan ke pembaca
+Parquet.
+
+    python partisi_katalog.py [--raw-dir .] [--lepas-pantai] [--proses 4]
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import geopandas as gpd
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from data_gempa import (DIR_PARTISI, FILE_GEOJSON, FILE_VERSI_PARTISI, KOLOM_KATEGORI, batas_tanggal, cache_turunan,
+                        gabung_katalog, load_data, saring_tanggal, siapkan_tipe)
+from katalog_mentah import (KOLOM_FINAL, POLA_RAW, UKURAN_CHUNK, baca_raw_bertahap, bersihkan, cari_file_raw,
+                            gabung_provinsi, siapkan_provinsi)
+from skala_magnitudo import KATEGORI_URUTAN
+
+# Nama wilayah -> GeoJSON batas provinsinya
+WILAYAH = {'indonesia': FILE_GEOJSON}
+WILAYAH_BAWAAN = 'indonesia'
+AKHIRAN_LAUT = '-laut'
+LEPAS_PANTAI = 'LEPAS PANTAI'
+MARGIN_LEPAS_PANTAI = 2.0  # derajat
+
+# Diisi sekali per proses pekerja oleh `_siapkan_pekerja`
+_PENCARI = {}
+
+
+def path_partisi(dir_partisi, wilayah, tahun):
+    return os.path.join(dir_partisi, f'wilayah={wilayah}', f'tahun={tahun}')
+
+
+def petakan(fungsi, tugas, n_proses=None, initializer=None, initargs=()):
+    """`[fungsi(*t) for t in tugas]` di process pool; dengan satu proses dijalankan langsung."""
+    tugas = list(tugas)
+    n_proses = max(min(n_proses or os.cpu_count() or 1, len(tugas)), 1)
+    if n_proses == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [fungsi(*t) for t in tugas]
+    with ProcessPoolExecutor(max_workers=n_proses, initializer=initializer, initargs=initargs) as pool:
+        return list(pool.map(fungsi, *zip(*tugas)))
+
+
+def _siapkan_pekerja(wilayah):
+    """Bangun indeks provinsi setiap wilayah sekali per proses pekerja."""
+    _PENCARI.clear()
+    for nama, geojson in wilayah.items():
+        gdf = gpd.read_file(geojson)
+        barat, selatan, timur, utara = gdf.total_bounds
+        kotak = (barat - MARGIN_LEPAS_PANTAI, selatan - MARGIN_LEPAS_PANTAI,
+                 timur + MARGIN_LEPAS_PANTAI, utara + MARGIN_LEPAS_PANTAI)
+        _PENCARI[nama] = (siapkan_provinsi(gdf), kotak)
+
+
+def _tentukan_wilayah(bersih, lepas_pantai):
+    """Pasangan (wilayah, frame KOLOM_FINAL) untuk satu potongan yang sudah dibersihkan."""
+    hasil, sisa = [], bersih
+    for nama, (pencari, _) in _PENCARI.items():
+        darat = gabung_provinsi(sisa, pencari)
+        hasil.append((nama, darat))
+        sisa = sisa[~sisa.index.isin(darat.index)]
+    if lepas_pantai:
+        # Wilayah darat diperiksa semua lebih dulu agar kotak batas satu wilayah tidak mengklaim daratan wilayah lain
+        for nama, (_, (barat, selatan, timur, utara)) in _PENCARI.items():
+            di_kotak = (sisa['longitude'].between(barat, timur) & sisa['latitude'].between(selatan, utara)).to_numpy()
+            hasil.append((nama + AKHIRAN_LAUT, sisa[di_kotak].assign(provinsi=LEPAS_PANTAI)[KOLOM_FINAL]))
+            sisa = sisa[~di_kotak]
+    return hasil
+
+
+def _pecah_file(nomor, path, dir_pecahan, lepas_pantai, ukuran_chunk):
+    """Tahap 1: pecah satu file mentah per (wilayah, tahun).
+
+    Mengembalikan (versi, kandidat): `versi` berisi (id, updated) semua baris
+    mentah untuk dedupe global, `kandidat` berisi (id, updated, wilayah, tahun)
+    baris yang ditulis ke pecahan.
+    """
+    versi, kandidat = [], []
+    for i, chunk in enumerate(baca_raw_bertahap([path], ukuran_chunk)):
+        chunk = chunk.dropna(subset=['id', 'updated'])
+        versi.append(chunk[['id', 'updated']])
+        bersih = bersihkan(chunk)
+        if not len(bersih):
+            continue
+        for wilayah, df in _tentukan_wilayah(bersih, lepas_pantai):
+            for tahun, bagian in df.groupby(df['time'].dt.year):
+                tujuan = path_partisi(dir_pecahan, wilayah, tahun)
+                os.makedirs(tujuan, exist_ok=True)
+                # Nama berurutan (file, potongan) agar urutan baris sama dengan ingest berurutan
+                bagian.to_parquet(os.path.join(tujuan, f'{nomor:04d}-{i:06d}.parquet'), index=False)
+                kandidat.append(bagian[['id', 'updated']].assign(wilayah=wilayah, tahun=int(tahun)))
+    kosong = pd.DataFrame(columns=['id', 'updated'])
+    return (pd.concat(versi, ignore_index=True) if versi else kosong,
+            pd.concat(kandidat, ignore_index=True) if kandidat else kosong.assign(wilayah=None, tahun=None))
+
+
+def _tulis_partisi(dir_pecahan, dir_tujuan, menang):
+    """Tahap 2: gabungkan pecahan satu partisi, pertahankan versi pemenang, tulis bertipe."""
+    df = pd.concat([pd.read_parquet(p) for p in sorted(glob.glob(os.path.join(dir_pecahan, '*.parquet')))],
+                   ignore_index=True)
+    kunci = pd.MultiIndex.from_frame(df[['id', 'updated']])
+    df = df[kunci.isin(pd.MultiIndex.from_frame(menang))].drop_duplicates(subset='id')
+    df = siapkan_tipe(df).sort_values('time', ascending=False, ignore_index=True)
+    os.makedirs(dir_tujuan, exist_ok=True)
+    path = os.path.join(dir_tujuan, 'bagian-0.parquet')
+    df.to_parquet(path, index=False, engine='pyarrow')
+    return len(df)
+
+
+def _nama_build():
+    return 'bangun-' + pd.Timestamp.now(tz='UTC').strftime('%Y%m%dT%H%M%S%f')
+
+
+def _build_dipakai(info):
+    """Direktori build yang dirujuk partisi di `info`; pembaruan inkremental bisa merujuk beberapa build."""
+    return {os.path.normpath(p['path']).split(os.sep)[0] for p in info['partisi']} if info else set()
+
+
+def _hapus_build_lama(dir_partisi, simpan):
+    """Hapus build dan direktori sementara selain `simpan` (termasuk sisa build yang gagal)."""
+    for nama in os.listdir(dir_partisi):
+        path = os.path.join(dir_partisi, nama)
+        if os.path.isdir(path) and nama not in simpan:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _aktifkan(dir_partisi, info, lama):
+    """Tulis `_versi.json` baru dengan satu `os.replace`, lalu hapus build yang tidak dirujuk versi baru maupun lama."""
+    path_versi = os.path.join(dir_partisi, FILE_VERSI_PARTISI)
+    with open(path_versi + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=1)
+    os.replace(path_versi + '.tmp', path_versi)
+    _hapus_build_lama(dir_partisi, _build_dipakai(info) | _build_dipakai(lama))
+
+
+def bangun_partisi(raw_files, dir_partisi=DIR_PARTISI, wilayah=None, lepas_pantai=False, n_proses=None,
+                   ukuran_chunk=UKURAN_CHUNK):
+    """Bangun ulang seluruh katalog terpartisi dari file mentah; mengembalikan isi `_versi.json`."""
+    wilayah = wilayah or WILAYAH
+    os.makedirs(dir_partisi, exist_ok=True)
+    lama = baca_versi(dir_partisi)
+    nama_build = _nama_build()
+    with tempfile.TemporaryDirectory(dir=dir_partisi, prefix='.pecahan-') as dir_pecahan:
+        hasil = petakan(_pecah_file, [(i, p, dir_pecahan, lepas_pantai, ukuran_chunk) for i, p in enumerate(raw_files)],
+                        n_proses, initializer=_siapkan_pekerja, initargs=(wilayah,))
+        versi = pd.concat([v for v, _ in hasil], ignore_index=True)
+        kandidat = pd.concat([k for _, k in hasil], ignore_index=True)
+        del hasil
+
+        # Versi `updated` terbaru per id dari semua baris mentah, termasuk yang tidak lolos filter
+        versi['_updated'] = pd.to_datetime(versi['updated'], format='ISO8601', utc=True)
+        terbaru = versi.sort_values('_updated').drop_duplicates(subset='id', keep='last').set_index('id')['updated']
+        kandidat = kandidat[kandidat['updated'].to_numpy() == terbaru.reindex(kandidat['id']).to_numpy()]
+        del versi, terbaru
+
+        dir_build = os.path.join(dir_partisi, nama_build)
+        kelompok = sorted(kandidat.groupby(['wilayah', 'tahun'])[['id', 'updated']], key=lambda x: x[0])
+        tugas = [(path_partisi(dir_pecahan, w, t), path_partisi(dir_build, w, t), menang)
+                 for (w, t), menang in kelompok]
+        baris = petakan(_tulis_partisi, tugas, n_proses)
+
+    daftar = [{'wilayah': w, 'tahun': int(t), 'path': os.path.join(path_partisi(nama_build, w, t), 'bagian-0.parquet'),
+               'baris': n} for ((w, t), _), n in zip(kelompok, baris)]
+    info = {'dibangun': pd.Timestamp.now(tz='UTC').isoformat(timespec='seconds'), 'build': nama_build,
+            'file_mentah': [os.path.basename(p) for p in raw_files], 'lepas_pantai': lepas_pantai, 'partisi': daftar}
+    _aktifkan(dir_partisi, info, lama)
+    return info
+
+
+def perbarui_partisi(baru, ids_disentuh, ids_lama=(), dir_partisi=DIR_PARTISI, wilayah=None, penuh=False):
+    """Terapkan hasil satu run ingesti ke katalog terpartisi; hanya partisi yang tersentuh yang ditulis ulang.
+
+    `baru` berisi versi terbaru kejadian baru/diperbarui yang sudah
+    dibersihkan, `ids_disentuh` semua id yang baru/diperbarui, dan `ids_lama`
+    id di antaranya yang sudah pernah di-ingest (dari manifest), sehingga
+    versi lamanya mungkin ada di partisi mana pun. Partisi yang menerima baris
+    baru atau menyimpan versi lama ditulis ke direktori build baru; partisi
+    lain tetap merujuk file build sebelumnya. Dengan `penuh`, semua partisi
+    lama dibuang. Mengembalikan isi `_versi.json` baru, atau None jika katalog
+    terpartisi belum dibangun.
+    """
+    lama = baca_versi(dir_partisi)
+    if lama is None:
+        return None
+    masuk = {}
+    if len(baru):
+        _siapkan_pekerja(wilayah or WILAYAH)
+        for nama, df in _tentukan_wilayah(baru.reset_index(drop=True), lama['lepas_pantai']):
+            for tahun, bagian in df.groupby(df['time'].dt.year):
+                masuk[(nama, int(tahun))] = bagian
+
+    partisi = {} if penuh else {(p['wilayah'], p['tahun']): p for p in lama['partisi']}
+    tersentuh = set(masuk)
+    if len(ids_lama):
+        tersentuh |= {k for k, p in partisi.items() if k not in tersentuh and pd.read_parquet(
+            os.path.join(dir_partisi, p['path']), columns=['id'])['id'].isin(ids_lama).any()}
+    if not tersentuh and not penuh:
+        return lama
+
+    nama_build = _nama_build()
+    for kunci in sorted(tersentuh):
+        frames = []
+        if kunci in partisi:
+            df = pd.read_parquet(os.path.join(dir_partisi, partisi[kunci]['path']))
+            frames.append(df[~df['id'].isin(ids_disentuh)])
+        if kunci in masuk:
+            frames.append(siapkan_tipe(masuk[kunci]))
+        df = gabung_katalog(frames).sort_values('time', ascending=False, ignore_index=True)
+        if df.empty:
+            partisi.pop(kunci, None)
+            continue
+        path = os.path.join(path_partisi(nama_build, *kunci), 'bagian-0.parquet')
+        os.makedirs(os.path.dirname(os.path.join(dir_partisi, path)), exist_ok=True)
+        df.to_parquet(os.path.join(dir_partisi, path), index=False, engine='pyarrow')
+        partisi[kunci] = {'wilayah': kunci[0], 'tahun': kunci[1], 'path': path, 'baris': len(df)}
+
+    info = dict(lama, diperbarui=pd.Timestamp.now(tz='UTC').isoformat(timespec='seconds'), build=nama_build,
+                partisi=[partisi[k] for k in sorted(partisi)])
+    _aktifkan(dir_partisi, info, lama)
+    return info
+
+
+def baca_versi(dir_partisi=DIR_PARTISI):
+    """Isi `_versi.json`, atau None jika katalog terpartisi belum dibangun."""
+    try:
+        with open(os.path.join(dir_partisi, FILE_VERSI_PARTISI), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def daftar_partisi(dir_partisi=DIR_PARTISI, wilayah=None, mulai=None, selesai=None):
+    """Path partisi yang tersentuh filter wilayah dan rentang tanggal (pemangkasan partisi)."""
+    info = baca_versi(dir_partisi)
+    if info is None:
+        return []
+    t0, t1 = batas_tanggal(mulai, selesai)
+    t_awal = t0.year if t0 is not None else None
+    t_akhir = (t1 - pd.Timedelta(1, 'ns')).year if t1 is not None else None
+    return [os.path.join(dir_partisi, p['path']) for p in info['partisi']
+            if (wilayah is None or p['wilayah'] in wilayah)
+            and (t_awal is None or p['tahun'] >= t_awal) and (t_akhir is None or p['tahun'] <= t_akhir)]
+
+
+def daftar_wilayah(dir_partisi=DIR_PARTISI):
+    info = baca_versi(dir_partisi)
+    return sorted({p['wilayah'] for p in info['partisi']}) if info else []
+
+
+def _rapikan(df):
+    """Samakan dtype dengan katalog dasar: kategori provinsi terurut abjad, klasifikasi terurut skala."""
+    for col in KOLOM_KATEGORI:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+            df[col] = df[col].cat.set_categories(sorted(df[col].cat.categories))
+    if 'klasifikasi' in df.columns:
+        df['klasifikasi'] = pd.Categorical(df['klasifikasi'], categories=KATEGORI_URUTAN, ordered=True)
+    return df
+
+
+def baca_file_partisi(paths, mulai=None, selesai=None, provinsi=None, kolom=None):
+    """Gabungan file partisi `paths`, terurut waktu menurun seperti katalog dasar.
+
+    Rentang tanggal mengikuti `batas_tanggal` seperti `saring_tanggal`;
+    filter waktu dan provinsi diteruskan ke pembaca Parquet.
+    """
+    filter_ = None
+    t0, t1 = batas_tanggal(mulai, selesai)
+    if t0 is not None:
+        filter_ = pc.field('time') >= t0
+    if t1 is not None:
+        batas = pc.field('time') < t1
+        filter_ = batas if filter_ is None else filter_ & batas
+    if provinsi is not None:
+        batas = pc.field('provinsi') == provinsi
+        filter_ = batas if filter_ is None else filter_ & batas
+    df = _rapikan(ds.dataset(paths, format='parquet').to_table(columns=kolom, filter=filter_).to_pandas())
+    return df.sort_values('time', ascending=False, kind='stable', ignore_index=True) if 'time' in df.columns else df
+
+
+def baca_partisi(dir_partisi=DIR_PARTISI, wilayah=None, mulai=None, selesai=None, provinsi=None, kolom=None):
+    """Katalog dari partisi yang tersentuh filter saja (None jika wilayah tidak punya partisi)."""
+    paths = daftar_partisi(dir_partisi, wilayah, mulai, selesai)
+    if not paths:
+        # Rentang tanpa partisi: satu partisi wilayah dibaca dengan filter yang sama agar hasilnya frame kosong bertipe
+        paths = daftar_partisi(dir_partisi, wilayah)[:1]
+    return baca_file_partisi(paths, mulai, selesai, provinsi, kolom) if paths else None
+
+
+def saring(df, mulai=None, selesai=None, provinsi=None):
+    if mulai is not None or selesai is not None:
+        df = saring_tanggal(df, mulai, selesai)
+    return df if provinsi is None else df[df['provinsi'] == provinsi]
+
+
+@cache_turunan
+def _load_partisi(wilayah, mulai, selesai, provinsi):
+    return baca_partisi(DIR_PARTISI, wilayah, mulai, selesai, provinsi)
+
+
+def load_rentang(mulai=None, selesai=None, provinsi=None, wilayah=None):
+    """Katalog untuk filter dasbor.
+
+    `wilayah=None` berarti katalog darat dasar (`load_data`); selain itu tuple
+    nama wilayah dan hanya partisi yang tersentuh filter yang dibaca.
+    """
+    if wilayah is None:
+        return saring(load_data()[0], mulai, selesai, provinsi)
+    return _load_partisi(tuple(wilayah), mulai, selesai, provinsi)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bangun katalog gempa terpartisi per wilayah dan tahun.")
+    parser.add_argument('--raw-dir', default='.', help="Direktori file CSV mentah USGS")
+    parser.add_argument('--pola', default=POLA_RAW, help="Pola glob file mentah")
+    parser.add_argument('--keluaran', default=DIR_PARTISI)
+    parser.add_argument('--lepas-pantai', action='store_true', help=f"Simpan juga gempa lepas pantai di wilayah <nama>{AKHIRAN_LAUT}")
+    parser.add_argument('--proses', type=int, default=None, help="Jumlah proses pekerja (bawaan: jumlah CPU)")
+    parser.add_argument('--chunk', type=int, default=UKURAN_CHUNK, help="Jumlah baris per potongan baca")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    raw_files = cari_file_raw(args.raw_dir, args.pola)
+    if not raw_files:
+        raise FileNotFoundError("Tidak ada file CSV data gempa yang ditemukan.")
+    info = bangun_partisi(raw_files, args.keluaran, lepas_pantai=args.lepas_pantai, n_proses=args.proses,
+                          ukuran_chunk=args.chunk)
+    ringkasan = pd.DataFrame(info['partisi']).groupby('wilayah')['baris'].agg(['count', 'sum'])
+    for nama, baris in ringkasan.iterrows():
+        print(f"{nama}: {baris['count']} partisi tahun, {baris['sum']:,} kejadian")
+    print(f"Ditulis ke {args.keluaran} dalam {time.perf_counter() - t0:.2f} detik.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Bahan-bahan peta risiko di tab "Peta Risiko Interaktif".
+
+Mode titik kejadian memakai `indeks_spasial.IndeksTitik` untuk memilih klaster
+atau kejadian individual sesuai viewport; modul ini hanya merendernya.
+
+Centroid provinsi dihitung sekali untuk semua provinsi (bukan reproyeksi per
+provinsi setiap rerun), dan grafik popup dibuat sebagai SVG ringan yang
+di-cache berdasarkan (provinsi, jumlah per kategori). Tidak ada lagi render
+HTML Plotly per marker sehingga peta dapat dibangun ulang dalam hitungan
+milidetik setelah filter berubah.
+"""
+from functools import lru_cache
+from html import escape
+
+import folium
+import geopandas as gpd
+import numpy as np
+
+from data_gempa import FILE_GEOJSON, cache_turunan, load_gdf_provinsi
+from instrumentasi import diukur
+from partisi_katalog import AKHIRAN_LAUT, LEPAS_PANTAI, WILAYAH, baca_partisi
+from skala_magnitudo import KATEGORI_URUTAN, WARNA_KATEGORI
+
+LEBAR_SVG, TINGGI_SVG = 460, 280
+# Viewport awal peta (barat, selatan, timur, utara) dan zoom-nya
+VIEWPORT_AWAL = (95.0, -11.0, 141.0, 6.0)
+ZOOM_AWAL = 5
+
+
+def hitung_centroid_provinsi(gdf_provinsi):
+    """Peta nama provinsi -> (lat, lon) centroid, dihitung di EPSG:3857 seperti sebelumnya."""
+    centroid = gdf_provinsi.to_crs("EPSG:3857").geometry.centroid
+    centroid = gpd.GeoSeries(centroid, crs="EPSG:3857").to_crs("EPSG:4326")
+    hasil = {}
+    # Seperti pencarian lama: baris pertama dengan nama itu di kolom PROVINSI,
+    # lalu NAMOBJ hanya untuk nama yang tidak ada di kolom PROVINSI
+    for col in ['NAMOBJ', 'PROVINSI']:
+        if col in gdf_provinsi.columns:
+            pertama = ~gdf_provinsi[col].duplicated(keep='first').to_numpy()
+            hasil.update({nama: (pt.y, pt.x) for nama, pt in zip(gdf_provinsi[col][pertama], centroid[pertama])})
+    return hasil
+
+
+@cache_turunan
+def load_centroid_provinsi(wilayah=None):
+    """Centroid provinsi katalog dasar (`wilayah=None`) atau wilayah-wilayah katalog terpartisi.
+
+    Wilayah darat memakai poligon dari GeoJSON-nya. `LEPAS_PANTAI` tidak
+    punya poligon, jadi markernya diletakkan di rata-rata lokasi kejadiannya.
+    """
+    if wilayah is None:
+        return hitung_centroid_provinsi(load_gdf_provinsi())
+    hasil = {}
+    for nama in wilayah:
+        geojson = WILAYAH.get(nama)
+        if geojson is not None:
+            hasil.update(hitung_centroid_provinsi(load_gdf_provinsi() if geojson == FILE_GEOJSON else gpd.read_file(geojson)))
+    laut = tuple(nama for nama in wilayah if nama.endswith(AKHIRAN_LAUT))
+    if laut:
+        titik = baca_partisi(wilayah=laut, provinsi=LEPAS_PANTAI, kolom=['latitude', 'longitude'])
+        if titik is not None and len(titik):
+            hasil[LEPAS_PANTAI] = (float(titik['latitude'].mean()), float(titik['longitude'].mean()))
+    return hasil
+
+
+def style_marker(jumlah_gempa):
+    if jumlah_gempa < 100: return {'radius': 6, 'color': 'green'}
+    elif jumlah_gempa < 500: return {'radius': 9, 'color': 'orange'}
+    else: return {'radius': 12, 'color': 'red'}
+
+
+@lru_cache(maxsize=4096)
+def svg_popup(nama_prov, jumlah):
+    """Grafik batang SVG untuk popup; `jumlah` adalah tuple hitungan per KATEGORI_URUTAN."""
+    kiri, bawah, atas = 40, 60, 40
+    tinggi_plot = TINGGI_SVG - bawah - atas
+    lebar_batang = (LEBAR_SVG - kiri - 10) / len(KATEGORI_URUTAN)
+    maks = max(max(jumlah), 1)
+    bagian = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{LEBAR_SVG}" height="{TINGGI_SVG}" '
+              f'font-family="arial" font-size="11">',
+              f'<text x="{LEBAR_SVG / 2}" y="20" text-anchor="middle" font-size="14">Detail Gempa di {escape(nama_prov)}</text>',
+              f'<line x1="{kiri}" y1="{atas + tinggi_plot}" x2="{LEBAR_SVG - 10}" y2="{atas + tinggi_plot}" stroke="#999"/>']
+    for i, (kat, n) in enumerate(zip(KATEGORI_URUTAN, jumlah)):
+        h = tinggi_plot * n / maks
+        x = kiri + i * lebar_batang + 4
+        tengah = x + (lebar_batang - 8) / 2
+        bagian.append(f'<rect x="{x:.1f}" y="{atas + tinggi_plot - h:.1f}" width="{lebar_batang - 8:.1f}" '
+                      f'height="{h:.1f}" fill="{WARNA_KATEGORI[kat]}"><title>{escape(kat)}: {n}</title></rect>')
+        bagian.append(f'<text x="{tengah:.1f}" y="{atas + tinggi_plot - h - 4:.1f}" text-anchor="middle">{n}</text>')
+        bagian.append(f'<text x="{tengah:.1f}" y="{atas + tinggi_plot + 16}" text-anchor="middle">'
+                      f'{escape(kat.split(" (")[0])}</text>')
+    bagian.append('</svg>')
+    return ''.join(bagian)
+
+
+@diukur("peta: marker provinsi")
+def bangun_peta_risiko(profil_kerusakan, centroid_provinsi):
+    """Peta folium dengan satu CircleMarker per provinsi.
+
+    `profil_kerusakan` adalah tabel provinsi x KATEGORI_URUTAN beserta kolom 'total'.
+    """
+    m = folium.Map(location=[-2.5, 118], zoom_start=5, tiles='CartoDB positron')
+    jumlah_kategori = profil_kerusakan[KATEGORI_URUTAN].to_numpy()
+    for nama_prov, jumlah, total in zip(profil_kerusakan.index, jumlah_kategori, profil_kerusakan['total']):
+        lokasi = centroid_provinsi.get(nama_prov)
+        if lokasi is None:
+            continue
+        popup = folium.Popup(svg_popup(nama_prov, tuple(int(n) for n in jumlah)), max_width=LEBAR_SVG + 20)
+        marker_style = style_marker(total)
+        folium.CircleMarker(location=list(lokasi), radius=marker_style['radius'], color=marker_style['color'], fill=True, fill_color=marker_style['color'], fill_opacity=0.7, popup=popup, tooltip=f"<b>{nama_prov}</b><br>Total Gempa: {total}<br>Klik untuk detail").add_to(m)
+    return m
+
+
+def viewport_dari_state(state):
+    """Ambil (barat, selatan, timur, utara), zoom, dan center dari nilai st_folium sebelumnya."""
+    state = state or {}
+    batas = state.get('bounds') or {}
+    sw, ne = batas.get('_southWest') or {}, batas.get('_northEast') or {}
+    if None in (sw.get('lng'), sw.get('lat'), ne.get('lng'), ne.get('lat')):
+        return VIEWPORT_AWAL, ZOOM_AWAL, None
+    center = state.get('center') or {}
+    center = (center['lat'], center['lng']) if 'lat' in center and 'lng' in center else None
+    return (sw['lng'], sw['lat'], ne['lng'], ne['lat']), state.get('zoom') or ZOOM_AWAL, center
+
+
+@diukur("peta: lapisan titik")
+def bangun_lapisan_titik(jenis, fitur):
+    """FeatureGroup untuk hasil IndeksTitik.kueri(): klaster atau kejadian individual."""
+    fg = folium.FeatureGroup(name='Titik Kejadian')
+    if jenis == 'klaster':
+        for lat, lon, jumlah, mag_rata in zip(fitur['latitude'], fitur['longitude'], fitur['jumlah'], fitur['mag_rata']):
+            folium.CircleMarker(location=[lat, lon], radius=6 + 3 * np.log10(jumlah), color='#4169E1', fill=True, fill_color='#4169E1', fill_opacity=0.6, weight=1, tooltip=f"<b>{jumlah:,} kejadian</b><br>Rata-rata magnitudo: {mag_rata:.2f}<br>Perbesar untuk detail").add_to(fg)
+    else:
+        for waktu, lat, lon, depth, mag, place, kelas in zip(fitur['time'], fitur['latitude'], fitur['longitude'], fitur['depth'], fitur['mag'], fitur['place'], fitur['klasifikasi']):
+            warna = WARNA_KATEGORI[kelas]
+            folium.CircleMarker(location=[lat, lon], radius=2 + max(mag - 2, 0) * 1.5, color=warna, fill=True, fill_color=warna, fill_opacity=0.8, weight=1, tooltip=f"<b>M {mag:.1f}</b> - {escape(str(place))}<br>{waktu:%d %b %Y %H:%M} UTC<br>Kedalaman: {depth:.1f} km").add_to(fg)
+    return fg
@@ -0,0 +1,120 @@
+"""Penentuan provinsi untuk titik (lon, lat) secara cepat dan tervektorisasi.
+
+Hasilnya identik dengan `gpd.sjoin(..., predicate="within")` terhadap poligon
+provinsi, tetapi sebagian besar titik tidak pernah diuji terhadap garis pantai
+yang rumit:
+
+1. titik di luar bounding box gabungan semua provinsi langsung ditolak;
+2. wilayah dibagi menjadi grid kasar, dan sel kasar yang ambigu dipecah lagi
+   menjadi sub-sel. Sel yang tidak bersinggungan dengan provinsi mana pun
+   ditolak, dan sel yang seluruhnya berada di bagian dalam satu provinsi
+   langsung diberi nama provinsi itu;
+3. hanya titik di sel ambigu (dekat garis pantai/perbatasan) yang diuji
+   `within` secara eksak lewat STRtree.
+"""
+import numpy as np
+import shapely
+
+UKURAN_SEL = 0.25  # derajat
+FAKTOR_HALUS = 4  # sel ambigu dipecah menjadi 4x4 sub-sel
+EPS = 1e-9
+
+# Kode sel grid
+SEL_KOSONG = -1
+SEL_AMBIGU = -2
+
+
+class PencariProvinsi:
+    """Indeks provinsi yang dibangun sekali dari GeoDataFrame poligon provinsi."""
+
+    def __init__(self, gdf_provinsi, kolom_nama='provinsi', ukuran_sel=UKURAN_SEL, faktor_halus=FAKTOR_HALUS):
+        gdf_provinsi = gdf_provinsi.to_crs("EPSG:4326")
+        self.nama = np.asarray(gdf_provinsi[kolom_nama], dtype=object)
+        self.geoms = np.asarray(gdf_provinsi.geometry.values, dtype=object)
+        shapely.prepare(self.geoms)
+        self.tree = shapely.STRtree(self.geoms)
+        self.bounds = shapely.total_bounds(self.geoms)
+        self.ukuran_sel = ukuran_sel
+        self.faktor_halus = faktor_halus
+        self._bangun_grid()
+
+    def _klasifikasi_sel(self, kotak):
+        """Kode untuk setiap kotak sel: indeks provinsi, SEL_KOSONG, atau SEL_AMBIGU."""
+        kode = np.full(len(kotak), SEL_KOSONG, dtype=np.int32)
+        idx_kotak, idx_prov = self.tree.query(kotak, predicate='intersects')
+        # Sel yang bersinggungan dengan lebih dari satu provinsi selalu ambigu
+        jumlah = np.bincount(idx_kotak, minlength=len(kotak))
+        kode[jumlah > 0] = SEL_AMBIGU
+        tunggal = jumlah[idx_kotak] == 1
+        k, p = idx_kotak[tunggal], idx_prov[tunggal]
+        # contains_properly: kotak tidak menyentuh batas poligon, jadi setiap titik
+        # di dalam kotak (termasuk tepinya) pasti `within` poligon tersebut
+        penuh = shapely.contains_properly(self.geoms[p], kotak[k])
+        kode[k[penuh]] = p[penuh]
+        return kode
+
+    def _kotak(self, ix, iy, ukuran):
+        # Kotak sedikit diperlebar agar titik yang jatuh ke sel tetangga karena
+        # pembulatan floating point saat menghitung indeks tetap tercakup
+        minx, miny = self.bounds[:2]
+        return shapely.box(minx + ix * ukuran - EPS, miny + iy * ukuran - EPS,
+                           minx + (ix + 1) * ukuran + EPS, miny + (iy + 1) * ukuran + EPS)
+
+    def _bangun_grid(self):
+        minx, miny, maxx, maxy = self.bounds
+        nx = max(int(np.ceil((maxx - minx) / self.ukuran_sel)), 1)
+        ny = max(int(np.ceil((maxy - miny) / self.ukuran_sel)), 1)
+        ix, iy = np.meshgrid(np.arange(nx), np.arange(ny), indexing='ij')
+        ix, iy = ix.ravel(), iy.ravel()
+        kasar = self._klasifikasi_sel(self._kotak(ix, iy, self.ukuran_sel))
+
+        # Hanya sel kasar yang ambigu (garis pantai/perbatasan) yang dipecah lagi
+        f = self.faktor_halus
+        grid = np.repeat(np.repeat(kasar.reshape(nx, ny), f, axis=0), f, axis=1)
+        ambigu = kasar == SEL_AMBIGU
+        dx, dy = np.meshgrid(np.arange(f), np.arange(f), indexing='ij')
+        hx = (ix[ambigu, None] * f + dx.ravel()).ravel()
+        hy = (iy[ambigu, None] * f + dy.ravel()).ravel()
+        grid[hx, hy] = self._klasifikasi_sel(self._kotak(hx, hy, self.ukuran_sel / f))
+
+        self.grid = grid
+        self.nx, self.ny = grid.shape
+        self.ukuran_sel_halus = self.ukuran_sel / f
+
+    def pasangan(self, lon, lat):
+        """Kembalikan (idx_titik, idx_provinsi) untuk setiap titik yang berada di dalam provinsi.
+
+        Sama seperti sjoin inner: titik di dalam beberapa poligon yang tumpang
+        tindih muncul lebih dari sekali.
+        """
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        minx, miny, maxx, maxy = self.bounds
+        idx = np.flatnonzero((lon >= minx) & (lon <= maxx) & (lat >= miny) & (lat <= maxy))
+        ix = np.minimum(((lon[idx] - minx) / self.ukuran_sel_halus).astype(np.int64), self.nx - 1)
+        iy = np.minimum(((lat[idx] - miny) / self.ukuran_sel_halus).astype(np.int64), self.ny - 1)
+        sel = self.grid[ix, iy]
+
+        pasti = sel >= 0
+        ambigu = idx[sel == SEL_AMBIGU]
+        idx_titik, idx_prov = self.tree.query(shapely.points(lon[ambigu], lat[ambigu]), predicate='within')
+        idx_titik = np.concatenate([idx[pasti], ambigu[idx_titik]])
+        idx_prov = np.concatenate([sel[pasti], idx_prov])
+        urutan = np.lexsort((idx_prov, idx_titik))
+        return idx_titik[urutan], idx_prov[urutan]
+
+    def lookup(self, lon, lat):
+        """Nama provinsi untuk setiap titik, atau None jika titik berada di luar semua provinsi.
+
+        Masukan skalar menghasilkan satu nama (atau None), bukan array.
+        """
+        skalar = np.ndim(lon) == 0 and np.ndim(lat) == 0
+        lon = np.atleast_1d(np.asarray(lon, dtype=np.float64)).ravel()
+        lat = np.atleast_1d(np.asarray(lat, dtype=np.float64)).ravel()
+        hasil = np.full(len(lon), None, dtype=object)
+        idx_titik, idx_prov = self.pasangan(lon, lat)
+        # Jika poligon tumpang tindih, ambil provinsi dengan indeks terkecil
+        pertama = np.ones(len(idx_titik), dtype=bool)
+        pertama[1:] = idx_titik[1:] != idx_titik[:-1]
+        hasil[idx_titik[pertama]] = self.nama[idx_prov[pertama]]
+        return hasil[0] if skalar else hasil
@@ -0,0 +1,53 @@
+"""Skala magnitudo BMKG: label, warna, dan klasifikasi tervektorisasi.
+
+Satu-satunya sumber tabel skala untuk ingesti, halaman interaktif, laporan
+statis, dan halaman panduan. Klasifikasi mengubah seluruh array magnitudo
+menjadi kode kelas int8 sekaligus (tanpa `apply` per baris) dan menghasilkan
+Categorical terurut, sehingga setiap kejadian hanya menyimpan satu byte, bukan
+string label.
+"""
+import numpy as np
+import pandas as pd
+
+# (label, rentang, warna, efek yang dirasakan), urut dari kelas terlemah
+SKALA = [
+    ('Mikro (Tidak Terasa, < 2.5)', '< 2.5', '#8FBC8F', "Biasanya tidak terasa, tetapi dapat direkam dengan seismograf."),
+    ('Ringan (Dirasakan, 2.5 - 5.4)', '2.5 - 5.4', '#87CEEB', "Sering dirasakan, tetapi hanya menyebabkan kerusakan kecil."),
+    ('Sedang (5.5 - 6.0)', '5.5 - 6.0', '#FFD700', "Dapat menyebabakan kerusakan ringan pada bangunan dan struktur lainnya."),
+    ('Kuat (6.1 - 6.9)', '6.1 - 6.9', '#FFA500', "Dapat menyebabkan kerusakan di daerah berpenduduk padat."),
+    ('Besar (7.0 - 7.9)', '7.0 - 7.9', '#DC143C', "Gempa bumi besar dengan kerusakan serius."),
+    ('Dahsyat (>= 8.0)', '>= 8.0', '#8B0000', "Gempa hebat dan dapat menghancurkan komunitas di dekat pusat gempa."),
+]
+KATEGORI_URUTAN = [label for label, _, _, _ in SKALA]
+WARNA_KATEGORI = {label: warna for label, _, warna, _ in SKALA}
+
+# Batas kelas: Mikro jika mag < 2.5, kelas berikutnya jika mag > batas (inklusif di atas)
+BATAS_MIKRO = 2.5
+BATAS_ATAS = [5.4, 6.0, 6.9, 7.9]
+
+
+def kode_kelas(mag):
+    """Kode kelas int8 (indeks ke KATEGORI_URUTAN) untuk array magnitudo; NaN menjadi -1.
+
+    Batas dibandingkan dalam dtype yang sama dengan `mag`, sehingga magnitudo
+    float32 seperti 5.4 tidak naik kelas karena 5.4f > 5.4 (float64).
+    """
+    mag = np.asarray(mag)
+    if not np.issubdtype(mag.dtype, np.floating):
+        mag = mag.astype(np.float64)
+    batas = np.asarray(BATAS_ATAS, dtype=mag.dtype)
+    kode = np.searchsorted(batas, mag, side='left').astype(np.int8)
+    kode += mag >= mag.dtype.type(BATAS_MIKRO)
+    kode[np.isnan(mag)] = -1
+    return kode
+
+
+def klasifikasi(mag):
+    """Categorical terurut berisi label kelas BMKG untuk setiap magnitudo."""
+    return pd.Categorical.from_codes(kode_kelas(mag), categories=KATEGORI_URUTAN, ordered=True)
+
+
+def tabel_skala():
+    """Tabel skala untuk ditampilkan di halaman panduan."""
+    return pd.DataFrame({'Magnitudo': [rentang for _, rentang, _, _ in SKALA],
+                         'Efek yang Dirasakan': [efek for _, _, _, efek in SKALA]})
@@ -0,0 +1,192 @@
+"""Statistik seismik Gutenberg-Richter per provinsi dan per jendela waktu.
+
+Semua perhitungan berangkat dari satu tensor histogram magnitudo
+(provinsi x tahun x bin magnitudo 0.1) yang dibangun dengan satu `bincount`.
+Histogram untuk jendela waktu geser didapat dari selisih jumlah kumulatif
+sepanjang sumbu tahun, jadi semua provinsi dan semua jendela dihitung
+sekaligus tanpa loop pandas.
+
+Dari histogram setiap kelompok dihitung:
+
+- magnitudo kelengkapan Mc dengan metode kurvatur maksimum (+0.2);
+- nilai b dengan estimator kemungkinan maksimum Aki-Utsu (koreksi bin) dan
+  ketidakpastian Shi & Bolt;
+- nilai a tahunan, sehingga laju tahunan M >= m adalah 10^(a - b m) dan
+  periode ulangnya 1 / laju.
+
+Interval kepercayaan bootstrap memakai resampling multinomial atas histogram
+(setara dengan resampling kejadian) yang dibagi ke beberapa proses.
+"""
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_gempa import cache_turunan
+from deklasterisasi import load_katalog
+
+DM = 0.1  # lebar bin magnitudo
+N_BIN = 101  # bin 0.0 .. 10.0
+KOREKSI_MC = 0.2
+MIN_KEJADIAN = 50  # minimal kejadian M >= Mc agar nilai b dilaporkan
+MAG_PERIODE_ULANG = [5.0, 6.0, 7.0]
+N_BOOTSTRAP = 200
+SEMUA = 'Semua Provinsi'
+
+
+def bin_magnitudo(mag):
+    return np.clip(np.rint(np.asarray(mag, dtype=np.float64) / DM), 0, N_BIN - 1).astype(np.int64)
+
+
+def histogram_tahunan(df):
+    """Tensor (provinsi, tahun, bin) beserta label provinsi dan tahun.
+
+    Baris terakhir sumbu provinsi adalah gabungan semua provinsi (`SEMUA`).
+    """
+    provinsi = list(df['provinsi'].cat.categories)
+    kode_prov = df['provinsi'].cat.codes.to_numpy(np.int64)
+    tahun = df['time'].dt.year.to_numpy(np.int64)
+    tahun0 = int(tahun.min()) if len(tahun) else 0
+    n_tahun = int(tahun.max()) - tahun0 + 1 if len(tahun) else 1
+    P = len(provinsi)
+    idx = (kode_prov * n_tahun + (tahun - tahun0)) * N_BIN + bin_magnitudo(df['mag'])
+    H = np.bincount(idx, minlength=P * n_tahun * N_BIN).reshape(P, n_tahun, N_BIN).astype(np.float64)
+    H = np.concatenate([H, H.sum(axis=0, keepdims=True)])
+    return H, provinsi + [SEMUA], np.arange(tahun0, tahun0 + n_tahun)
+
+
+def histogram_jendela(H, panjang, langkah=1):
+    """Histogram (provinsi, jendela, bin) untuk jendela `panjang` tahun yang bergeser `langkah` tahun."""
+    n_tahun = H.shape[1]
+    kum = np.concatenate([np.zeros_like(H[:, :1]), np.cumsum(H, axis=1)], axis=1)
+    awal = np.arange(0, max(n_tahun - panjang, 0) + 1, langkah)
+    akhir = np.minimum(awal + panjang, n_tahun)
+    return kum[:, akhir] - kum[:, awal], awal
+
+
+def fit_gr(H, durasi_tahun, min_kejadian=MIN_KEJADIAN):
+    """Fit Gutenberg-Richter untuk setiap histogram di sumbu terakhir `H`.
+
+    `durasi_tahun` dapat di-broadcast ke bentuk `H.shape[:-1]`. Mengembalikan
+    dict array: n (kejadian M >= Mc), mc, b, sigma_b, a.
+    """
+    m = np.arange(N_BIN) * DM
+    mc_bin = np.minimum(np.argmax(H, axis=-1) + int(round(KOREKSI_MC / DM)), N_BIN - 1)
+    # Jumlah dari bin Mc ke atas lewat jumlah kumulatif terbalik
+    ekor = lambda x: np.take_along_axis(np.cumsum(x[..., ::-1], axis=-1)[..., ::-1], mc_bin[..., None], axis=-1)[..., 0]  # noqa: E731
+    n, s1, s2 = ekor(H), ekor(H * m), ekor(H * m * m)
+    mc = mc_bin * DM
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rata = s1 / n
+        b = np.log10(np.e) / (rata - (mc - DM / 2))
+        sigma_b = 2.3 * b * b * np.sqrt(np.maximum(s2 - n * rata * rata, 0) / (n * (n - 1)))
+        a = np.log10(n / durasi_tahun) + b * mc
+    cukup = n >= min_kejadian
+    return {'n': n, 'mc': np.where(cukup, mc, np.nan), 'b': np.where(cukup, b, np.nan),
+            'sigma_b': np.where(cukup, sigma_b, np.nan), 'a': np.where(cukup, a, np.nan)}
+
+
+def periode_ulang(a, b, mag):
+    """Periode ulang (tahun) kejadian M >= mag dari nilai a tahunan dan b."""
+    return 1.0 / 10 ** (a - b * mag)
+
+
+def _bootstrap_b(H, n_ulang, seed):
+    rng = np.random.default_rng(seed)
+    n = H.sum(axis=-1)
+    p = np.where(n[:, None] > 0, H / np.maximum(n, 1)[:, None], 1.0 / N_BIN)
+    sampel = rng.multinomial(np.broadcast_to(n.astype(np.int64), (n_ulang, len(n))), p)
+    return fit_gr(sampel.astype(np.float64), 1.0)['b']
+
+
+def bootstrap_b(H, n_ulang=N_BOOTSTRAP, n_proses=None, seed=0):
+    """Sampel bootstrap nilai b berbentuk (n_ulang, kelompok) untuk histogram 2D (kelompok, bin).
+
+    Replikasi dibagi ke `n_proses` proses (bawaan: jumlah CPU); setiap bagian
+    mendapat seed turunan sendiri sehingga hasilnya deterministik.
+    """
+    n_proses = n_proses or os.cpu_count() or 1
+    n_proses = max(min(n_proses, n_ulang), 1)
+    bagian = [len(x) for x in np.array_split(np.arange(n_ulang), n_proses)]
+    seeds = np.random.SeedSequence(seed).spawn(n_proses)
+    if n_proses == 1:
+        return _bootstrap_b(H, n_ulang, seeds[0])
+    with ProcessPoolExecutor(max_workers=n_proses) as pool:
+        hasil = list(pool.map(_bootstrap_b, [H] * n_proses, bagian, seeds))
+    return np.concatenate(hasil)
+
+
+def _durasi(df):
+    if not len(df):
+        return 1.0
+    detik = (df['time'].max() - df['time'].min()).total_seconds()
+    return max(detik / (365.25 * 86400), 1.0)
+
+
+def statistik_provinsi(df, n_ulang=N_BOOTSTRAP, n_proses=None, durasi_tahun=None):
+    """Tabel statistik G-R untuk setiap provinsi dan gabungan (`SEMUA`).
+
+    `durasi_tahun` adalah panjang periode pengamatan untuk nilai a tahunan;
+    bawaannya rentang waktu kejadian di `df`.
+    """
+    H, provinsi, _ = histogram_tahunan(df)
+    H = H.sum(axis=1)
+    hasil = fit_gr(H, durasi_tahun or _durasi(df))
+    tabel = pd.DataFrame({k: hasil[k] for k in ['n', 'mc', 'a', 'b', 'sigma_b']}, index=pd.Index(provinsi, name='provinsi'))
+    tabel['n'] = tabel['n'].astype(np.int64)
+    if n_ulang:
+        sampel = bootstrap_b(H, n_ulang, n_proses)
+        # Kelompok dengan kejadian terlalu sedikit berisi NaN di semua replikasi
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            tabel['b_p05'], tabel['b_p95'] = np.nanpercentile(sampel, [5, 95], axis=0)
+        tabel.loc[tabel['b'].isna(), ['b_p05', 'b_p95']] = np.nan
+    for mag in MAG_PERIODE_ULANG:
+        tabel[f'periode_ulang_m{mag:g}'] = periode_ulang(tabel['a'], tabel['b'], mag)
+    return tabel
+
+
+def statistik_jendela(df, panjang=5, langkah=1):
+    """Tabel panjang (provinsi, tahun_mulai, tahun_selesai) -> n, mc, a, b, sigma_b untuk jendela geser."""
+    H, provinsi, tahun = histogram_tahunan(df)
+    Hj, awal = histogram_jendela(H, panjang, langkah)
+    hasil = fit_gr(Hj, float(panjang))
+    P, W = Hj.shape[:2]
+    tabel = pd.DataFrame({
+        'provinsi': np.repeat(provinsi, W),
+        'tahun_mulai': np.tile(tahun[awal], P),
+        'tahun_selesai': np.tile(tahun[np.minimum(awal + panjang, len(tahun)) - 1], P),
+        **{k: hasil[k].ravel() for k in ['n', 'mc', 'a', 'b', 'sigma_b']},
+    })
+    tabel['n'] = tabel['n'].astype(np.int64)
+    return tabel
+
+
+def distribusi_frekuensi(df):
+    """Jumlah per bin dan kumulatif N(M >= m) untuk plot FMD, dari bin terisi terkecil hingga terbesar."""
+    H = np.bincount(bin_magnitudo(df['mag']), minlength=N_BIN)
+    isi = np.flatnonzero(H)
+    if not len(isi):
+        return pd.DataFrame({'mag': [], 'jumlah': [], 'kumulatif': []})
+    rentang = np.s_[isi[0]:isi[-1] + 1]
+    kum = np.cumsum(H[::-1])[::-1]
+    return pd.DataFrame({'mag': np.arange(N_BIN)[rentang] * DM, 'jumlah': H[rentang], 'kumulatif': kum[rentang]})
+
+
+def _durasi_rentang(mulai, selesai):
+    return max(((pd.Timestamp(selesai) - pd.Timestamp(mulai)).days + 1) / 365.25, 1.0)
+
+
+@cache_turunan
+def load_statistik_provinsi(mulai, selesai, hanya_utama=False, wilayah=None):
+    # Jalur dasbor: bootstrap di proses ini. Process pool per rerun lebih lambat untuk histogram sekecil ini
+    # dan mem-fork server yang multithread; pool hanya untuk laporan_statis dan benchmark.
+    return statistik_provinsi(load_katalog(hanya_utama, wilayah=wilayah, mulai=mulai, selesai=selesai),
+                              n_proses=1, durasi_tahun=_durasi_rentang(mulai, selesai))
+
+
+@cache_turunan
+def load_statistik_jendela(mulai, selesai, panjang=5, hanya_utama=False, wilayah=None):
+    return statistik_jendela(load_katalog(hanya_utama, wilayah=wilayah, mulai=mulai, selesai=selesai), panjang)
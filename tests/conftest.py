@@ -0,0 +1,96 @@
+"""Fixture bersama: poligon provinsi dan katalog gempa sintetis yang kecil.
+
+Tes tidak bergantung pada GeoJSON batas provinsi asli (tidak ikut repo) atau
+CSV mentah di root repo. Poligon provinsi dibangun dari diagram Voronoi yang
+dipotong ke dua "pulau" (satu berlubang, satu multipoligon), sehingga ada batas
+bersama, garis pantai tidak lurus, dan titik lepas pantai. Katalog mentah
+dibuat dengan `benchmarks/katalog_sintetis.py` di atas template lokasi acak.
+"""
+import os
+import sys
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from katalog_sintetis import buat_katalog_raw, tulis_katalog_raw  # noqa: E402
+
+N_KATALOG = 10000
+# Wilayah sintetis (barat, selatan, timur, utara); template lokasi sedikit lebih luas agar ada gempa lepas pantai
+KOTAK = (100.0, -8.0, 116.0, 2.0)
+MARGIN_TEMPLATE = 3.0
+
+
+def buat_gdf_provinsi(seed=0):
+    """GeoDataFrame provinsi sintetis (kolom PROVINSI) di EPSG:4326."""
+    rng = np.random.default_rng(seed)
+    barat, selatan, timur, utara = KOTAK
+    sudut = np.linspace(0, 2 * np.pi, 48, endpoint=False)
+    jari = 1 + 0.25 * np.sin(5 * sudut) + 0.1 * rng.random(len(sudut))
+    pulau_besar = shapely.Polygon(np.column_stack([106 + 5 * jari * np.cos(sudut), -3 + 4 * jari * np.sin(sudut)]))
+    pulau_besar = pulau_besar.difference(shapely.Point(106.5, -2.5).buffer(0.8))
+    pulau_kecil = shapely.MultiPolygon([shapely.Point(114, 0).buffer(1.2), shapely.Point(114.5, -5).buffer(0.9)])
+    daratan = shapely.union(pulau_besar, pulau_kecil)
+
+    benih = shapely.MultiPoint(np.column_stack([rng.uniform(barat, timur, 8), rng.uniform(selatan, utara, 8)]))
+    sel = shapely.get_parts(shapely.voronoi_polygons(benih, extend_to=shapely.box(*KOTAK).buffer(5)))
+    geoms = [g for g in (shapely.intersection(s, daratan) for s in sel) if not g.is_empty]
+    return gpd.GeoDataFrame({'PROVINSI': [f'PROVINSI {chr(65 + i)}' for i in range(len(geoms))]},
+                            geometry=geoms, crs='EPSG:4326')
+
+
+def buat_template(n=2000, seed=0):
+    """Template lokasi/kedalaman/magType/place untuk `buat_katalog_raw`."""
+    rng = np.random.default_rng(seed)
+    barat, selatan, timur, utara = KOTAK
+    return pd.DataFrame({
+        'latitude': rng.uniform(selatan - MARGIN_TEMPLATE, utara + MARGIN_TEMPLATE, n),
+        'longitude': rng.uniform(barat - MARGIN_TEMPLATE, timur + MARGIN_TEMPLATE, n),
+        'depth': rng.uniform(5, 300, n),
+        'magType': rng.choice(['mb', 'mww', 'mwr'], n),
+        'place': 'lokasi sintetis',
+    })
+
+
+@pytest.fixture(scope='session')
+def gdf_provinsi():
+    return buat_gdf_provinsi()
+
+
+@pytest.fixture(scope='session')
+def geojson_provinsi(gdf_provinsi, tmp_path_factory):
+    path = tmp_path_factory.mktemp('geojson') / 'provinsi.geojson'
+    gdf_provinsi.to_file(path, driver='GeoJSON')
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def katalog_raw():
+    return buat_katalog_raw(N_KATALOG, seed=1, template=buat_template())
+
+
+@pytest.fixture
+def dir_raw(katalog_raw, tmp_path):
+    """Direktori berisi katalog mentah sintetis, satu CSV per periode tahun."""
+    tulis_katalog_raw(katalog_raw, tmp_path / 'mentah')
+    return tmp_path / 'mentah'
+
+
+@pytest.fixture(scope='session')
+def katalog_darat(katalog_raw, geojson_provinsi, tmp_path_factory):
+    """Katalog gempa darat bertipe hasil ingesti penuh atas katalog mentah sintetis."""
+    from data_gempa import baca_parquet
+    from ingest_gempa import ingest
+
+    tujuan = tmp_path_factory.mktemp('katalog')
+    paths = tulis_katalog_raw(katalog_raw, tujuan / 'mentah')
+    ingest(paths, store_path=str(tujuan / 'darat.parquet'), csv_path=str(tujuan / 'darat.csv'),
+           manifest_path=str(tujuan / 'manifest.json'), geojson_path=geojson_provinsi,
+           laut_path=str(tujuan / 'laut.parquet'), dir_partisi=str(tujuan / 'partisi'))
+    return baca_parquet(str(tujuan / 'darat.parquet'))
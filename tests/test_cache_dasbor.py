@@ -0,0 +1,90 @@
+"""CacheLRU: anggaran byte, urutan pembuangan, buat-sekali, dan kunci versi data."""
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from cache_dasbor import CacheLRU, cache_lru, diturunkan, perkiraan_ukuran, tandai_bersama, versi_file
+
+MB = 2**20
+
+
+def larik(mb):
+    return np.zeros(int(mb * MB) // 8)
+
+
+def test_pembuangan_lru_dalam_anggaran_byte():
+    cache = CacheLRU(maks_byte=int(2.5 * MB))
+    for kunci in 'abc':
+        cache.simpan(kunci, larik(1))
+    assert len(cache) == 2 and cache.byte <= cache.maks_byte
+    assert cache.statistik()['dibuang'] == 1
+
+    # 'b' baru dipakai, jadi 'c' yang paling lama tidak dipakai saat 'd' masuk
+    assert cache.ambil('b', lambda: None) is not None
+    cache.simpan('d', larik(1))
+    assert cache._cari('b')[0] and cache._cari('d')[0]
+    assert not cache._cari('a')[0] and not cache._cari('c')[0]
+
+    # Nilai yang lebih besar dari seluruh anggaran tidak disimpan dan tidak membuang entri lain
+    cache.simpan('besar', larik(4))
+    assert not cache._cari('besar')[0] and len(cache) == 2
+
+
+def test_ambil_memanggil_buat_sekali_untuk_banyak_thread():
+    cache = CacheLRU(maks_byte=MB)
+    panggilan = []
+
+    def buat():
+        panggilan.append(1)
+        time.sleep(0.05)
+        return 42
+
+    hasil = []
+    threads = [threading.Thread(target=lambda: hasil.append(cache.ambil('k', buat))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert hasil == [42] * 8 and len(panggilan) == 1
+    assert cache.statistik()['miss'] == 1 and not cache._kunci_hitung
+
+
+def test_kunci_versi_dan_argumen_bawaan():
+    versi = ['v1']
+    panggilan = []
+
+    @diturunkan(lambda: versi[0])
+    def turunan(x, skala=2):
+        panggilan.append(x)
+        return x * skala
+
+    cache_lru().kosongkan()
+    assert turunan(3) == 6 and turunan(3, 2) == 6 and turunan(x=3, skala=2) == 6
+    assert panggilan == [3]
+    assert turunan(3, skala=3) == 9 and len(panggilan) == 2
+
+    # Versi data berganti: hasil lama tidak dipakai lagi
+    versi[0] = 'v2'
+    assert turunan(3) == 6 and len(panggilan) == 3
+
+
+def test_versi_file_mengikuti_isi(tmp_path):
+    path = tmp_path / 'data.csv'
+    assert versi_file(path) is None
+    path.write_text('a,b\n1,2\n')
+    awal = versi_file(path)
+    assert versi_file(path) == awal
+    path.write_text('a,b\n1,3\n')
+    assert versi_file(path) not in (None, awal)
+
+
+def test_view_frame_bersama_tidak_dibebankan():
+    df = pd.DataFrame({'mag': np.arange(100_000, dtype=np.float64), 'kelas': pd.Categorical(['a', 'b'] * 50_000)})
+    penuh = perkiraan_ukuran(df[['mag', 'kelas']])
+    tandai_bersama(df)
+    assert perkiraan_ukuran(df[['mag', 'kelas']]) < penuh // 100
+    # Salinan dan hasil hitungan baru tetap dibebankan penuh
+    assert perkiraan_ukuran(df['mag'] * 2) >= df['mag'].nbytes
+    assert perkiraan_ukuran(df.copy()) >= penuh
@@ -0,0 +1,41 @@
+"""Deklasterisasi grid + searchsorted harus memberi label yang sama dengan baseline brute force O(n^2)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_deklasterisasi import deklasterisasi_brute_force
+from deklasterisasi import JENDELA, KOLOM_MASUKAN, deklasterisasi, label_dengan_laut, label_klaster
+from katalog_mentah import bersihkan
+
+
+@pytest.fixture(scope='module')
+def katalog_bersih(katalog_raw):
+    """Semua kejadian (darat dan laut) yang lolos filter, satu baris per id seperti ingest."""
+    df = bersihkan(katalog_raw.astype({'type': 'category', 'status': 'category'}))
+    df = df.assign(_updated=pd.to_datetime(df['updated'], format='ISO8601', utc=True))
+    return df.sort_values('_updated').drop_duplicates('id', keep='last').sort_values('time', ignore_index=True)
+
+
+@pytest.mark.parametrize('metode', sorted(JENDELA))
+def test_label_sama_dengan_brute_force(katalog_bersih, metode):
+    kolom = [katalog_bersih[k] for k in ['time', 'latitude', 'longitude', 'mag']]
+    id_klaster, utama = deklasterisasi(*kolom, metode=metode)
+    id_acuan, utama_acuan = deklasterisasi_brute_force(*kolom, metode=metode)
+    assert (~utama).sum() > 0
+    np.testing.assert_array_equal(id_klaster, id_acuan)
+    np.testing.assert_array_equal(utama, utama_acuan)
+
+
+def test_label_dengan_laut_sama_dengan_katalog_gabungan(katalog_bersih, katalog_darat):
+    laut = katalog_bersih[~katalog_bersih['id'].isin(katalog_darat['id'])]
+    # Kejadian darat yang ikut muncul di `laut` tidak boleh dihitung dua kali
+    laut_ganda = pd.concat([katalog_bersih[katalog_bersih['id'].isin(katalog_darat['id'])].head(20), laut])
+    darat = katalog_darat.sample(frac=1, random_state=0)
+    label = label_dengan_laut(darat, laut_ganda)
+    assert label.index.equals(darat.index)
+
+    acuan = label_klaster(pd.concat([darat[KOLOM_MASUKAN], laut[KOLOM_MASUKAN]], ignore_index=True)).iloc[:len(darat)]
+    np.testing.assert_array_equal(label['utama'], acuan['utama'])
+    np.testing.assert_array_equal(label['id_klaster'], acuan['id_klaster'])
+    # Gempa laut bisa menjadi induk gempa darat, jadi gempa utama di darat tidak bertambah
+    assert 0 < label['utama'].sum() < label_klaster(darat)['utama'].sum()
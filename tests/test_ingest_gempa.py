@@ -0,0 +1,66 @@
+"""Ingesti inkremental harus menghasilkan store yang sama dengan build penuh."""
+import os
+
+import pandas as pd
+
+from data_gempa import baca_gempa_laut, baca_parquet
+from ingest_gempa import ingest
+from katalog_sintetis import PERIODE_FILE
+
+
+def jalankan(paths, tujuan, geojson, **kwargs):
+    os.makedirs(tujuan, exist_ok=True)
+    return ingest([str(p) for p in paths], store_path=os.path.join(tujuan, 'darat.parquet'),
+                  csv_path=os.path.join(tujuan, 'darat.csv'), manifest_path=os.path.join(tujuan, 'manifest.json'),
+                  geojson_path=geojson, laut_path=os.path.join(tujuan, 'laut.parquet'),
+                  dir_partisi=os.path.join(tujuan, 'partisi'), **kwargs)
+
+
+def baca_store(tujuan):
+    """(darat, laut) terurut id agar bisa dibandingkan tanpa bergantung urutan baris."""
+    urut = lambda df: df.sort_values('id', ignore_index=True)  # noqa: E731
+    return (urut(baca_parquet(os.path.join(tujuan, 'darat.parquet'))),
+            urut(baca_gempa_laut(os.path.join(tujuan, 'laut.parquet'))))
+
+
+def revisi(path):
+    """Perbarui sebagian baris satu file mentah: pindah lokasi, pindah tahun, dan gagal filter status."""
+    df = pd.read_csv(path)
+    i = df.index[:90]
+    df.loc[i, 'updated'] = '2030-01-01T00:00:00.000Z'
+    df.loc[i[:30], 'latitude'] = df.loc[i[:30], 'latitude'] + 2.5
+    df.loc[i[30:60], 'time'] = '2016-06-01T00:00:00.000Z'
+    df.loc[i[60:], 'status'] = 'automatic'
+    df.to_csv(path, index=False)
+
+
+def test_inkremental_sama_dengan_build_penuh(dir_raw, geojson_provinsi, tmp_path):
+    paths = [dir_raw / f'{awal}-{akhir}.csv' for awal, akhir in PERIODE_FILE]
+    inkremental, penuh = tmp_path / 'inkremental', tmp_path / 'penuh'
+
+    pertama = jalankan(paths[:2], inkremental, geojson_provinsi)
+    assert pertama['penuh'] and pertama['file_berubah'] == 2
+    revisi(paths[0])
+    kedua = jalankan(paths, inkremental, geojson_provinsi)
+    assert not kedua['penuh'] and kedua['file_berubah'] == 3
+    jalankan(paths, penuh, geojson_provinsi, penuh=True)
+
+    for a, b in zip(baca_store(inkremental), baca_store(penuh)):
+        assert len(a) > 0
+        pd.testing.assert_frame_equal(a, b)
+
+
+def test_run_tanpa_perubahan_tidak_menulis_ulang(dir_raw, geojson_provinsi, tmp_path):
+    paths = sorted(dir_raw.glob('*.csv'))
+    jalankan(paths, tmp_path, geojson_provinsi)
+    mtime = os.stat(tmp_path / 'darat.parquet').st_mtime_ns
+    ringkasan = jalankan(paths, tmp_path, geojson_provinsi)
+    assert ringkasan['file_berubah'] == 0 and ringkasan['baris_baru'] == 0
+    assert os.stat(tmp_path / 'darat.parquet').st_mtime_ns == mtime
+
+
+def test_satu_baris_per_id_versi_terbaru(katalog_raw, katalog_darat):
+    assert katalog_darat['id'].is_unique
+    terbaru = (katalog_raw.assign(_u=pd.to_datetime(katalog_raw['updated'], utc=True))
+               .sort_values('_u').drop_duplicates('id', keep='last').set_index('id')['mag'])
+    assert (katalog_darat['mag'].to_numpy() == terbaru.loc[katalog_darat['id']].astype('float32').to_numpy()).all()
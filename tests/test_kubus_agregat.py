@@ -0,0 +1,70 @@
+"""Kueri kubus agregat harus sama dengan jalur pandas lama di halaman interaktif."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_gempa import saring_tanggal
+from kubus_agregat import KubusGempa
+from partisi_katalog import saring
+
+RENTANG = [('2004-01-01', '2024-12-31'), ('2010-03-17', '2013-08-05'), ('2019-02-10', '2019-02-20'),
+           (pd.Timestamp('2015-05-05 12:00', tz='UTC'), pd.Timestamp('2016-01-31 06:30', tz='UTC'))]
+
+
+def jalur_pandas(df, mulai, selesai, provinsi):
+    return saring(saring_tanggal(df, mulai, selesai), provinsi=provinsi)
+
+
+@pytest.fixture(scope='module')
+def kubus(katalog_darat):
+    return KubusGempa(katalog_darat)
+
+
+@pytest.mark.parametrize('mulai, selesai', RENTANG)
+@pytest.mark.parametrize('pilih', [None, 0, -1])
+def test_kueri_sama_dengan_pandas(katalog_darat, kubus, mulai, selesai, pilih):
+    provinsi = None if pilih is None else kubus.provinsi[pilih]
+    df = jalur_pandas(katalog_darat, mulai, selesai, provinsi)
+    hasil = kubus.kueri(mulai, selesai, provinsi)
+
+    assert hasil.total == len(df)
+    if not len(df):
+        assert hasil.profil().empty and hasil.tren_bulanan().empty
+        return
+    assert hasil.mag_maks() == pytest.approx(float(df['mag'].max()))
+    if provinsi is None:
+        assert hasil.provinsi_terbanyak() == df['provinsi'].mode()[0]
+    statistik = hasil.statistik()
+    for kolom in ['mag', 'depth']:
+        nilai = df[kolom].to_numpy(np.float64)
+        assert statistik[kolom]['rata_rata'] == pytest.approx(nilai.mean())
+        if len(nilai) > 1:
+            assert statistik[kolom]['std'] == pytest.approx(nilai.std(ddof=1), rel=1e-6)
+
+    # crosstab hanya memuat kategori yang muncul; kubus memuat semua kategori skala
+    profil = pd.crosstab(df['provinsi'].astype(str), df['klasifikasi'].astype(str))
+    profil_kubus = hasil.profil()
+    profil_kubus.columns = profil_kubus.columns.astype(str)
+    pd.testing.assert_frame_equal(profil_kubus.loc[profil.index, profil.columns], profil, check_names=False,
+                                  check_dtype=False)
+    assert len(profil_kubus) == len(profil)
+    assert (profil_kubus.drop(columns=profil.columns) == 0).all().all()
+
+    komposisi = df['klasifikasi'].value_counts()
+    assert hasil.komposisi().to_dict() == komposisi[komposisi > 0].to_dict()
+
+    tren = df.set_index('time')['mag'].resample('ME').agg(['size', 'max'])
+    tren_kubus = hasil.tren_bulanan()
+    np.testing.assert_array_equal(tren_kubus.index, tren.index)
+    np.testing.assert_array_equal(tren_kubus['Jumlah Gempa'], tren['size'])
+    np.testing.assert_allclose(tren_kubus['Magnitudo Maks'], tren['max'].fillna(0))
+
+
+def test_gabung_partisi_sama_dengan_kubus_utuh(katalog_darat, kubus):
+    tahun = katalog_darat['time'].dt.year
+    gabungan = KubusGempa.gabung([KubusGempa(katalog_darat[tahun == t]) for t in sorted(tahun.unique())])
+    for mulai, selesai in RENTANG:
+        a, b = kubus.kueri(mulai, selesai), gabungan.kueri(mulai, selesai)
+        assert a.total == b.total
+        pd.testing.assert_frame_equal(a.profil(), b.profil())
+        pd.testing.assert_frame_equal(a.tren_bulanan(), b.tren_bulanan())
@@ -0,0 +1,53 @@
+"""Kueri bahaya berbasis KD-tree harus sama dengan pemindaian haversine brute force."""
+import numpy as np
+import pytest
+
+from data_gempa import saring_tanggal
+from deklasterisasi import _haversine_km
+from kueri_bahaya import KueriBahaya
+
+FILTER = [{}, dict(mag_min=4.5, depth_maks=70), dict(mulai='2010-01-01', selesai='2015-12-31', mag_min=4.5)]
+LOKASI = [(-3.0, 106.0), (0.0, 114.0), (-7.5, 101.0)]
+
+
+def brute_force(df, lat, lon, mag_min=None, depth_maks=None, mulai=None, selesai=None):
+    df = saring_tanggal(df, mulai, selesai)
+    if mag_min is not None:
+        df = df[df['mag'] >= np.float32(mag_min)]
+    if depth_maks is not None:
+        df = df[df['depth'] < np.float32(depth_maks)]
+    return df.assign(jarak_km=_haversine_km(lat, lon, df['latitude'].to_numpy(np.float64),
+                                            df['longitude'].to_numpy(np.float64)))
+
+
+@pytest.fixture(scope='module')
+def kueri(katalog_darat):
+    return KueriBahaya(katalog_darat)
+
+
+@pytest.mark.parametrize('filter_', FILTER)
+@pytest.mark.parametrize('lat, lon', LOKASI)
+def test_radius_dan_terdekat(katalog_darat, kueri, lat, lon, filter_):
+    acuan = brute_force(katalog_darat, lat, lon, **filter_)
+    dalam = acuan[acuan['jarak_km'] <= 150]
+    hasil = kueri.radius(lat, lon, 150, **filter_)
+    assert set(hasil['id']) == set(dalam['id'])
+    assert hasil['jarak_km'].is_monotonic_increasing
+    np.testing.assert_allclose(hasil['jarak_km'], np.sort(dalam['jarak_km'].to_numpy()), atol=1e-6)
+
+    terdekat = kueri.terdekat(lat, lon, k=5, **filter_)
+    np.testing.assert_allclose(terdekat['jarak_km'], np.sort(acuan['jarak_km'].to_numpy())[:5], atol=1e-6)
+
+
+def test_ambang_dan_skor_lokasi(katalog_darat, kueri):
+    filter_ = dict(mag_min=5.0, depth_maks=70)
+    assert set(kueri.ambang(**filter_)['id']) == set(brute_force(katalog_darat, 0, 0, **filter_)['id'])
+
+    lat, lon = np.array([p[0] for p in LOKASI]), np.array([p[1] for p in LOKASI])
+    skor = kueri.skor_lokasi(lat, lon, 150, **filter_)
+    for (la, lo), baris in zip(LOKASI, skor.itertuples()):
+        dalam = kueri.radius(la, lo, 150, **filter_)
+        assert baris.jumlah == len(dalam)
+        if len(dalam):
+            assert baris.mag_maks == pytest.approx(float(dalam['mag'].max()))
+            assert baris.jarak_terdekat_km == pytest.approx(float(dalam['jarak_km'].min()))
@@ -0,0 +1,75 @@
+"""Katalog terpartisi: pembacaan terpangkas sama dengan pembacaan penuh, dan ingesti menjaga partisi tetap sinkron."""
+import os
+
+import pandas as pd
+import pytest
+
+from data_gempa import baca_parquet
+from katalog_sintetis import PERIODE_FILE, tulis_katalog_raw
+from partisi_katalog import (AKHIRAN_LAUT, WILAYAH_BAWAAN, bangun_partisi, baca_file_partisi, baca_partisi,
+                             baca_versi, daftar_partisi, daftar_wilayah, saring)
+from test_ingest_gempa import jalankan, revisi
+
+LAUT = WILAYAH_BAWAAN + AKHIRAN_LAUT
+
+
+def urut(df):
+    return df.sort_values('id', ignore_index=True)
+
+
+def bangun(paths, dir_partisi, geojson):
+    return bangun_partisi([str(p) for p in paths], str(dir_partisi), wilayah={WILAYAH_BAWAAN: geojson},
+                          lepas_pantai=True, n_proses=1)
+
+
+@pytest.fixture(scope='module')
+def dir_partisi(katalog_raw, geojson_provinsi, tmp_path_factory):
+    tujuan = tmp_path_factory.mktemp('partisi')
+    bangun(tulis_katalog_raw(katalog_raw, tujuan / 'mentah'), tujuan / 'partisi', geojson_provinsi)
+    return str(tujuan / 'partisi')
+
+
+def test_partisi_sama_dengan_store_ingest(dir_partisi, katalog_darat):
+    assert daftar_wilayah(dir_partisi) == [WILAYAH_BAWAAN, LAUT]
+    darat = urut(baca_partisi(dir_partisi, (WILAYAH_BAWAAN,)))
+    pd.testing.assert_series_equal(darat['id'], urut(katalog_darat)['id'])
+    assert set(baca_partisi(dir_partisi, (LAUT,))['id']).isdisjoint(darat['id'])
+
+
+@pytest.mark.parametrize('wilayah', [(WILAYAH_BAWAAN,), (LAUT,), None])
+@pytest.mark.parametrize('mulai, selesai', [(None, None), ('2010-01-01', '2012-12-31'), ('2015-03-04', '2015-03-04'),
+                                            ('2030-01-01', '2031-01-01')])
+def test_pembacaan_terpangkas_sama_dengan_pembacaan_penuh(dir_partisi, wilayah, mulai, selesai):
+    semua = daftar_partisi(dir_partisi, wilayah)
+    penuh = baca_file_partisi(semua)
+    provinsi = penuh['provinsi'].value_counts().index[0]
+    for prov in (None, provinsi):
+        terpangkas = baca_partisi(dir_partisi, wilayah, mulai, selesai, prov)
+        acuan = saring(penuh, mulai, selesai, prov)
+        assert list(terpangkas['id']) == list(acuan['id'])
+        pd.testing.assert_frame_equal(terpangkas[['time', 'mag', 'depth']], acuan[['time', 'mag', 'depth']].reset_index(drop=True))
+    if mulai is not None:
+        assert len(daftar_partisi(dir_partisi, wilayah, mulai, selesai)) < len(semua)
+
+
+def test_ingest_inkremental_sama_dengan_build_ulang(dir_raw, geojson_provinsi, tmp_path):
+    paths = [dir_raw / f'{awal}-{akhir}.csv' for awal, akhir in PERIODE_FILE]
+    kerja = tmp_path / 'kerja'
+    bangun(paths[:2], kerja / 'partisi', geojson_provinsi)
+    jalankan(paths[:2], kerja, geojson_provinsi, wilayah={WILAYAH_BAWAAN: geojson_provinsi})
+    revisi(paths[0])
+    jalankan(paths, kerja, geojson_provinsi, wilayah={WILAYAH_BAWAAN: geojson_provinsi})
+    bangun(paths, tmp_path / 'ulang', geojson_provinsi)
+
+    # Hanya direktori build yang dirujuk `_versi.json` yang tersisa
+    info = baca_versi(kerja / 'partisi')
+    dirujuk = {p['path'].split('/')[0] for p in info['partisi']}
+    assert len(dirujuk) > 1
+    assert {n for n in os.listdir(kerja / 'partisi') if not n.startswith('_')} == dirujuk
+
+    assert daftar_wilayah(kerja / 'partisi') == daftar_wilayah(tmp_path / 'ulang')
+    for wilayah in daftar_wilayah(tmp_path / 'ulang'):
+        pd.testing.assert_frame_equal(urut(baca_partisi(kerja / 'partisi', (wilayah,))),
+                                      urut(baca_partisi(tmp_path / 'ulang', (wilayah,))))
+    pd.testing.assert_series_equal(urut(baca_parquet(kerja / 'darat.parquet'))['id'],
+                                   urut(baca_partisi(kerja / 'partisi', (WILAYAH_BAWAAN,)))['id'])
@@ -0,0 +1,47 @@
+"""PencariProvinsi harus memberi hasil yang sama dengan `gpd.sjoin(..., predicate="within")`."""
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from provinsi_lookup import PencariProvinsi
+
+
+def titik_uji(gdf_provinsi, n=20000, seed=0):
+    """Titik acak di sekitar wilayah, ditambah titik tepat di verteks dan dekat batas poligon."""
+    rng = np.random.default_rng(seed)
+    barat, selatan, timur, utara = gdf_provinsi.total_bounds
+    lon = rng.uniform(barat - 1, timur + 1, n)
+    lat = rng.uniform(selatan - 1, utara + 1, n)
+    verteks = shapely.get_coordinates(gdf_provinsi.geometry.boundary.values)
+    dekat = verteks + rng.normal(0, 1e-4, verteks.shape)
+    return np.concatenate([lon, verteks[:, 0], dekat[:, 0]]), np.concatenate([lat, verteks[:, 1], dekat[:, 1]])
+
+
+def test_pasangan_sama_dengan_sjoin(gdf_provinsi):
+    lon, lat = titik_uji(gdf_provinsi)
+    pencari = PencariProvinsi(gdf_provinsi, kolom_nama='PROVINSI')
+    idx_titik, idx_prov = pencari.pasangan(lon, lat)
+
+    titik = gpd.GeoDataFrame(geometry=gpd.points_from_xy(lon, lat), crs='EPSG:4326')
+    acuan = gpd.sjoin(titik, gdf_provinsi, how='inner', predicate='within')
+    acuan = pd.DataFrame({'titik': acuan.index.to_numpy(), 'prov': acuan['index_right'].to_numpy()})
+    acuan = acuan.sort_values(['titik', 'prov'], ignore_index=True)
+    assert len(idx_titik) > 0
+    np.testing.assert_array_equal(idx_titik, acuan['titik'])
+    np.testing.assert_array_equal(idx_prov, acuan['prov'])
+
+
+def test_lookup_array_dan_skalar(gdf_provinsi):
+    pencari = PencariProvinsi(gdf_provinsi, kolom_nama='PROVINSI')
+    lon, lat = titik_uji(gdf_provinsi, n=2000, seed=1)
+    nama = pencari.lookup(lon, lat)
+    assert nama.shape == lon.shape
+    for i in range(0, len(lon), 97):
+        assert pencari.lookup(lon[i], lat[i]) == nama[i]
+        assert pencari.lookup(float(lon[i]), float(lat[i])) == nama[i]
+
+    pusat = gdf_provinsi.geometry.iloc[0].representative_point()
+    assert pencari.lookup(pusat.x, pusat.y) == gdf_provinsi['PROVINSI'].iloc[0]
+    barat, selatan = gdf_provinsi.total_bounds[:2]
+    assert pencari.lookup(barat - 5, selatan - 5) is None
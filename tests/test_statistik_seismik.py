@@ -0,0 +1,49 @@
+"""Statistik G-R dari histogram harus sama dengan perhitungan langsung per kelompok kejadian."""
+import numpy as np
+import pytest
+
+from statistik_seismik import (DM, KOREKSI_MC, SEMUA, _durasi, bootstrap_b, histogram_tahunan, statistik_jendela,
+                               statistik_provinsi)
+
+
+def gr_langsung(mag, durasi_tahun):
+    """Mc kurvatur maksimum (+0.2), b Aki-Utsu dan a tahunan dari daftar magnitudo."""
+    m = np.rint(np.asarray(mag, dtype=np.float64) / DM).astype(np.int64)
+    nilai, jumlah = np.unique(m, return_counts=True)
+    mc = (nilai[np.argmax(jumlah)] + round(KOREKSI_MC / DM)) * DM
+    atas = m[m >= round(mc / DM)] * DM
+    b = np.log10(np.e) / (atas.mean() - (mc - DM / 2))
+    return len(atas), mc, b, np.log10(len(atas) / durasi_tahun) + b * mc
+
+
+def test_statistik_provinsi_sama_dengan_langsung(katalog_darat):
+    tabel = statistik_provinsi(katalog_darat, n_ulang=0)
+    durasi = _durasi(katalog_darat)
+    kelompok = dict(list(katalog_darat.groupby('provinsi', observed=True)['mag'])) | {SEMUA: katalog_darat['mag']}
+    dilaporkan = tabel['b'].notna()
+    assert dilaporkan[SEMUA] and dilaporkan.sum() > 1
+    for nama, baris in tabel[dilaporkan].iterrows():
+        n, mc, b, a = gr_langsung(kelompok[nama], durasi)
+        assert baris['n'] == n
+        assert baris['mc'] == pytest.approx(mc)
+        assert baris['b'] == pytest.approx(b)
+        assert baris['a'] == pytest.approx(a)
+
+
+def test_jendela_sama_dengan_statistik_tahun_itu(katalog_darat):
+    tabel = statistik_jendela(katalog_darat, panjang=5)
+    baris = tabel[(tabel['provinsi'] == SEMUA) & (tabel['tahun_mulai'] == 2010)].iloc[0]
+    tahun = katalog_darat['time'].dt.year
+    bagian = katalog_darat[(tahun >= 2010) & (tahun <= 2014)]
+    acuan = statistik_provinsi(bagian, n_ulang=0, durasi_tahun=5.0).loc[SEMUA]
+    for kolom in ['n', 'mc', 'a', 'b', 'sigma_b']:
+        assert baris[kolom] == pytest.approx(acuan[kolom])
+
+
+def test_bootstrap_deterministik_dan_mengapit_b(katalog_darat):
+    H = histogram_tahunan(katalog_darat)[0].sum(axis=1)
+    a = bootstrap_b(H, n_ulang=40, n_proses=1, seed=3)
+    assert a.shape == (40, len(H))
+    np.testing.assert_array_equal(a, bootstrap_b(H, n_ulang=40, n_proses=1, seed=3))
+    b_semua = statistik_provinsi(katalog_darat, n_ulang=0).loc[SEMUA, 'b']
+    assert np.nanpercentile(a[:, -1], 5) < b_semua < np.nanpercentile(a[:, -1], 95)